@@ -0,0 +1,136 @@
+"""
+Сравнение движков извлечения импортов PythonImportsAnalyzer: "ast" и "scan".
+
+Запуск:
+    python benchmarks/bench_import_extractors.py [--functions N] [--repeat R] [файлы...]
+
+Без файлов бенчмарк генерирует большой синтетический модуль: функции и классы
+с вложенными импортами, try/except, if TYPE_CHECKING и docstring-и, в которых
+встречается текст "import".
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from depgraph.analyzing.python_analyzer import (  # noqa: E402
+    ANALYZER_ENGINES,
+    PythonImportsAnalyzer,
+)
+
+FUNCTION_TEMPLATE = '''
+
+def function_{i}(value):
+    """
+    Example:
+        import not_a_real_import_{i}
+        from fake import thing
+    """
+    import json
+    from collections import OrderedDict as od_{i}
+    try:
+        import yaml
+    except ImportError:
+        yaml = None  # import yaml is optional
+    data = {{"key": value, "items": [x * {i} for x in range(10)]}}
+    if value > {i}:
+        data["nested"] = {{"a": (value, value + 1), "b": "from x import y"}}
+    return json.dumps(data) + str(od_{i})
+
+
+class Model{i}:
+    from os import path as _path
+
+    def method(self, other):
+        total = 0
+        for index in range(len(other)):
+            total += other[index] ** 2 if index % 2 else -other[index]
+        return total
+'''
+
+MODULE_HEADER = """import os
+import sys as system
+from typing import TYPE_CHECKING
+from . import sibling
+from ..parent.module import (
+    first,  # comment inside parentheses
+    second as alias,
+)
+
+if TYPE_CHECKING:
+    from package.types import Annotation
+"""
+
+
+def generate_module(functions: int) -> str:
+    body = "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(functions))
+    return MODULE_HEADER + body
+
+
+def measure(run: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_engine(engine: str, root: Path, files: List[Path]) -> List:
+    analyzer = PythonImportsAnalyzer(root, engine)
+    results = []
+    for file_path in files:
+        analyzer.analyze(file_path)
+        results.append(analyzer.get_results())
+        analyzer.clear_results()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--functions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.files:
+            root = Path("/")
+            files = [file_path.resolve().relative_to(root) for file_path in args.files]
+        else:
+            root = Path(tmp)
+            source = generate_module(args.functions)
+            (root / "large_module.py").write_text(source, encoding="utf-8")
+            files = [Path("large_module.py")]
+            print(
+                f"synthetic module: {len(source.splitlines())} lines, "
+                f"{len(source) / 1024:.0f} KiB"
+            )
+
+        reference = run_engine("ast", root, files)
+        timings = {}
+
+        for engine in ANALYZER_ENGINES:
+            if run_engine(engine, root, files) != reference:
+                raise SystemExit(f"engine '{engine}' produced different records")
+            timings[engine] = measure(
+                lambda: run_engine(engine, root, files), args.repeat
+            )
+
+    imports = sum(len(records) for records in reference)
+    print(f"{len(files)} files, {imports} imports, best of {args.repeat}")
+    for engine, seconds in timings.items():
+        speedup = timings["ast"] / seconds
+        print(f"  {engine:<5} {seconds * 1000:9.1f} ms   x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
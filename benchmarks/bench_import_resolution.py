@@ -0,0 +1,174 @@
+"""
+Бенчмарк разрешения абсолютных импортов: перебор корней против ImportTrie.
+
+Запуск:
+    python benchmarks/bench_import_resolution.py [--roots 1 8 32 128]
+        [--modules-per-root 200]
+
+Строится монорепозиторий из roots библиотек libK/synthK (каждая -
+синтетический проект со своим корневым пакетом). Абсолютные импорты всех
+модулей разрешаются двумя способами: прежним перебором корневых пакетов
+с поиском в индексе модулей на каждый корень и одним проходом по дереву
+имён ImportTrie (модель корневых пакетов и модель путей с корнями
+исходников libK). Печатается время на импорт и число расхождений
+с перебором корней (должно быть 0).
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_project import ROOT_PACKAGE, ProjectSpec, generate_project  # noqa: E402
+
+from depgraph.analyzing.python_analyzer import PythonImportsAnalyzer  # noqa: E402
+from depgraph.dep_finding.import_trie import ImportTrie  # noqa: E402
+from depgraph.dep_finding.module_index import ModuleIndex, ModuleKey  # noqa: E402
+from depgraph.utils import _find_project_roots  # noqa: E402
+
+# (части имени, "import x" без from)
+Query = Tuple[ModuleKey, bool]
+
+
+def build_monorepo(project: Path, roots: int, modules: int) -> None:
+    """
+    Пишет roots библиотек libK/synthK; абсолютные импорты synth.* в каждой
+    переписываются на её собственный корневой пакет.
+    """
+    for k in range(roots):
+        lib = project / f"lib{k}"
+        generate_project(lib, ProjectSpec(modules=modules, depth=2, seed=k))
+        package = lib / f"{ROOT_PACKAGE}{k}"
+        (lib / ROOT_PACKAGE).rename(package)
+
+        for module in package.rglob("*.py"):
+            source = module.read_text(encoding="utf-8")
+            module.write_text(
+                source.replace(f" {ROOT_PACKAGE}.", f" {ROOT_PACKAGE}{k}."),
+                encoding="utf-8",
+            )
+
+
+def collect_queries(project: Path, modules: List[Path]) -> List[Query]:
+
+    analyser = PythonImportsAnalyzer(project, engine="scan")
+    queries = []
+    for module in modules:
+        analyser.analyze(project / module)
+        for module_name, name, _, level in analyser.get_results():
+            if level == 0:
+                parts = tuple(module_name.split(".")) if module_name else (name,)
+                queries.append((parts, not module_name))
+        analyser.clear_results()
+    return queries
+
+
+def probe_roots(
+    index: ModuleIndex, root_keys: List[Tuple[ModuleKey, str]]
+) -> Callable[[ModuleKey, bool], Optional[Path]]:
+    """
+    Прежнее разрешение: поиск в индексе на каждый корневой пакет по порядку.
+    """
+
+    def resolve(parts: ModuleKey, bare: bool) -> Optional[Path]:
+        for root_parts, root_name in root_keys:
+            if not bare and parts[0] == root_name:
+                key = root_parts + parts[1:]
+            else:
+                key = root_parts + parts
+            module = index.lookup(key)
+            if module is not None:
+                return module
+        return None
+
+    return resolve
+
+
+def probe_source_roots(
+    index: ModuleIndex, source_roots: List[ModuleKey]
+) -> Callable[[ModuleKey, bool], Optional[Path]]:
+    """
+    Перебор корней исходников: поиск в индексе на каждый корень по порядку.
+    """
+
+    def resolve(parts: ModuleKey, bare: bool) -> Optional[Path]:
+        for source_root in source_roots:
+            module = index.lookup(source_root + parts)
+            if module is not None:
+                return module
+        return None
+
+    return resolve
+
+
+def run(
+    queries: List[Query], resolve: Callable[[ModuleKey, bool], Optional[Path]]
+) -> Tuple[float, List[Optional[Path]]]:
+
+    start = time.perf_counter()
+    results = [resolve(parts, bare) for parts, bare in queries]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roots", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--modules-per-root", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    for roots in args.roots:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "project"
+            build_monorepo(project, roots, args.modules_per_root)
+
+            modules = sorted(
+                path.relative_to(project) for path in project.rglob("*.py")
+            )
+            index = ModuleIndex(modules)
+            queries = collect_queries(project, modules)
+
+            root_keys = sorted(
+                (root.relative_to(project).parts, root.name)
+                for root in _find_project_roots(project)
+            )
+            source_roots = [(f"lib{k}",) for k in range(roots)]
+
+            cases = {
+                "package roots": (
+                    probe_roots(index, root_keys),
+                    ImportTrie.for_roots(index, root_keys),
+                ),
+                "source roots": (
+                    probe_source_roots(index, source_roots),
+                    ImportTrie.for_model(index, source_roots),
+                ),
+            }
+
+            print(f"{roots} roots, {len(modules)} modules, {len(queries)} imports")
+            for name, (probe, trie) in cases.items():
+                probe_time, expected = run(queries, probe)
+
+                start = time.perf_counter()
+                trie.lookup(())
+                compile_time = time.perf_counter() - start
+                trie_time, got = run(queries, trie.lookup)
+
+                mismatches = sum(a != b for a, b in zip(expected, got))
+                print(
+                    f"  {name:<13} probe {probe_time / len(queries) * 1e6:6.2f} us/import"
+                    f" | trie {trie_time / len(queries) * 1e6:6.2f} us/import"
+                    f" (compile {compile_time * 1000:7.1f} ms)"
+                    f" | {mismatches} mismatches"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Время импорта пакета depgraph и запуска консольной утилиты.
+
+Запуск:
+    python benchmarks/bench_import_time.py [--repeat R] [модули...]
+
+Каждый замер - отдельный интерпретатор (python -X importtime), поэтому
+кеш модулей не влияет на результат. Для каждого модуля печатается
+лучшее и медианное время импорта и тяжёлые зависимости, которые
+оказались загружены. Отдельно замеряется полный запуск "python -m depgraph --help".
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ["depgraph.cli", "depgraph.main"]
+HEAVY_MODULES = ("networkx", "pyvis", "jinja2", "numpy")
+
+CHECK_HEAVY = (
+    "import sys; import {module}; "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def import_time(module: str) -> Tuple[float, List[str]]:
+    """
+    Returns:
+        Tuple[float, List[str]]: суммарное время импорта модуля в секундах
+                        и загруженные им тяжёлые зависимости.
+    """
+    code = CHECK_HEAVY.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # строка importtime: "import time: self [us] | cumulative | imported package"
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1])
+
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return cumulative / 1e6, heavy
+
+
+def startup_time() -> float:
+
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "depgraph", "--help"],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        timings = []
+        heavy: List[str] = []
+        for _ in range(args.repeat):
+            seconds, heavy = import_time(module)
+            timings.append(seconds)
+
+        print(
+            f"import {module:<16} best {min(timings) * 1000:7.1f} ms   "
+            f"median {statistics.median(timings) * 1000:7.1f} ms   "
+            f"heavy: {', '.join(heavy) or '-'}"
+        )
+
+    timings = [startup_time() for _ in range(args.repeat)]
+    print(
+        f"python -m depgraph --help   best {min(timings) * 1000:7.1f} ms   "
+        f"median {statistics.median(timings) * 1000:7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Пиковая память пайплайна в обычном режиме и с бюджетом памяти.
+
+Запуск:
+    python benchmarks/bench_memory_budget.py [--modules 5000 20000]
+        [--imports 8] [--budget 16] [--viewer scalable|pyvis]
+
+Для каждого размера генерируется синтетический проект, и полный пайплайн
+(поиск зависимостей, граф, HTML) запускается в отдельном интерпретаторе:
+ru_maxrss монотонен, поэтому замеры в одном процессе смешались бы.
+Печатается пиковый RSS к концу каждого этапа, итоговый пик и совпадают ли
+рёбра обоих режимов (по хешу, не зависящему от порядка рёбер).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_project import ProjectSpec, generate_project  # noqa: E402
+
+STAGES = ("prepare_data", "dep_finding", "streaming", "graph_generating", "visualization")
+
+
+class DigestSink:
+    """
+    Приёмник рёбер, который считает их хеш, не зависящий от порядка,
+    и ничего не хранит, чтобы не влиять на замер памяти.
+    """
+
+    def __init__(self) -> None:
+        self.digest = 0
+
+    def add_module(self, module: Path) -> None:
+        pass
+
+    def add_dependency(
+        self, importing_module: Path, imported_module: Path, names=None
+    ) -> None:
+        edge = f"{importing_module.as_posix()}\t{imported_module.as_posix()}"
+        self.digest += int(hashlib.sha1(edge.encode()).hexdigest()[:16], 16)
+
+
+def run_pipeline(project: Path, budget: Optional[int], viewer: str) -> Dict:
+    """
+    Тело дочернего процесса: прогоняет пайплайн и возвращает отчёт.
+    """
+    from depgraph.main import Depgraph
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        html = Path(tmp) / "graph.html"
+        html.touch()
+
+        depgraph = Depgraph()
+        depgraph.set_proj_path(str(project))
+        depgraph.set_save_file_path(str(html))
+        if budget:
+            depgraph.set_memory_budget(budget, tmp)
+
+        depgraph.start_dep_finding()
+        depgraph.start_graph_generating()
+        if viewer == "pyvis":
+            depgraph.visualize_graph_pyvis()
+        else:
+            depgraph.visualize_graph_scalable()
+
+        sink = DigestSink()
+        depgraph.write_edges(sink)  # type: ignore[arg-type]
+        depgraph.close()
+
+    report = depgraph.get_stats().to_dict()
+    return {
+        "stages": {
+            name: stage["peak_rss_bytes"] for name, stage in report["stages"].items()
+        },
+        "peak": report["peak_rss_bytes"],
+        "edges": report["counters"].get("graph_edges", 0),
+        "digest": sink.digest % 2**64,
+    }
+
+
+def measure(project: Path, budget: int, viewer: str) -> Dict:
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            str(project),
+            "--budget",
+            str(budget),
+            "--viewer",
+            viewer,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # pyvis печатает в stdout своё сообщение, отчёт - последняя строка
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--imports", type=int, default=8)
+    parser.add_argument("--budget", type=int, default=16, help="budget in MB")
+    parser.add_argument("--viewer", choices=("scalable", "pyvis"), default="scalable")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_pipeline(Path(args.child), args.budget, args.viewer)))
+        return
+
+    for modules in args.modules:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "project"
+            generate_project(project, ProjectSpec(modules=modules, imports=args.imports))
+
+            results = {
+                "in memory": measure(project, 0, args.viewer),
+                f"{args.budget} MB budget": measure(project, args.budget, args.viewer),
+            }
+
+        print(f"{modules} modules, {results['in memory']['edges']} edges")
+        for mode, result in results.items():
+            stages = "  ".join(
+                f"{name} {result['stages'][name] / 2**20:6.1f}"
+                for name in STAGES
+                if name in result["stages"]
+            )
+            print(f"  {mode:<14} peak {result['peak'] / 2**20:7.1f} MB | {stages}")
+
+        digests = {result["digest"] for result in results.values()}
+        print(f"  edges {'same' if len(digests) == 1 else 'DIFFERENT'} in both modes")
+
+
+if __name__ == "__main__":
+    main()
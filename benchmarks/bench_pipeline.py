@@ -0,0 +1,224 @@
+"""
+Бенчмарк всего пайплайна на синтетических проектах разного размера.
+
+Запуск:
+    python benchmarks/bench_pipeline.py [--scales 1000 10000 100000]
+        [--engine ast|scan] [--repeat R] [--output results.json]
+        [--compare baseline.json] [--projects-dir DIR]
+
+Для каждой точки масштаба генерируется детерминированный проект
+(synthetic_project.py) и замеряются этапы: обход файлов, извлечение
+импортов, разрешение импортов, построение графа (networkx и compact)
+и экспорт (edge list, JSON Lines, бинарный снимок, HTML). Для каждого
+этапа берётся лучшее время из repeat прогонов.
+
+Результат с параметрами генератора, версией Python и коммитом пишется
+в JSON; --compare печатает отношение времён к ранее сохранённому
+прогону, поэтому результаты разных коммитов сравнимы офлайн.
+С --projects-dir сгенерированные проекты сохраняются и переиспользуются.
+"""
+
+import argparse
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_project import ProjectSpec, generate_project  # noqa: E402
+
+from depgraph.analyzing.python_analyzer import (  # noqa: E402
+    ANALYZER_ENGINES,
+    PythonImportsAnalyzer,
+)
+from depgraph.dep_finding.python_dep_finder import PythonDepFinder  # noqa: E402
+from depgraph.file_finding.python_file_finder import PythonFileFinder  # noqa: E402
+from depgraph.graph_building.edge_sink import (  # noqa: E402
+    EdgeListWriter,
+    JsonLinesWriter,
+)
+from depgraph.graph_building.graph_creator import GraphCreator  # noqa: E402
+from depgraph.graph_building.graph_snapshot import save_snapshot  # noqa: E402
+from depgraph.utils import _to_dep_dict  # noqa: E402
+from depgraph.visualizing.scalable_renderer import render_scalable_html  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCALES = [1000, 10000]
+
+# этап -> секунды
+Timings = Dict[str, float]
+
+
+def measure(run: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_project(base: Path, spec: ProjectSpec) -> Path:
+
+    project = base / f"synth_{spec.modules}_{spec.seed}"
+    marker = project / ".generated"
+    if marker.exists():
+        return project
+
+    generate_project(project, spec)
+    marker.write_text(json.dumps(spec._asdict()), encoding="utf-8")
+    return project
+
+
+def bench_project(project: Path, engine: str, repeat: int, output_dir: Path) -> Dict:
+
+    timings: Timings = {}
+
+    def discover() -> Tuple[List[Path], set]:
+        finder = PythonFileFinder(project)
+        return finder.find_all(), finder.get_project_roots()
+
+    timings["discovery"], (modules, roots) = measure(discover, repeat)
+
+    analyser = PythonImportsAnalyzer(project, engine)
+
+    def analyze() -> Dict[Path, List]:
+        imports = {}
+        for module in modules:
+            analyser.analyze(module)
+            imports[module] = analyser.get_results()
+            analyser.clear_results()
+        return imports
+
+    timings["analysis"], imports = measure(analyze, repeat)
+
+    def resolve() -> Dict[Path, List[Path]]:
+        dep_dict = _to_dep_dict(modules)
+        dep_finder = PythonDepFinder(
+            dir_path=project,
+            project_roots=set(roots),
+            dep_dict=dep_dict,
+            modules=list(modules),
+            analyser=analyser,
+        )
+        for module, deps in imports.items():
+            dep_finder._resolve_imports(deps, module)
+        return dep_dict
+
+    timings["resolution"], dep_dict = measure(resolve, repeat)
+
+    graphs = {}
+    for backend in ("networkx", "compact"):
+
+        def build() -> object:
+            creator = GraphCreator(backend)
+            creator.build_graph(dep_dict)
+            return creator.get_graph()
+
+        timings[f"graph_{backend}"], graphs[backend] = measure(build, repeat)
+
+    def write_edges(writer_class: type) -> None:
+        writer = writer_class(io.StringIO())
+        for module, deps in dep_dict.items():
+            writer.add_module(module)
+            for dep in deps:
+                writer.add_dependency(module, dep)
+
+    timings["export_edgelist"], _ = measure(lambda: write_edges(EdgeListWriter), repeat)
+    timings["export_jsonl"], _ = measure(lambda: write_edges(JsonLinesWriter), repeat)
+    timings["export_snapshot"], _ = measure(
+        lambda: save_snapshot(graphs["compact"], output_dir / "graph.snapshot"), repeat
+    )
+    timings["export_html"], _ = measure(
+        lambda: render_scalable_html(graphs["networkx"], output_dir / "graph.html"),
+        repeat,
+    )
+
+    return {
+        "files": len(modules),
+        "edges": sum(len(deps) for deps in dep_dict.values()),
+        "stages": timings,
+    }
+
+
+def print_results(scale: str, result: Dict, baseline: Optional[Dict]) -> None:
+
+    print(f"\n{scale} modules ({result['files']} files, {result['edges']} edges)")
+    base = (baseline or {}).get("results", {}).get(scale, {}).get("stages", {})
+    for stage, seconds in result["stages"].items():
+        line = f"  {stage:<18} {seconds * 1000:10.1f} ms"
+        if base.get(stage):
+            line += f"   x{seconds / base[stage]:.2f} vs baseline"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--engine", choices=ANALYZER_ENGINES, default="ast")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--projects-dir", type=Path)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        base = args.projects_dir or Path(tmp)
+        output_dir = Path(tmp)
+
+        for scale in args.scales:
+            spec = ProjectSpec(modules=scale, seed=args.seed)
+            project = prepare_project(base, spec)
+            results[str(scale)] = bench_project(
+                project, args.engine, args.repeat, output_dir
+            )
+            print_results(str(scale), results[str(scale)], baseline)
+
+    if args.output:
+        spec = ProjectSpec(seed=args.seed)._asdict()
+        del spec["modules"]
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "engine": args.engine,
+            "repeat": args.repeat,
+            "spec": spec,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nresults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
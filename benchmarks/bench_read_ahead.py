@@ -0,0 +1,69 @@
+"""
+Бенчмарк предварительного чтения файлов на медленной файловой системе.
+
+Запуск:
+    python benchmarks/bench_read_ahead.py [--modules N] [--latency MS]
+        [--threads 0 4 8 16] [--workers W]
+
+Задержка NFS/FUSE имитируется паузой перед каждым чтением файла
+(как и настоящее ожидание ввода-вывода, она отпускает GIL). Для каждого
+числа потоков чтения замеряется start_dep_finding на синтетическом проекте.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_project import ProjectSpec, generate_project  # noqa: E402
+
+from depgraph.dep_finding import python_dep_finder  # noqa: E402
+from depgraph.main import Depgraph  # noqa: E402
+
+
+def slow_reader(latency: float):
+    read_source = python_dep_finder.read_source
+
+    def read(full_path: Path) -> bytes:
+        time.sleep(latency)
+        return read_source(full_path)
+
+    return read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=1.0, help="milliseconds per read")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0, 4, 8, 16])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    # воркеры пула наследуют подмену при fork
+    python_dep_finder.read_source = slow_reader(args.latency / 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        generate_project(project, ProjectSpec(modules=args.modules))
+
+        print(f"{args.modules} modules, {args.latency} ms per read, {args.workers} workers")
+        for threads in args.threads:
+            depgraph = Depgraph()
+            depgraph.set_proj_path(str(project))
+            depgraph.set_workers(args.workers)
+            depgraph.set_read_threads(threads)
+
+            start = time.perf_counter()
+            depgraph.start_dep_finding()
+            elapsed = time.perf_counter() - start
+            print(f"  read threads {threads:>3}: {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
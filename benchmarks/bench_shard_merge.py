@@ -0,0 +1,89 @@
+"""
+Бенчмарк слияния шардов.
+
+Запуск:
+    python benchmarks/bench_shard_merge.py [--modules 1000 4000 16000]
+
+Синтетический проект анализируется целиком и по частям: каждое поддерево
+synth/pkgN - отдельный шард со своим prefix, корневой пакет - ещё один шард.
+Результаты шардов сливаются через Depgraph.merge_partials(); выводится
+время слияния на ребро (оно не должно расти с размером проекта) и
+совпадают ли рёбра с анализом целиком.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_project import ROOT_PACKAGE, ProjectSpec, generate_project  # noqa: E402
+
+from depgraph.main import Depgraph  # noqa: E402
+
+
+def edge_set(dep_dict) -> set:
+    return {
+        (module.as_posix(), dep.as_posix())
+        for module, deps in dep_dict.items()
+        for dep in deps
+        if dep != module
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, nargs="+", default=[1000, 4000, 16000])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    for modules in args.modules:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "project"
+            generate_project(project, ProjectSpec(modules=modules, depth=2))
+            package = project / ROOT_PACKAGE
+            subtrees = sorted(path.name for path in package.iterdir() if path.is_dir())
+
+            whole = Depgraph()
+            whole.set_proj_path(str(project))
+            whole.start_dep_finding()
+
+            partial_files = []
+
+            top = Depgraph()
+            top.set_proj_path(str(package))
+            top.set_exclude_patterns([f"/{name}/" for name in subtrees])
+            top.start_dep_finding()
+            partial_files.append(str(Path(tmp) / "top.json"))
+            top.save_partial(partial_files[-1], ROOT_PACKAGE)
+
+            for name in subtrees:
+                shard = Depgraph()
+                shard.set_proj_path(str(package / name))
+                shard.start_dep_finding()
+                partial_files.append(str(Path(tmp) / f"{name}.json"))
+                shard.save_partial(partial_files[-1], f"{ROOT_PACKAGE}/{name}")
+
+            merged = Depgraph()
+            start = time.perf_counter()
+            merged.merge_partials(partial_files)
+            elapsed = time.perf_counter() - start
+
+            expected = edge_set(whole.get_dep_dict())
+            got = edge_set(merged.get_dep_dict())
+            print(
+                f"{modules:>6} modules, {len(partial_files):>3} partials, "
+                f"{len(got):>7} edges: merge {elapsed * 1000:8.1f} ms, "
+                f"{elapsed / max(1, len(got)) * 1e6:6.2f} us/edge, "
+                f"{'same as whole' if got == expected else 'DIFFERENT'} "
+                f"({len(expected - got)} missing, {len(got - expected)} extra)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Генератор синтетических Python-проектов для бенчмарков.
+
+Запуск:
+    python benchmarks/synthetic_project.py OUT_DIR [--modules N] [--depth D]
+        [--imports K] [--relative-ratio R] [--cycle-density C] [--seed S]
+
+Проект детерминирован параметрами и seed: одинаковые параметры дают
+байт-в-байт одинаковое дерево, поэтому результаты бенчмарков сравнимы
+между коммитами. Модули раскладываются по пакетам глубины depth (по
+~modules_per_package модулей в пакете), у каждого модуля imports
+внутренних импортов. Без циклов граф импортов ацикличен: модуль
+импортирует только модули с меньшим номером; с вероятностью cycle_density
+импорт направлен "вперёд" и может замкнуть цикл. Доля relative_ratio
+импортов записывается относительными ("from ..pkg import mod").
+Дополнительно в каждом модуле есть импорты stdlib, вложенные импорты
+в функциях и немного кода, чтобы разбор был похож на реальный.
+"""
+
+import argparse
+import math
+import random
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+ROOT_PACKAGE = "synth"
+
+
+class ProjectSpec(NamedTuple):
+    modules: int = 1000
+    depth: int = 3
+    imports: int = 8
+    relative_ratio: float = 0.3
+    cycle_density: float = 0.02
+    modules_per_package: int = 20
+    seed: int = 0
+
+
+class ProjectInfo(NamedTuple):
+    files: int
+    packages: int
+    internal_imports: int
+
+
+MODULE_BODY = '''
+
+def function_{i}(values):
+    """Sum squares; the docstring mentions import {i} on purpose."""
+    import json
+
+    total = 0
+    for index, value in enumerate(values):
+        total += value * value if index % 2 else -value
+    return json.dumps({{"total": total, "name": "module_{i}"}})
+
+
+class Model{i}:
+    def __init__(self, size):
+        self.items = [x * {i} for x in range(size)]
+
+    def describe(self):
+        return ", ".join(str(item) for item in self.items[:10])
+'''
+
+STDLIB_HEADER = """import os
+import sys
+from typing import Dict, List, Optional
+"""
+
+
+def _package_paths(package_count: int, depth: int) -> List[Tuple[str, ...]]:
+    """
+    Листовые пакеты глубины depth под корневым пакетом, по fanout
+    подпакетов на уровень, где fanout ** depth >= package_count.
+    """
+    fanout = max(1, math.ceil(package_count ** (1 / depth))) if depth else 1
+    packages = []
+    for i in range(package_count):
+        parts = [ROOT_PACKAGE]
+        x = i
+        for _ in range(depth):
+            parts.append(f"pkg{x % fanout}")
+            x //= fanout
+        packages.append(tuple(parts))
+    return packages
+
+
+def _import_line(
+    importer: Tuple[str, ...], target: Tuple[str, ...], index: int, relative: bool
+) -> str:
+
+    if not relative:
+        module = ".".join(target + (f"mod{index}",))
+        if index % 2:
+            return f"import {module}"
+        return f"from {module} import function_{index}"
+
+    common = 0
+    while common < min(len(importer), len(target)) and importer[common] == target[common]:
+        common += 1
+    level = len(importer) - common + 1
+    module = ".".join(target[common:] + (f"mod{index}",))
+    return f"from {'.' * level}{module} import Model{index}"
+
+
+def generate_project(root: Path, spec: ProjectSpec) -> ProjectInfo:
+    """
+    Пишет синтетический проект в root (каталог должен быть пустым или отсутствовать).
+
+    Returns:
+        ProjectInfo: число файлов, пакетов и внутренних импортов.
+    """
+    rng = random.Random(spec.seed)
+    package_count = max(1, spec.modules // spec.modules_per_package)
+    leaf_packages = _package_paths(package_count, spec.depth)
+
+    package_dirs = set()
+    for package in leaf_packages:
+        for level in range(1, len(package) + 1):
+            package_dirs.add(package[:level])
+
+    for package in sorted(package_dirs):
+        directory = root.joinpath(*package)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "__init__.py").write_text(
+            f'"""Package {".".join(package)}."""\n', encoding="utf-8"
+        )
+
+    module_packages = [leaf_packages[i % package_count] for i in range(spec.modules)]
+    internal_imports = 0
+
+    for i in range(spec.modules):
+        package = module_packages[i]
+        lines = [STDLIB_HEADER]
+
+        for _ in range(spec.imports if spec.modules > 1 else 0):
+            if i + 1 < spec.modules and (i == 0 or rng.random() < spec.cycle_density):
+                target = rng.randrange(i + 1, spec.modules)
+            elif i > 0:
+                target = rng.randrange(0, i)
+            else:
+                continue
+
+            relative = rng.random() < spec.relative_ratio
+            lines.append(
+                _import_line(package, module_packages[target], target, relative)
+                + "\n"
+            )
+            internal_imports += 1
+
+        lines.append(MODULE_BODY.format(i=i))
+        root.joinpath(*package, f"mod{i}.py").write_text("".join(lines), encoding="utf-8")
+
+    return ProjectInfo(spec.modules + len(package_dirs), len(package_dirs), internal_imports)
+
+
+def main() -> None:
+    defaults = ProjectSpec()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--modules", type=int, default=defaults.modules)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--imports", type=int, default=defaults.imports)
+    parser.add_argument("--relative-ratio", type=float, default=defaults.relative_ratio)
+    parser.add_argument("--cycle-density", type=float, default=defaults.cycle_density)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    if args.output.exists() and any(args.output.iterdir()):
+        raise SystemExit(f"{args.output} is not empty")
+
+    spec = ProjectSpec(
+        modules=args.modules,
+        depth=args.depth,
+        imports=args.imports,
+        relative_ratio=args.relative_ratio,
+        cycle_density=args.cycle_density,
+        seed=args.seed,
+    )
+    info = generate_project(args.output, spec)
+    print(
+        f"{info.files} files in {info.packages} packages, "
+        f"{info.internal_imports} internal imports"
+    )
+
+
+if __name__ == "__main__":
+    main()
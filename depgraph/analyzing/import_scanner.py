@@ -0,0 +1,115 @@
+import ast
+import logging
+import re
+from typing import Iterator, List, Union
+
+__all__ = ["iter_import_nodes"]
+logger = logging.getLogger(__name__)
+
+ImportNode = Union[ast.Import, ast.ImportFrom]
+
+# Комментарии и строковые литералы поглощаются целиком, поэтому "import"
+# внутри docstring-ов и комментариев никогда не становится кандидатом.
+# Кандидат - ключевое слово from/import в начале строки или после ";" / ":"
+# (однострочные "try: import x", "if TYPE_CHECKING: from a import b").
+_TOKEN_RE = re.compile(
+    r"""
+      \#[^\n]*
+    | '''(?:\\.|[^\\])*?'''
+    | \"\"\"(?:\\.|[^\\])*?\"\"\"
+    | '(?:\\.|[^\\'\n])*'
+    | "(?:\\.|[^\\"\n])*"
+    | (?P<stmt>(?:^|(?<=[;:]))[ \t\f]*(?:from|import)\b)
+    """,
+    re.VERBOSE | re.MULTILINE | re.DOTALL,
+)
+
+
+def _statement_end(code: str, pos: int) -> int:
+    """
+    Находит конец логической строки импорта, начинающегося с позиции pos.
+
+    Учитывает скобки "from a import (b, c)", продолжения строк через
+    обратный слэш и комментарии внутри скобок.
+    """
+    depth = 0
+    length = len(code)
+
+    while pos < length:
+        char = code[pos]
+
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "\\":
+            pos += 2
+            continue
+        elif char == "#":
+            if depth == 0:
+                return pos
+            newline = code.find("\n", pos)
+            pos = length if newline == -1 else newline
+            continue
+        elif char == ";" or (char == "\n" and depth <= 0):
+            return pos
+
+        pos += 1
+
+    return pos
+
+
+def _parse_snippets(snippets: List[str]) -> Iterator[ImportNode]:
+
+    try:
+        body = ast.parse("\n".join(snippets)).body
+    except SyntaxError:
+        # среди кандидатов есть ложные срабатывания - разбираем по одному
+        body = []
+        for snippet in snippets:
+            try:
+                body.extend(ast.parse(snippet).body)
+            except SyntaxError:
+                logger.debug(f"skipping non-import candidate {snippet!r}")
+
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+
+
+def iter_import_nodes(code: str) -> Iterator[ImportNode]:
+    """
+    Извлекает узлы импортов без разбора и обхода всего файла.
+
+    Регулярное выражение находит операторы импорта на любом уровне вложенности
+    (функции, классы, try, if TYPE_CHECKING), пропуская строки и комментарии.
+    Затем одним вызовом ast.parse разбирается только текст найденных операторов.
+    Для синтаксически корректного файла узлы совпадают с теми, что находит
+    обход полного AST, и идут в том же порядке. Синтаксические ошибки в
+    остальной части файла, в отличие от ast.parse, не обнаруживаются.
+
+    Args:
+        code (str): исходный код модуля.
+
+    Returns:
+        Iterator[ImportNode]: узлы ast.Import / ast.ImportFrom.
+    """
+    if "import" not in code:
+        return iter(())
+
+    snippets = []
+
+    for match in _TOKEN_RE.finditer(code):
+        if match.group("stmt") is None:
+            continue
+
+        start = match.start("stmt")
+        while code[start] in " \t\f":
+            start += 1
+
+        snippets.append(code[start : _statement_end(code, start)])
+
+    if not snippets:
+        return iter(())
+
+    return _parse_snippets(snippets)
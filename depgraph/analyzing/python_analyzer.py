@@ -1,103 +1,326 @@
 import ast
+import codecs
+import io
 import logging
-from copy import deepcopy
+import tokenize
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from ..utils import _validate_structure
+from .import_scanner import iter_import_nodes
 
-__all__ = ["PythonImportsAnalyzer"]
+__all__ = [
+    "PythonImportsAnalyzer",
+    "ImportRecord",
+    "ANALYZER_VERSION",
+    "ANALYZER_ENGINES",
+    "Diagnostic",
+    "SymbolTable",
+    "collect_symbols",
+    "read_source",
+    "decode_source",
+]
 logger = logging.getLogger(__name__)
 
+# повышать при любом изменении извлекаемых записей, это сбрасывает кеш разбора
+ANALYZER_VERSION = "1"
+
+# "ast" - обход полного AST, "scan" - разбор только найденных операторов импорта
+ANALYZER_ENGINES = ("ast", "scan")
+
+_RECORD_TYPES: Dict = {
+    "module": Optional[str],
+    "name": str,
+    "asname": Optional[str],
+    "level": int,
+}
+
+
+class ImportRecord(NamedTuple):
+    module: Optional[str]
+    name: str
+    asname: Optional[str]
+    level: int
+
+
+class SymbolTable(NamedTuple):
+    # имена, определённые на верхнем уровне модуля (def, class, присваивания)
+    defined: List[str]
+    # импорты верхнего уровня: связываемое имя ("*" для звёздочки) и сам импорт
+    exports: List[Tuple[str, ImportRecord]]
+
+
+def _top_level_statements(body: List[ast.stmt]) -> Iterator[ast.stmt]:
+    """
+    Операторы верхнего уровня, включая ветки if/try/with: так модули
+    часто определяют имена условно ("try: import x" / "if TYPE_CHECKING").
+    """
+    for node in body:
+        if isinstance(node, (ast.If, ast.While, ast.For)):
+            yield from _top_level_statements(node.body)
+            yield from _top_level_statements(node.orelse)
+        elif isinstance(node, (ast.Try, ast.TryStar)):
+            yield from _top_level_statements(node.body)
+            for handler in node.handlers:
+                yield from _top_level_statements(handler.body)
+            yield from _top_level_statements(node.orelse)
+            yield from _top_level_statements(node.finalbody)
+        elif isinstance(node, ast.With):
+            yield from _top_level_statements(node.body)
+        else:
+            yield node
+
+
+def _target_names(target: ast.expr) -> Iterator[str]:
+
+    if isinstance(target, ast.Name):
+        yield target.id
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            yield from _target_names(element)
+    elif isinstance(target, ast.Starred):
+        yield from _target_names(target.value)
+
+
+def collect_symbols(tree: ast.Module) -> SymbolTable:
+    """
+    Собирает имена, которые модуль определяет и реэкспортирует на верхнем уровне.
+    """
+    defined: List[str] = []
+    exports: List[Tuple[str, ImportRecord]] = []
+
+    for node in _top_level_statements(tree.body):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            defined.append(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                defined.extend(_target_names(target))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            defined.extend(_target_names(node.target))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                module, _, name = alias.name.rpartition(".")
+                # "import a.b" связывает имя a, "import a.b as c" - имя c
+                bound = alias.asname or alias.name.partition(".")[0]
+                exports.append(
+                    (bound, ImportRecord(module or None, name, alias.asname, 0))
+                )
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                exports.append(
+                    (
+                        alias.asname or alias.name,
+                        ImportRecord(node.module, alias.name, alias.asname, node.level),
+                    )
+                )
+
+    return SymbolTable(defined, exports)
+
+
+class Diagnostic(NamedTuple):
+    # "read", "decode" или "syntax"
+    kind: str
+    message: str
+    line: Optional[int]
+    # импорты всё же извлечены запасным сканером
+    recovered: bool
+
+
+def read_source(full_path: Path) -> bytes:
+    """
+    Считывает исходный код модуля. Функция не трогает состояние анализатора,
+    поэтому её можно вызывать из потоков предварительного чтения.
+
+    Отдельные проверки exists()/is_file() не делаются: на сетевых ФС
+    каждая из них - лишний запрос к серверу, а отсутствующий файл или
+    каталог и так дают FileNotFoundError/IsADirectoryError при чтении.
+
+    Raises:
+        OSError: файл не удалось прочитать.
+    """
+    return full_path.read_bytes()
+
+
+def _normalize_newlines(code: str) -> str:
+
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    return code
+
+
+def decode_source(data: bytes) -> str:
+    """
+    Декодирует исходный код так же, как интерпретатор: с учётом
+    BOM и объявления кодировки (PEP 263) в первых двух строках.
+
+    Объявление ищется токенайзером, только если в начале файла
+    вообще встречается "coding", поэтому обычный utf-8 файл
+    декодируется одним вызовом.
+
+    Raises:
+        UnicodeError: файл не декодируется в объявленной кодировке.
+    """
+    first = data.find(b"\n")
+    second = data.find(b"\n", first + 1) if first != -1 else -1
+
+    if b"coding" in (data if second == -1 else data[:second]):
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        except SyntaxError as e:
+            raise UnicodeError(str(e)) from e
+    elif data.startswith(codecs.BOM_UTF8):
+        encoding = "utf-8-sig"
+    else:
+        encoding = "utf-8"
+
+    return _normalize_newlines(data.decode(encoding))
+
 
 class PythonImportsAnalyzer(ast.NodeVisitor):
-    def __init__(self, root_folder: Path):
+    def __init__(
+        self,
+        root_folder: Path,
+        engine: str = "ast",
+        resilient: bool = False,
+        symbols: bool = False,
+    ):
+        """
+        Args:
+            root_folder (Path): корень проекта.
+            engine (str): способ извлечения импортов.
+            resilient (bool): не падать на файлах, которые не декодируются
+                            или не разбираются, а извлекать из них импорты
+                            сканером и сообщать об этом через get_diagnostic().
+            symbols (bool): собирать таблицу имён верхнего уровня (get_symbols());
+                            для этого файл всегда разбирается целиком, даже
+                            с движком "scan".
+        """
+        if engine not in ANALYZER_ENGINES:
+            raise ValueError(
+                f"engine need to be one of {ANALYZER_ENGINES} but given '{engine}'"
+            )
+
         self._results: List = []
         self._root_folder = root_folder
+        self._engine = engine
+        self._resilient = resilient
+        self._collect_symbols = symbols
+        self._diagnostic: Optional[Diagnostic] = None
+        self._symbols: Optional[SymbolTable] = None
+        self._debug = logger.isEnabledFor(logging.DEBUG)
 
-        self._entry_tempate: Dict = {
-            "module": None,
-            "name": None,
-            "asname": None,
-            "level": None,
-        }
+    def analyze(self, file_path: Path) -> None:
 
-        self._entry_tempate_types: Dict = {
-            "module": Optional[str],
-            "name": str,
-            "asname": Optional[str],
-            "level": int,
-        }
+        self.analyze_source(self._read_file(file_path))
 
-    def analyze(self, file_path: Path) -> None:
+    def analyze_source(self, data: bytes) -> None:
+        """
+        Извлекает импорты из уже считанного содержимого файла модуля.
 
-        code = self._read_file(file_path)
-        if code is not None:
-            self.visit(ast.parse(code))
-        else:
-            raise OSError(f"Ошибка при чтении файла {str(file_path)}")
+        Raises:
+            UnicodeError: файл не декодируется (не в устойчивом режиме).
+            SyntaxError: файл не разбирается (не в устойчивом режиме).
+        """
+        # проверка записей и подробный лог включаются только в режиме отладки
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        self._diagnostic = None
+        self._symbols = None
 
-    def visit_Import(self, node: ast.Import) -> None:
+        try:
+            code = decode_source(data)
+        except UnicodeError as e:
+            if not self._resilient:
+                raise
+            # имена модулей - ASCII, их испорченные символы не затрагивают
+            code = _normalize_newlines(data.decode("utf-8", errors="replace"))
+            self._diagnostic = Diagnostic("decode", str(e), None, True)
+            self._scan(code)
+            return
 
-        logger.debug("found an ast.Import node")
+        if self._engine == "scan" and not self._collect_symbols:
+            self._scan(code)
+            return
 
-        for import_name in node.names:
-            module, name = (import_name.name.rsplit(".", 1) + [None])[:2]
-
-            if name is None:
-                module, name = None, module
-
-            entry = self.get_entry_template()
-            entry.update(
-                {
-                    "module": module,
-                    "level": 0,
-                    "name": name,
-                    "asname": import_name.asname,
-                }
+        try:
+            tree = ast.parse(code)
+            self.visit(tree)
+            if self._collect_symbols:
+                self._symbols = collect_symbols(tree)
+        except (SyntaxError, ValueError, RecursionError) as e:
+            if not self._resilient:
+                raise
+            self._results = []
+            self._diagnostic = Diagnostic(
+                "syntax", str(e), getattr(e, "lineno", None), True
             )
+            self._scan(code)
 
-            self._add_to_results(entry)
+    def _scan(self, code: str) -> None:
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for node in iter_import_nodes(code):
+            self.visit(node)
 
-        logger.debug("found an ast.ImportFrom node")
+    def visit_Import(self, node: ast.Import) -> None:
 
         for import_name in node.names:
-            entry = self.get_entry_template()
-            entry.update(
-                {
-                    "module": node.module,
-                    "level": node.level,
-                    "name": import_name.name,
-                    "asname": import_name.asname,
-                }
+            module, _, name = import_name.name.rpartition(".")
+
+            self._add_to_results(
+                ImportRecord(module or None, name, import_name.asname, 0)
             )
 
-            self._add_to_results(entry)
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+
+        for import_name in node.names:
+            self._add_to_results(
+                ImportRecord(node.module, import_name.name, import_name.asname, node.level)
+            )
 
-    def _add_to_results(self, res: Dict) -> None:
-        _validate_structure(res, self._entry_tempate_types)
+    def _add_to_results(self, res: ImportRecord) -> None:
 
-        logger.debug(
-            (
+        if self._debug:
+            _validate_structure(res._asdict(), _RECORD_TYPES)
+            logger.debug(
                 "founded import`s info"
-                f"\nimport module: {res['module']}"
-                f"\nimport name:   {res['name']}"
-                f"\nimport asname: {res['asname']}"
-                f"\nimport level:  {res['level']}"
+                "\nimport module: %s"
+                "\nimport name:   %s"
+                "\nimport asname: %s"
+                "\nimport level:  %s",
+                *res,
             )
-        )
 
         self._results.append(res)
 
-    def get_entry_template(self) -> Dict:
-        return deepcopy(self._entry_tempate)
+    def get_engine(self) -> str:
+        return self._engine
 
-    def get_results(self) -> List:
-        return deepcopy(self._results)
+    def is_resilient(self) -> bool:
+        return self._resilient
 
-    def _read_file(self, file_path: Path) -> Optional[str]:
+    def collects_symbols(self) -> bool:
+        return self._collect_symbols
+
+    def get_symbols(self) -> Optional[SymbolTable]:
+        """
+        Returns:
+            Optional[SymbolTable]: имена верхнего уровня последнего модуля или None,
+                            если они не собирались или модуль не разобран целиком.
+        """
+        return self._symbols
+
+    def get_diagnostic(self) -> Optional[Diagnostic]:
+        """
+        Returns:
+            Optional[Diagnostic]: чем пришлось пожертвовать при разборе
+                            последнего модуля или None, если он разобран полностью.
+        """
+        return self._diagnostic
+
+    def get_results(self) -> List[ImportRecord]:
+        # список не копируется: clear_results() заводит новый, а не очищает этот
+        return self._results
+
+    def _read_file(self, file_path: Path) -> bytes:
         """
         Считывает содержимое Python-файла.
 
@@ -106,28 +329,11 @@ class PythonImportsAnalyzer(ast.NodeVisitor):
                             (относительно self._root_folder).
 
         Returns:
-            Optional[str]: содержимое файла или None, если файл не удалось прочитать.
+            bytes: содержимое файла.
         """
-        full_path = self._root_folder / file_path
-
-        if not full_path.exists():
-            raise FileNotFoundError(f"Файл не найден: {full_path}")
-
-        if not full_path.is_file():
-            raise ValueError(f"Ожидался файл, но получен каталог: {full_path}")
-
-        try:
-            return full_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError as e:
-            raise UnicodeDecodeError(
-                e.encoding,
-                e.object,
-                e.start,
-                e.end,
-                f"Не удалось декодировать файл {full_path} в кодировке utf-8",
-            ) from e
-        except OSError as e:
-            raise OSError(f"Ошибка при чтении файла {full_path}: {e}")
+        return read_source(self._root_folder / file_path)
 
     def clear_results(self) -> None:
         self._results = []
+        self._diagnostic = None
+        self._symbols = None
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..analyzing.python_analyzer import ImportRecord, SymbolTable
+
+__all__ = [
+    "ParseCache",
+    "CACHE_FORMAT_VERSION",
+    "MAX_BLOB_ENTRIES",
+    "Fingerprint",
+    "source_fingerprint",
+]
+logger = logging.getLogger(__name__)
+
+# версия формата самого файла кеша
+CACHE_FORMAT_VERSION = 1
+
+# (mtime_ns, size, digest)
+Fingerprint = Tuple[int, int, str]
+
+# записи о git-блобах хранятся рядом с записями о файлах
+_BLOB_KEY_PREFIX = "blob:"
+
+# сколько записей о блобах хранится: блобы старых ревизий вытесняются первыми
+MAX_BLOB_ENTRIES = 200_000
+
+# импорты модуля и, если собиралась, его таблица имён
+CachedAnalysis = Tuple[List[ImportRecord], Optional[SymbolTable]]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def source_fingerprint(stat: os.stat_result, data: bytes) -> Fingerprint:
+    """
+    Отпечаток файла для записи в кеш по уже прочитанному содержимому.
+
+    Args:
+        stat (os.stat_result): метаданные файла, снятые до чтения: если файл
+                        изменится во время чтения, следующий прогон увидит
+                        новый mtime и сверит хеш.
+        data (bytes): прочитанное и разобранное содержимое.
+    """
+    return stat.st_mtime_ns, stat.st_size, _digest(data)
+
+
+def _make_entry(
+    fingerprint: Fingerprint,
+    records: List[ImportRecord],
+    symbols: Optional[SymbolTable],
+) -> list:
+
+    entry = [*fingerprint, [list(record) for record in records]]
+    if symbols is not None:
+        entry.append(
+            [
+                symbols.defined,
+                [[bound, *record] for bound, record in symbols.exports],
+            ]
+        )
+    return entry
+
+
+def _load_symbols(entry: list) -> Optional[SymbolTable]:
+
+    if len(entry) < 5:
+        return None
+
+    defined, exports = entry[4]
+    return SymbolTable(
+        defined, [(row[0], ImportRecord(*row[1:])) for row in exports]
+    )
+
+
+class ParseCache:
+    """
+    Персистентный кеш извлечённых из модулей импортов.
+
+    Запись ищется по абсолютному пути файла и (mtime, size); если они не
+    совпали, сравнивается хеш содержимого. Файлы из git-ревизий хранятся
+    по id блоба: блоб неизменен, и одинаковое содержимое по разным путям
+    и в разных ревизиях разбирается один раз; записей о блобах хранится
+    не больше max_blob_entries, давно не использованные удаляются первыми.
+    Кеш целиком сбрасывается при смене формата файла или версии
+    анализатора. Без cache_file кеш живёт только в памяти.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Path],
+        analyzer_version: str,
+        max_blob_entries: int = MAX_BLOB_ENTRIES,
+    ):
+        self._cache_file = cache_file
+        self._analyzer_version = analyzer_version
+        self._max_blob_entries = max_blob_entries
+        self._entries: Dict[str, list] = {}
+        self._blob_entries = 0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+
+        self._entries = {}
+        self._blob_entries = 0
+        self._dirty = False
+
+        if self._cache_file is None:
+            return
+
+        if not self._cache_file.exists():
+            logger.debug(f"no parse cache at {str(self._cache_file)}")
+            return
+
+        try:
+            with self._cache_file.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"parse cache {str(self._cache_file)} is unreadable: {e}")
+            return
+
+        if (
+            data.get("version") != CACHE_FORMAT_VERSION
+            or data.get("analyzer") != self._analyzer_version
+        ):
+            logger.info(f"parse cache {str(self._cache_file)} is outdated, ignoring it")
+            return
+
+        self._entries = data.get("entries", {})
+        self._blob_entries = sum(
+            key.startswith(_BLOB_KEY_PREFIX) for key in self._entries
+        )
+        logger.info(
+            f"loaded {len(self._entries)} entries from parse cache {str(self._cache_file)}"
+        )
+
+    def save(self) -> None:
+
+        if not self._dirty or self._cache_file is None:
+            return
+
+        self._prune_blobs()
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "analyzer": self._analyzer_version,
+            "entries": self._entries,
+        }
+
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._cache_file.with_name(self._cache_file.name + ".tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_file, self._cache_file)
+
+        self._dirty = False
+        logger.info(
+            f"saved {len(self._entries)} entries to parse cache {str(self._cache_file)}"
+        )
+
+    def get(self, full_path: Path) -> Optional[CachedAnalysis]:
+        """
+        Возвращает закешированные импорты файла или None при промахе.
+
+        Args:
+            full_path (Path): абсолютный путь к Python-файлу.
+
+        Returns:
+            Optional[CachedAnalysis]: импорты и таблица имён модуля (None, если
+                            она не сохранялась) или None, если файл изменился.
+        """
+        key = str(full_path)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        mtime_ns, size, digest, records = entry[:4]
+        try:
+            stat = full_path.stat()
+        except OSError:
+            # файл пропал или недоступен: ошибку покажет чтение при разборе
+            self.misses += 1
+            return None
+
+        if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+            # другой размер - другое содержимое; хеш сверяется, только
+            # когда поменялся один mtime (checkout, touch)
+            if stat.st_size != size or _digest(full_path.read_bytes()) != digest:
+                self.misses += 1
+                return None
+
+            # содержимое не поменялось, обновляем только метаданные
+            entry[0], entry[1] = stat.st_mtime_ns, stat.st_size
+            self._dirty = True
+
+        self.hits += 1
+        return [ImportRecord(*row) for row in records], _load_symbols(entry)
+
+    def put(
+        self,
+        full_path: Path,
+        fingerprint: Fingerprint,
+        records: List[ImportRecord],
+        symbols: Optional[SymbolTable] = None,
+    ) -> None:
+        """
+        Запоминает импорты файла.
+
+        Args:
+            full_path (Path): абсолютный путь к Python-файлу.
+            fingerprint (Fingerprint): отпечаток разобранного содержимого
+                            (source_fingerprint), файл повторно не читается.
+            records (List[ImportRecord]): импорты модуля.
+            symbols (Optional[SymbolTable]): таблица имён, если собиралась.
+        """
+        self._entries[str(full_path)] = _make_entry(fingerprint, records, symbols)
+        self._dirty = True
+
+    def get_blob(self, blob_id: str) -> Optional[CachedAnalysis]:
+        """
+        Возвращает закешированные импорты git-блоба или None при промахе.
+
+        Args:
+            blob_id (str): id блоба; содержимое по нему не меняется, поэтому
+                            запись не нужно сверять с файлом.
+        """
+        key = _BLOB_KEY_PREFIX + blob_id
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # в конец: при вытеснении блоб считается недавно использованным
+        self._entries[key] = entry
+        self.hits += 1
+        return [ImportRecord(*row) for row in entry[3]], _load_symbols(entry)
+
+    def put_blob(
+        self,
+        blob_id: str,
+        records: List[ImportRecord],
+        symbols: Optional[SymbolTable] = None,
+    ) -> None:
+
+        key = _BLOB_KEY_PREFIX + blob_id
+        if self._entries.pop(key, None) is None:
+            self._blob_entries += 1
+
+        # у блоба нет mtime и размера, место хеша занимает его id
+        self._entries[key] = _make_entry((0, 0, blob_id), records, symbols)
+        self._dirty = True
+
+    def prune(self, root_folder: Path, modules: Iterable[Path]) -> None:
+        """
+        Удаляет записи о файлах из root_folder, которых больше нет среди modules.
+        """
+        keep = {str(root_folder / module) for module in modules}
+        prefix = str(root_folder) + os.sep
+        stale = [
+            key for key in self._entries if key.startswith(prefix) and key not in keep
+        ]
+
+        for key in stale:
+            del self._entries[key]
+
+        if stale:
+            self._dirty = True
+            logger.debug(f"pruned {len(stale)} stale parse cache entries")
+
+    def _prune_blobs(self) -> None:
+        """
+        Удаляет самые старые записи о блобах сверх max_blob_entries.
+        Порядок словаря - порядок использования: get_blob и put_blob
+        переносят запись в конец, и он сохраняется в файле кеша.
+        """
+        excess = self._blob_entries - self._max_blob_entries
+        if excess <= 0:
+            return
+
+        stale = []
+        for key in self._entries:
+            if key.startswith(_BLOB_KEY_PREFIX):
+                stale.append(key)
+                if len(stale) == excess:
+                    break
+
+        for key in stale:
+            del self._entries[key]
+        self._blob_entries -= len(stale)
+        logger.debug(f"pruned {len(stale)} old blob entries from the parse cache")
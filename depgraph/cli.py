@@ -0,0 +1,431 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, TextIO, cast
+
+from .analyzing.python_analyzer import ANALYZER_ENGINES
+from .dep_finding.python_dep_finder import READ_THREADS, RESOLUTION_MODES
+from .graph_building.edge_sink import DotWriter, EdgeListWriter, JsonLinesWriter
+from .main import Depgraph
+from .profiling.pipeline_stats import cprofile_profiler
+
+__all__ = ["main", "OUTPUT_FORMATS"]
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("jsonl", "edgelist", "dot")
+
+# сколько вывода проекта держится в памяти, прежде чем уйти во временный файл
+_SPOOL_BYTES = 4 * 2**20
+
+
+def _build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(
+        prog="depgraph",
+        description="Build import dependency graphs of Python projects "
+        "and write them in a machine-readable format.",
+    )
+    parser.add_argument(
+        "projects",
+        nargs="+",
+        help="project directories to analyze (partial result files with --merge)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="jsonl",
+        help="output format (default: jsonl)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="output file (default: standard output)"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="analyzer processes shared by all projects, 0 - one per CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--resolution",
+        choices=RESOLUTION_MODES,
+        default="module",
+        help="'symbol' points edges of from-imports at the modules that define "
+        "the imported names and records the names (default: module)",
+    )
+    parser.add_argument(
+        "--source-root",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="resolve absolute imports from this project directory, like a "
+        "sys.path entry (e.g. 'src'); may be repeated, searched in order",
+    )
+    parser.add_argument(
+        "--namespace-packages",
+        action="store_true",
+        help="treat directories without __init__.py as PEP 420 namespace packages",
+    )
+    parser.add_argument(
+        "--pyproject",
+        action="store_true",
+        help="take source roots and packages from the project's pyproject.toml",
+    )
+    parser.add_argument(
+        "--read-threads",
+        type=int,
+        default=READ_THREADS,
+        help="threads reading files ahead of parsing, helps on NFS and FUSE; "
+        f"0 - read one file at a time (default: {READ_THREADS})",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ANALYZER_ENGINES,
+        default="ast",
+        help="import extraction engine (default: ast)",
+    )
+    parser.add_argument(
+        "--cache", help="parse cache file shared by all projects"
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="gitignore-style exclude pattern, may be repeated",
+    )
+    parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help="do not skip .git, .venv, node_modules, build and similar directories",
+    )
+    parser.add_argument(
+        "--no-gitignore", action="store_true", help="do not read .gitignore files"
+    )
+    parser.add_argument(
+        "--resilient",
+        action="store_true",
+        help="do not stop on files with syntax or encoding errors, "
+        "extract their imports with the fallback scanner",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        metavar="FILE",
+        help="write files that could not be read or fully parsed as JSON",
+    )
+    parser.add_argument(
+        "--stats", metavar="FILE", help="write per-stage timings and counters as JSON"
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE", help="run the pipeline under cProfile (pstats file)"
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="ADDRESS",
+        help="keep watching a single project and answer dependency queries on a "
+        "unix socket path or host:port instead of writing the graph",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="with --watch, poll the file tree instead of using inotify",
+    )
+    parser.add_argument(
+        "--git-diff",
+        nargs=2,
+        metavar=("BASE", "HEAD"),
+        help="compare the dependency graphs of a single project at two git "
+        "revisions without checking them out and write the delta as JSON",
+    )
+    parser.add_argument(
+        "--partial",
+        metavar="FILE",
+        help="analyze a single project as one shard of a larger graph and write "
+        "its partial result instead of the graph",
+    )
+    parser.add_argument(
+        "--shard-prefix",
+        metavar="PATH",
+        help="with --partial, where the shard lives in the merged graph, e.g. "
+        "monorepo/services/billing (default: project directory name)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="merge partial results given as positional arguments into one graph, "
+        "resolving imports between shards",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="log progress to stderr (-vv for debug output)",
+    )
+    return parser
+
+
+def _create_sink(
+    output_format: str, stream: TextIO, project: Path, several: bool
+) -> object:
+
+    # при нескольких проектах каждая строка помечается своим проектом
+    label = str(project) if several else None
+
+    if output_format == "jsonl":
+        return JsonLinesWriter(stream, label)
+    if output_format == "edgelist":
+        return EdgeListWriter(stream, label)
+    return DotWriter(stream, project.name or str(project))
+
+
+def _analyze_projects(
+    depgraph: Depgraph,
+    projects: List[Path],
+    output_format: str,
+    stream: TextIO,
+    diagnostics: List[Dict],
+) -> int:
+
+    failed = 0
+
+    for project in projects:
+        # вывод проекта попадает в поток только при успехе, чтобы рёбра
+        # упавшего на середине проекта не оставались в выводе; большой вывод
+        # уходит во временный файл, а не копится в памяти
+        with tempfile.SpooledTemporaryFile(
+            _SPOOL_BYTES, mode="w+", encoding="utf-8"
+        ) as spool:
+            output = cast(TextIO, spool)
+            sink = _create_sink(output_format, output, project, len(projects) > 1)
+
+            try:
+                depgraph.set_proj_path(str(project))
+                depgraph.start_streaming(sink)  # type: ignore[arg-type]
+                if isinstance(sink, DotWriter):
+                    sink.close()
+            except Exception as e:
+                # один сломанный проект не должен останавливать пакетный прогон
+                logger.error(f"failed to analyze {str(project)}: {e}")
+                failed += 1
+                continue
+
+            spool.seek(0)
+            shutil.copyfileobj(spool, stream)
+
+        logger.info(
+            f"{str(project)}: {sink.modules} modules, "  # type: ignore[attr-defined]
+            f"{sink.edges} dependencies"  # type: ignore[attr-defined]
+        )
+
+        for module, diagnostic in sorted(depgraph.get_diagnostics().items()):
+            diagnostics.append(
+                {"project": str(project), "path": module.as_posix(), **diagnostic._asdict()}
+            )
+
+    return failed
+
+
+def _watch(depgraph: Depgraph, project: Path, address: str, use_inotify: bool) -> int:
+
+    # модули наблюдения импортируются только в режиме --watch
+    from .watching.watch_daemon import WatchDaemon, parse_address
+
+    depgraph.set_proj_path(str(project))
+    daemon = WatchDaemon(depgraph, parse_address(address), use_inotify)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("watch mode stopped")
+    return 0
+
+
+def _diff_revisions(
+    depgraph: Depgraph, project: Path, base: str, head: str, stream: TextIO
+) -> int:
+
+    depgraph.set_proj_path(str(project))
+    try:
+        delta = depgraph.diff_revisions(base, head)
+    except (OSError, ValueError) as e:
+        logger.error(f"failed to compare {base} and {head}: {e}")
+        return 1
+
+    json.dump(delta.to_dict(), stream, ensure_ascii=False, indent=2)
+    stream.write("\n")
+    return 0
+
+
+def _write_partial(
+    depgraph: Depgraph,
+    project: Path,
+    partial_file: str,
+    prefix: Optional[str],
+    diagnostics: List[Dict],
+) -> int:
+
+    depgraph.set_proj_path(str(project))
+    try:
+        depgraph.start_dep_finding()
+        depgraph.save_partial(partial_file, prefix)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.error(f"failed to write partial result of {str(project)}: {e}")
+        return 1
+
+    for module, diagnostic in sorted(depgraph.get_diagnostics().items()):
+        diagnostics.append(
+            {"project": str(project), "path": module.as_posix(), **diagnostic._asdict()}
+        )
+    return 0
+
+
+def _merge_partials(
+    depgraph: Depgraph, partial_files: List[str], output_format: str, stream: TextIO
+) -> int:
+
+    try:
+        depgraph.merge_partials(partial_files)
+    except (OSError, ValueError) as e:
+        logger.error(f"failed to merge partial results: {e}")
+        return 1
+
+    sink = _create_sink(output_format, stream, Path("merged"), several=False)
+    try:
+        depgraph.write_edges(sink)  # type: ignore[arg-type]
+    finally:
+        if isinstance(sink, DotWriter):
+            sink.close()
+
+    logger.info(
+        f"merged {len(partial_files)} shards: "
+        f"{sink.modules} modules, {sink.edges} dependencies"  # type: ignore[attr-defined]
+    )
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Точка входа консольной утилиты.
+
+    Все проекты анализируются в одном процессе одним экземпляром Depgraph:
+    кеш разбора и пул процессов создаются один раз и переиспользуются.
+    Рёбра пишутся в поток по мере разрешения, без построения графа
+    и без импорта модулей визуализации.
+
+    Returns:
+        int: код возврата: 0 - успех, 1 - часть проектов не удалось разобрать,
+                        2 - ошибка аргументов.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)],
+        stream=sys.stderr,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    projects = [Path(project).resolve() for project in args.projects]
+    for project in projects:
+        if args.merge and not project.is_file():
+            parser.error(f"partial result {str(project)} does not exist")
+        if not args.merge and not project.is_dir():
+            parser.error(f"project directory {str(project)} does not exist")
+
+    if args.watch and len(projects) > 1:
+        parser.error("--watch works with a single project")
+
+    if args.partial and len(projects) > 1:
+        parser.error("--partial works with a single project")
+
+    if args.merge and (args.partial or args.watch):
+        parser.error("--merge cannot be combined with --partial or --watch")
+
+    if args.git_diff and (len(projects) > 1 or args.merge or args.partial or args.watch):
+        parser.error(
+            "--git-diff works with a single project and without --merge, "
+            "--partial or --watch"
+        )
+
+    if args.shard_prefix is not None and not args.partial:
+        parser.error("--shard-prefix needs --partial")
+
+    if args.workers < 0:
+        parser.error(f"workers must be non-negative but given {args.workers}")
+    workers = args.workers or os.cpu_count() or 1
+
+    if args.read_threads < 0:
+        parser.error(f"read threads must be non-negative but given {args.read_threads}")
+
+    depgraph = Depgraph()
+    depgraph.set_workers(workers)
+    depgraph.set_read_threads(args.read_threads)
+    depgraph.set_analyzer_engine(args.engine)
+    depgraph.set_exclude_patterns(
+        args.exclude, use_default_excludes=not args.no_default_excludes
+    )
+    depgraph.set_use_gitignore(not args.no_gitignore)
+    depgraph.set_resilient(args.resilient)
+    depgraph.set_resolution(args.resolution)
+    try:
+        depgraph.set_resolution_model(
+            args.source_root or None, args.namespace_packages, args.pyproject
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if args.cache:
+        depgraph.set_cache_path(args.cache)
+    if args.profile:
+        depgraph.set_profiler(cprofile_profiler(Path(args.profile).resolve()))
+
+    if args.watch:
+        return _watch(depgraph, projects[0], args.watch, not args.poll)
+
+    stream = (
+        open(args.output, "w", encoding="utf-8", newline="\n")
+        if args.output
+        else sys.stdout
+    )
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    diagnostics: List[Dict] = []
+
+    try:
+        depgraph.set_process_pool(executor)
+        if args.git_diff:
+            failed = _diff_revisions(depgraph, projects[0], *args.git_diff, stream)
+        elif args.merge:
+            failed = _merge_partials(depgraph, args.projects, args.format, stream)
+        elif args.partial:
+            failed = _write_partial(
+                depgraph, projects[0], args.partial, args.shard_prefix, diagnostics
+            )
+        else:
+            failed = _analyze_projects(
+                depgraph, projects, args.format, stream, diagnostics
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if stream is not sys.stdout:
+            stream.close()
+        else:
+            stream.flush()
+
+    if args.diagnostics:
+        Path(args.diagnostics).write_text(
+            json.dumps(diagnostics, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+    if args.stats:
+        depgraph.save_stats_report(args.stats)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("pipeline stats:\n%s", depgraph.get_stats().summary())
+
+    return 1 if failed else 0
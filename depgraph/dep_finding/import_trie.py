@@ -0,0 +1,286 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .module_index import ModuleIndex, ModuleKey, module_key
+
+__all__ = ["ImportTrie"]
+logger = logging.getLogger(__name__)
+
+# ранг кандидата: (порядок корня, 0 - модуль-файл / 1 - пакет); меньший побеждает
+_Rank = Tuple[int, int]
+_NO_RANK: _Rank = (1 << 30, 1)
+
+
+class _TrieNode:
+    """
+    Нода дерева имён импорта: a -> b -> c для "a.b.c".
+
+    module - модуль, в который разрешается имя; plain - то же для
+    "import a" без from (в модели корневых пакетов такой импорт ищется
+    без отбрасывания имени корня).
+    """
+
+    __slots__ = ("children", "module", "rank", "plain", "plain_rank", "locations")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.module: Optional[Path] = None
+        self.rank: _Rank = _NO_RANK
+        self.plain: Optional[Path] = None
+        self.plain_rank: _Rank = _NO_RANK
+        # каталоги проекта, в которых ищутся подмодули (порции пакета по PEP 420)
+        self.locations: List[ModuleKey] = []
+
+    def child(self, part: str) -> "_TrieNode":
+        node = self.children.get(part)
+        if node is None:
+            node = self.children[part] = _TrieNode()
+        return node
+
+
+class ImportTrie:
+    """
+    Дерево имён абсолютных импортов проекта, скомпилированное из индекса
+    модулей и модели разрешения. Импорт "a.b.c" разрешается одним проходом
+    по дереву, без перебора корней.
+
+    Две модели:
+    - for_roots: прежняя модель корневых пакетов. Внутри каждого корня
+      имя ищется и с именем корня ("pkg.mod" -> pkg/mod.py), и без него
+      ("mod" -> pkg/mod.py); при совпадении побеждает корень с меньшим
+      путём, в одном корне модуль-файл побеждает пакет.
+    - for_model: как sys.path. Корни исходников (".", "src", ...)
+      просматриваются по порядку, на каждом уровне имени побеждает
+      первый корень с модулем или обычным пакетом; каталоги без __init__.py
+      с namespace_packages сливаются в пакет пространства имён (PEP 420).
+      Явно объявленные пакеты (pyproject) привязывают имя к каталогу.
+
+    Дерево компилируется лениво при первом поиске; после изменения индекса
+    модулей нужно вызвать invalidate().
+    """
+
+    def __init__(
+        self,
+        index: ModuleIndex,
+        roots: Iterable[Tuple[ModuleKey, str]] = (),
+        source_roots: Optional[List[ModuleKey]] = None,
+        packages: Iterable[Tuple[ModuleKey, ModuleKey]] = (),
+        namespace_packages: bool = False,
+    ):
+        self._index = index
+        # модель корневых пакетов: (части пути корня, имя корня)
+        self._roots = sorted(roots)
+        # модель путей: корни исходников и пакеты (имя -> каталог)
+        self._source_roots = source_roots
+        self._packages = list(packages)
+        self._namespace_packages = namespace_packages
+        self._root: Optional[_TrieNode] = None
+
+    @classmethod
+    def for_roots(
+        cls, index: ModuleIndex, roots: Iterable[Tuple[ModuleKey, str]]
+    ) -> "ImportTrie":
+        return cls(index, roots=roots)
+
+    @classmethod
+    def for_model(
+        cls,
+        index: ModuleIndex,
+        source_roots: List[ModuleKey],
+        packages: Iterable[Tuple[ModuleKey, ModuleKey]] = (),
+        namespace_packages: bool = False,
+    ) -> "ImportTrie":
+        return cls(
+            index,
+            source_roots=source_roots,
+            packages=packages,
+            namespace_packages=namespace_packages,
+        )
+
+    def invalidate(self) -> None:
+        self._root = None
+
+    def lookup(self, parts: ModuleKey, bare: bool = False) -> Optional[Path]:
+        """
+        Разрешает абсолютное имя одним проходом по дереву.
+
+        Args:
+            parts (ModuleKey): части имени: ("a", "b") для "a.b".
+            bare (bool): имя из "import a" без from.
+
+        Returns:
+            Optional[Path]: модуль проекта или None.
+        """
+        node = self._get_root()
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                return None
+
+        if bare and self._source_roots is None:
+            return node.plain
+        return node.module
+
+    def is_namespace(self, parts: ModuleKey) -> bool:
+        """
+        Есть ли у имени подмодули, но нет своего модуля (пакет PEP 420).
+        """
+        if not self._namespace_packages:
+            return False
+
+        node = self._get_root()
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                return False
+        return node.module is None
+
+    def import_names(self, module: Path) -> List[ModuleKey]:
+        """
+        Имена, под которыми модуль виден в модели (без учёта затенения):
+        по ним ищутся импорты, которые нужно перерешать, когда модуль
+        появляется или исчезает.
+        """
+        key = module_key(module)
+        names = []
+
+        if self._source_roots is None:
+            for root_parts, root_name in self._roots:
+                if key[: len(root_parts)] == root_parts:
+                    rel = key[len(root_parts) :]
+                    names.append((root_name,) + rel)
+                    if rel:
+                        names.append(rel)
+            return names
+
+        for source_root in self._source_roots:
+            if key[: len(source_root)] == source_root and len(key) > len(source_root):
+                names.append(key[len(source_root) :])
+        for prefix, path in self._packages:
+            if key[: len(path)] == path:
+                names.append(prefix + key[len(path) :])
+        return names
+
+    def _get_root(self) -> _TrieNode:
+
+        if self._root is None:
+            if self._source_roots is None:
+                self._root = self._compile_roots()
+            else:
+                self._root = self._compile_model()
+        return self._root
+
+    def _compile_roots(self) -> _TrieNode:
+
+        root = _TrieNode()
+        root_index = {root_parts: i for i, (root_parts, _) in enumerate(self._roots)}
+
+        for module in self._index:
+            key = module_key(module)
+            is_package = int(module.name == "__init__.py")
+
+            for depth in range(len(key) + 1):
+                i = root_index.get(key[:depth])
+                if i is None:
+                    continue
+
+                root_name = self._roots[i][1]
+                rel = key[depth:]
+                rank = (i, is_package)
+
+                node = self._walk(root, (root_name,) + rel)
+                if rank < node.rank:
+                    node.module, node.rank = module, rank
+
+                if not rel:
+                    continue
+
+                node = self._walk(root, rel)
+                # "pkg.x" ищется в корне pkg только как pkg/x
+                if rel[0] != root_name and rank < node.rank:
+                    node.module, node.rank = module, rank
+                if rank < node.plain_rank:
+                    node.plain, node.plain_rank = module, rank
+
+        logger.debug("Compiled import trie of %s roots", len(self._roots))
+        return root
+
+    def _compile_model(self) -> _TrieNode:
+
+        assert self._source_roots is not None
+        children = self._directory_children()
+
+        root = _TrieNode()
+        root.locations = list(self._source_roots)
+        self._expand(root, children)
+
+        for prefix, path in self._packages:
+            node = self._walk(root, prefix)
+            node.module = self._index.lookup(path)
+            node.locations = [path]
+            node.children = {}
+            self._expand(node, children)
+
+        logger.debug(
+            "Compiled import trie of %s source roots and %s packages",
+            len(self._source_roots),
+            len(self._packages),
+        )
+        return root
+
+    def _directory_children(self) -> Dict[ModuleKey, Set[str]]:
+        """
+        Имена внутри каждого каталога проекта: модули, пакеты и каталоги
+        с модулями (кандидаты в пакеты пространства имён).
+        """
+        children: Dict[ModuleKey, Set[str]] = {}
+        for module in self._index:
+            key = module_key(module)
+            for depth in range(len(key)):
+                children.setdefault(key[:depth], set()).add(key[depth])
+        return children
+
+    def _expand(self, node: _TrieNode, children: Dict[ModuleKey, Set[str]]) -> None:
+        """
+        Достраивает поддерево node по его каталогам, как импорт по
+        __path__ пакета: на каждом уровне побеждает первый каталог с модулем
+        или обычным пакетом, остальные порции сливаются только без них.
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+
+            names: Dict[str, None] = {}
+            for location in current.locations:
+                names.update(dict.fromkeys(sorted(children.get(location, ()))))
+
+            for name in names:
+                if name in current.children:
+                    continue
+
+                module = None
+                locations: List[ModuleKey] = []
+                for location in current.locations:
+                    key = location + (name,)
+                    module = self._index.lookup(key)
+                    if module is not None:
+                        if self._index.is_package(key):
+                            locations = [key]
+                        break
+                    if key in children:
+                        locations.append(key)
+
+                if module is None and not (self._namespace_packages and locations):
+                    continue
+
+                child = current.child(name)
+                child.module = module
+                child.locations = locations
+                stack.append(child)
+
+    @staticmethod
+    def _walk(node: _TrieNode, parts: ModuleKey) -> _TrieNode:
+        for part in parts:
+            node = node.child(part)
+        return node
@@ -0,0 +1,76 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+__all__ = ["ModuleIndex", "ModuleKey", "module_key"]
+logger = logging.getLogger(__name__)
+
+# части пути модуля без суффикса: a/b/c.py -> ("a", "b", "c"), a/b/__init__.py -> ("a", "b")
+ModuleKey = Tuple[str, ...]
+
+
+def module_key(module: Path) -> ModuleKey:
+    parts = module.parts
+    if module.name == "__init__.py":
+        return parts[:-1]
+    return parts[:-1] + (module.stem,)
+
+
+class ModuleIndex:
+    """
+    Индекс модулей проекта для разрешения импортов словарными поисками.
+
+    Как и при проверке кандидатов candidate.py / candidate/__init__.py,
+    модуль-файл имеет приоритет над пакетом с тем же именем.
+    """
+
+    def __init__(self, modules: Iterable[Path] = ()):
+        self._py_modules: Dict[ModuleKey, Path] = {}
+        self._packages: Dict[ModuleKey, Path] = {}
+
+        for module in modules:
+            self.add(module)
+
+    def add(self, module: Path) -> None:
+
+        if module.name == "__init__.py":
+            self._packages[module.parts[:-1]] = module
+        elif module.suffix == ".py":
+            self._py_modules[module.parts[:-1] + (module.stem,)] = module
+
+    def remove(self, module: Path) -> None:
+
+        key = module_key(module)
+        target = self._packages if module.name == "__init__.py" else self._py_modules
+
+        if target.get(key) == module:
+            del target[key]
+
+    def lookup(self, key: ModuleKey) -> Optional[Path]:
+        """
+        Находит модуль по ключу.
+
+        Args:
+            key (ModuleKey): части пути модуля относительно корня проекта.
+
+        Returns:
+            Optional[Path]: путь к модулю или None, если такого модуля нет.
+        """
+        module = self._py_modules.get(key)
+        if module is None:
+            module = self._packages.get(key)
+        return module
+
+    def is_package(self, key: ModuleKey) -> bool:
+        return key in self._packages
+
+    def __contains__(self, module: Path) -> bool:
+        target = self._packages if module.name == "__init__.py" else self._py_modules
+        return target.get(module_key(module)) == module
+
+    def __iter__(self) -> Iterator[Path]:
+        yield from self._packages.values()
+        yield from self._py_modules.values()
+
+    def __len__(self) -> int:
+        return len(self._py_modules) + len(self._packages)
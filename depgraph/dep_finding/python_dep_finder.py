@@ -1,12 +1,203 @@
 import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from ..analyzing.python_analyzer import PythonImportsAnalyzer
-from ..utils import unique_paths, _get_sibling_python_files
+from ..analyzing.python_analyzer import (
+    Diagnostic,
+    ImportRecord,
+    PythonImportsAnalyzer,
+    SymbolTable,
+    read_source,
+)
+from ..caching.parse_cache import Fingerprint, ParseCache, source_fingerprint
+from ..file_finding.python_file_finder import PythonFileFinder
+from .import_trie import ImportTrie
+from .module_index import ModuleIndex, ModuleKey, module_key
+from .resolution_model import ResolutionModel
+from ..utils import _find_project_roots, _get_sibling_python_files, unique_paths
 
 logger = logging.getLogger(__name__)
 
+# сколько модулей отправляется воркеру одной задачей
+_BATCH_SIZE = 32
+
+# потоки предварительного чтения файлов и сколько файлов читается наперёд:
+# на NFS/FUSE время уходит на ожидание ввода-вывода, а не на разбор
+READ_THREADS = 8
+_READ_AHEAD = 64
+
+# "module" - ребро в модуль из from-импорта, "symbol" - в модуль, где имя определено
+RESOLUTION_MODES = ("module", "symbol")
+
+# глубина цепочки реэкспортов, дальше которой имя не прослеживается
+_MAX_REEXPORT_DEPTH = 32
+
+# импорты модуля, его таблица имён, диагностика, если его не удалось разобрать
+# полностью, и отпечаток разобранного содержимого для кеша разбора
+AnalysisResult = Tuple[
+    List[ImportRecord],
+    Optional[SymbolTable],
+    Optional[Diagnostic],
+    Optional[Fingerprint],
+]
+
+# прочитанное содержимое модуля и его отпечаток (если нужен кешу разбора)
+SourceRead = Tuple[bytes, Optional[Fingerprint]]
+
+# (движок, устойчивый режим, сбор таблиц имён)
+AnalyzerOptions = Tuple[str, bool, bool]
+
+
+class _NameIndex(NamedTuple):
+    """
+    Таблица имён модуля в виде для поиска: определённые имена,
+    реэкспорты по связываемому имени и импорты со звёздочкой.
+    """
+
+    defined: Set[str]
+    exports: Dict[str, ImportRecord]
+    star_imports: List[ImportRecord]
+
+    @classmethod
+    def from_symbols(cls, symbols: SymbolTable) -> "_NameIndex":
+
+        exports = {}
+        star_imports = []
+        for bound, module_import in symbols.exports:
+            if bound == "*":
+                star_imports.append(module_import)
+            else:
+                exports[bound] = module_import
+        return cls(set(symbols.defined), exports, star_imports)
+
+# анализаторы внутри процесса-воркера пула: пул может обслуживать
+# несколько проектов подряд, поэтому анализатор заводится на корень и настройки
+_worker_analysers: Dict[Tuple[Path, AnalyzerOptions], PythonImportsAnalyzer] = {}
+_worker_readers: Optional[ThreadPoolExecutor] = None
+
+
+def _read_plain(full_path: Path) -> SourceRead:
+    return read_source(full_path), None
+
+
+def _read_fingerprinted(full_path: Path) -> SourceRead:
+    """
+    Читает модуль и снимает отпечаток для кеша разбора с тех же байтов,
+    которые будут разобраны: файл не читается второй раз ради хеша.
+    """
+    with full_path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    return data, source_fingerprint(stat, data)
+
+
+def _extract_imports(
+    analyser: PythonImportsAnalyzer, read: Callable[[], SourceRead]
+) -> AnalysisResult:
+    """
+    Читает и разбирает один модуль. Ошибки чтения и декодирования
+    относятся только к этому модулю: он остаётся без импортов.
+    Синтаксические ошибки вне устойчивого режима пробрасываются.
+    """
+    try:
+        source, fingerprint = read()
+        analyser.analyze_source(source)
+    except OSError as e:
+        analyser.clear_results()
+        return [], None, Diagnostic("read", str(e), None, False), None
+    except UnicodeError as e:
+        analyser.clear_results()
+        return [], None, Diagnostic("decode", str(e), None, False), None
+
+    result = (
+        analyser.get_results(),
+        analyser.get_symbols(),
+        analyser.get_diagnostic(),
+        fingerprint,
+    )
+    analyser.clear_results()
+    return result
+
+
+def _analyze_in_worker(
+    root_folder: Path,
+    options: AnalyzerOptions,
+    file_paths: List[Path],
+    read_threads: int,
+    fingerprints: bool = False,
+) -> List[AnalysisResult]:
+    """
+    Считывает, парсит и извлекает импорты пачки модулей в процессе-воркере.
+    Файлы пачки читаются потоками заранее, пока разбираются предыдущие.
+
+    Args:
+        root_folder (Path): корень проекта.
+        options (AnalyzerOptions): настройки анализатора.
+        file_paths (List[Path]): относительные пути к Python-файлам.
+        read_threads (int): потоки чтения, 0 - читать по одному файлу.
+        fingerprints (bool): снимать отпечатки содержимого для кеша разбора.
+
+    Returns:
+        List[AnalysisResult]: импорты, таблица имён, диагностика и отпечаток
+                        каждого модуля.
+    """
+    global _worker_readers
+
+    # воркеры, форкнутые во время профилирования этапа, наследуют хук cProfile
+    sys.setprofile(None)
+
+    analyser = _worker_analysers.get((root_folder, options))
+    if analyser is None:
+        analyser = PythonImportsAnalyzer(root_folder, *options)
+        _worker_analysers[(root_folder, options)] = analyser
+
+    reader = _read_fingerprinted if fingerprints else _read_plain
+    sources: List[Future] = []
+    if read_threads:
+        if _worker_readers is None:
+            _worker_readers = ThreadPoolExecutor(read_threads)
+        sources = [
+            _worker_readers.submit(reader, root_folder / file_path)
+            for file_path in file_paths
+        ]
+
+    results = []
+    for i, file_path in enumerate(file_paths):
+        full_path = root_folder / file_path
+        read = sources[i].result if sources else partial(reader, full_path)
+        results.append(_extract_imports(analyser, read))
+    return results
+
+
+def _is_nested(key: ModuleKey, name: ModuleKey) -> bool:
+    """
+    Лежит ли одно из имён под другим (или они совпадают).
+    """
+    depth = min(len(key), len(name))
+    return key[:depth] == name[:depth]
+
 
 class PythonDepFinder:
 
@@ -17,121 +208,795 @@ class PythonDepFinder:
         dep_dict: Dict,
         modules: List,
         analyser: PythonImportsAnalyzer,
+        workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
+        module_index: Optional[ModuleIndex] = None,
+        file_finder: Optional[PythonFileFinder] = None,
+        executor: Optional[Executor] = None,
+        read_threads: int = READ_THREADS,
+        resolution: str = "module",
+        source_reader: Optional[Callable[[Path], bytes]] = None,
+        blob_ids: Optional[Dict[Path, str]] = None,
+        resolution_model: Optional[ResolutionModel] = None,
     ):
+        if workers < 1:
+            raise ValueError(f"workers must be a positive integer but given {workers}")
+
+        if resolution not in RESOLUTION_MODES:
+            raise ValueError(
+                f"resolution must be one of {RESOLUTION_MODES} but given '{resolution}'"
+            )
+
+        if resolution == "symbol" and not analyser.collects_symbols():
+            raise ValueError("symbol resolution needs an analyser that collects symbols")
+
+        if read_threads < 0:
+            raise ValueError(
+                f"read_threads must be a non-negative integer but given {read_threads}"
+            )
+
         self._dir_path = dir_path
         self._project_roots = project_roots
         self._dep_dict = dep_dict
         self._modules = modules
         self._analyser = analyser
+        self._workers = workers
+        self._parse_cache = parse_cache
+        self._file_finder = file_finder
+        # внешний пул процессов, переиспользуемый между проектами; не закрывается здесь
+        self._executor = executor
+        self._read_threads = read_threads
+        self._by_symbol = resolution == "symbol"
+        # чтение модулей не с диска (например, из git-ревизии): только в этом процессе
+        self._source_reader = source_reader
+        # модуль -> id git-блоба: кеш разбора ищется по блобу, а не по файлу
+        self._blob_ids = blob_ids
+        # None - прежняя модель корневых пакетов из _find_project_roots
+        self._resolution_model = resolution_model
+
+        # сырые импорты модулей, чтобы перерешать их без повторного разбора
+        self._module_imports: Dict[Path, List] = {}
+        # ключ модуля-кандидата или абсолютное имя импорта -> модули,
+        # которые проверяли его при разрешении импортов
+        self._probe_index: Dict[ModuleKey, Set[Path]] = {}
+        # первая часть ключа -> ключи _probe_index, чтобы в модели путей
+        # проверять на затенение только ключи с общим началом
+        self._probe_heads: Dict[str, Set[ModuleKey]] = {}
+
+        self._track_changes = True
+
+        # счётчики для статистики прогона
+        self._analyzed_modules = 0
+        self._found_imports = 0
+        self._resolved_dependencies = 0
+        # модули, которые не удалось прочитать или разобрать полностью
+        self._diagnostics: Dict[Path, Diagnostic] = {}
+
+        # режим "symbol": имена верхнего уровня модулей и импортированные
+        # по каждому ребру имена (импортирующий -> импортируемый -> имена)
+        self._symbols: Dict[Path, _NameIndex] = {}
+        self._edge_names: Dict[Path, Dict[Path, List[str]]] = {}
+
+        if module_index is None:
+            module_index = ModuleIndex(self._modules)
+        self._module_index = module_index
+        self._index_roots()
 
     def start_dep_finding(self) -> None:
 
-        for importing_module in self._modules:
-            logger.debug(f"starting analyzing imports in {str(importing_module)}")
-            self._analyze_module_deps(importing_module)
+        for importing_module, deps in self._iter_module_imports(self._modules):
+            self._module_imports[importing_module] = deps
+            if not self._by_symbol:
+                self._resolve_imports(deps, importing_module)
+
+        if self._by_symbol:
+            # имя прослеживается по таблицам имён, поэтому сначала разбираются все модули
+            for importing_module in self._modules:
+                self._resolve_imports(
+                    self._module_imports[importing_module], importing_module
+                )
+
+    def iter_dependencies(
+        self, modules: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[Path]]]:
+        """
+        Потоково анализирует модули и отдаёт их зависимости по мере готовности.
+
+        В отличие от start_dep_finding, ничего не накапливает: dep_dict,
+        сырые импорты и индекс проверенных кандидатов не заполняются,
+        поэтому после такого прохода update() недоступен. Для разрешения
+        импортов нужен только индекс модулей. В режиме "symbol" импорты
+        всех модулей сначала собираются, и только потом разрешаются.
+
+        Args:
+            modules (Iterable[Path]): модули для анализа (относительно self._dir_path).
+
+        Returns:
+            Iterator[Tuple[Path, List[Path]]]: модуль и его зависимости внутри проекта.
+        """
+        self._track_changes = False
+
+        imports: Iterable[Tuple[Path, List[ImportRecord]]] = self._iter_module_imports(
+            modules
+        )
+        if self._by_symbol:
+            imports = list(imports)
+
+        for importing_module, deps in imports:
+            yield importing_module, self._resolve_module(deps, importing_module)
+
+    def update(self, changed: Iterable[Path], removed: Iterable[Path]) -> Set[Path]:
+        """
+        Инкрементально обновляет dep_dict после изменения файлов проекта.
+
+        Заново разбираются только изменённые модули. Перерешиваются они же,
+        модули, чьё разрешение импортов могло поменяться из-за появления или
+        удаления файлов, и __init__.py соседних пакетов. Если поменялся набор
+        корневых пакетов (или, в модели путей, появился или исчез __init__.py),
+        перерешиваются все модули (без повторного разбора).
+
+        Args:
+            changed (Iterable[Path]): новые или изменённые файлы
+                            (относительно self._dir_path).
+            removed (Iterable[Path]): удалённые файлы (относительно self._dir_path).
+
+        Returns:
+            Set[Path]: модули, чьи зависимости в dep_dict были пересчитаны.
+        """
+        changed = [
+            path
+            for path in changed
+            if path.suffix == ".py" and not self._is_excluded(path)
+        ]
+        removed = list(removed)
+
+        added = [path for path in changed if path not in self._module_index]
+        removed_modules = [path for path in removed if path in self._module_index]
+
+        for module in removed_modules:
+            if self._file_finder is not None:
+                self._file_finder.remove_path(module)
+            self._modules.remove(module)
+            self._module_index.remove(module)
+            del self._dep_dict[module]
+            self._module_imports.pop(module, None)
+            self._diagnostics.pop(module, None)
+            self._symbols.pop(module, None)
+            self._edge_names.pop(module, None)
+
+        for module in added:
+            if self._file_finder is not None:
+                self._file_finder.add_path(module)
+            self._modules.append(module)
+            self._module_index.add(module)
+            self._dep_dict[module] = []
+
+        for module in changed:
+            logger.debug("reanalyzing imports in %s", module)
+            self._module_imports[module] = self._get_module_imports(module)
+            self._analyzed_modules += 1
+
+        affected = set(changed)
+        structural = added + removed
+        if added or removed_modules:
+            self._import_trie.invalidate()
+
+        if self._by_symbol:
+            # таблица имён изменённого модуля могла поменяться
+            for module in changed:
+                affected.update(self._probe_index.get(module_key(module), ()))
+
+        if self._resolution_model is not None:
+            if any(path.name == "__init__.py" for path in structural):
+                # __init__.py меняет затенение и пакеты пространства имён во всём поддереве
+                logger.info("packages changed, resolving all modules again")
+                affected = set(self._modules)
+
+        elif any(path.name == "__init__.py" for path in structural):
+            roots = self._scan_project_roots()
+            if roots != self._project_roots:
+                logger.info("project roots changed, resolving all modules again")
+                self._project_roots.clear()
+                self._project_roots.update(roots)
+                self._index_roots()
+                affected = set(self._modules)
+
+        names: Set[ModuleKey] = set()
+        for path in structural:
+            affected.update(self._probe_index.get(module_key(path), ()))
+            names.update(self._import_trie.import_names(path))
+
+            package_dir = path.parent.parent if path.name == "__init__.py" else path.parent
+            parent_init = package_dir / "__init__.py"
+            if parent_init in self._module_index:
+                affected.add(parent_init)
+
+        if self._resolution_model is None:
+            for name in names:
+                affected.update(self._probe_index.get(name, ()))
+        elif names:
+            # в модели путей модуль затеняет все имена под собой (a.py скрывает a/b.py),
+            # а новый c/d/z.py делает c.d пакетом пространства имён для
+            # уже разобранного "from c.d import z"
+            for head in {name[0] for name in names if name}:
+                for key in self._probe_heads.get(head, ()):
+                    if any(_is_nested(key, name) for name in names):
+                        affected.update(self._probe_index[key])
+
+        affected = {module for module in affected if module in self._module_index}
+
+        for module in affected:
+            self._resolve_imports(self._module_imports[module], module)
+
+        logger.info(
+            f"updated {len(affected)} modules after {len(changed)} changes "
+            f"and {len(removed_modules)} removals"
+        )
+        return affected
+
+    def _is_excluded(self, path: Path) -> bool:
+
+        if self._file_finder is None:
+            return False
+        return self._file_finder.is_excluded(path)
+
+    def _scan_project_roots(self) -> Set[Path]:
+
+        if self._file_finder is None:
+            return _find_project_roots(self._dir_path)
+
+        for _ in self._file_finder.iter_modules():
+            pass
+        return set(self._file_finder.get_project_roots())
+
+    def _iter_module_imports(
+        self, modules: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[ImportRecord]]]:
+        """
+        Отдаёт импорты модулей строго в порядке modules,
+        поэтому результат не зависит от числа воркеров.
+        """
+        for importing_module, deps in self._iter_analyzed(modules):
+            self._analyzed_modules += 1
+            yield importing_module, deps
+
+    def _iter_analyzed(
+        self, modules: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[ImportRecord]]]:
+
+        if (
+            self._workers == 1 and self._executor is None
+        ) or self._source_reader is not None:
+            yield from self._iter_serial(modules)
+            return
+
+        if self._executor is not None:
+            yield from self._iter_in_pool(self._executor, modules)
+            return
+
+        logger.info(f"analyzing modules with {self._workers} workers")
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            yield from self._iter_in_pool(executor, modules)
+
+    def _iter_serial(
+        self, modules: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[ImportRecord]]]:
+
+        if not self._read_threads:
+            for importing_module in modules:
+                logger.debug("starting analyzing imports in %s", importing_module)
+                yield importing_module, self._get_module_imports(importing_module)
+            return
+
+        # ограниченное окно: потоки читают до _READ_AHEAD файлов наперёд,
+        # пока текущий модуль разбирается; кеш проверяется до чтения
+        window: Deque[Tuple[Path, Optional[List], Optional[Future]]] = deque()
+
+        with ThreadPoolExecutor(self._read_threads) as readers:
+            for importing_module in modules:
+                deps = self._get_cached(importing_module)
+                source = (
+                    readers.submit(self._read_source, importing_module)
+                    if deps is None
+                    else None
+                )
+                window.append((importing_module, deps, source))
+
+                if len(window) > _READ_AHEAD:
+                    yield self._take_prefetched(*window.popleft())
+
+            while window:
+                yield self._take_prefetched(*window.popleft())
+
+    def _take_prefetched(
+        self, importing_module: Path, deps: Optional[List], source: Optional[Future]
+    ) -> Tuple[Path, List[ImportRecord]]:
+
+        if deps is None:
+            deps = self._analyze_module(importing_module, source)
+        return importing_module, deps
+
+    def _iter_in_pool(
+        self, executor: Executor, modules: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[ImportRecord]]]:
+
+        # ограниченное окно задач: память не растёт с размером проекта
+        in_flight: Deque = deque()
+        modules = iter(modules)
+        options = (
+            self._analyser.get_engine(),
+            self._analyser.is_resilient(),
+            self._analyser.collects_symbols(),
+        )
+
+        while True:
+            batch = list(islice(modules, _BATCH_SIZE))
+            if batch:
+                cached_deps = [self._get_cached(module) for module in batch]
+                missed = [
+                    module for module, deps in zip(batch, cached_deps) if deps is None
+                ]
+                future = (
+                    executor.submit(
+                        _analyze_in_worker,
+                        self._dir_path,
+                        options,
+                        missed,
+                        self._read_threads,
+                        self._needs_fingerprints(),
+                    )
+                    if missed
+                    else None
+                )
+                in_flight.append((batch, cached_deps, future))
+
+            if not in_flight:
+                break
+
+            if not batch or len(in_flight) >= self._workers * 2:
+                yield from self._merge_batch(*in_flight.popleft())
+
+    def _merge_batch(
+        self,
+        batch: List[Path],
+        cached_deps: List[Optional[List[ImportRecord]]],
+        future: Optional[Future],
+    ) -> Iterator[Tuple[Path, List[ImportRecord]]]:
+
+        results = iter(future.result() if future is not None else ())
+
+        for importing_module, deps in zip(batch, cached_deps):
+            if deps is None:
+                deps = self._store_result(importing_module, next(results))
+            yield importing_module, deps
+
+    def _get_module_imports(self, importing_module: Path) -> List:
+
+        deps = self._get_cached(importing_module)
+
+        if deps is None:
+            deps = self._analyze_module(importing_module)
+
+        return deps
+
+    def _needs_fingerprints(self) -> bool:
+        # отпечатки нужны только записям о файлах; блобы ищутся по id
+        return self._parse_cache is not None and self._blob_ids is None
 
-    def _analyze_module_deps(self, importing_module: Path) -> None:
+    def _read_source(self, importing_module: Path) -> SourceRead:
 
-        logger.debug(f"Starting analyzing {str(importing_module)}")
-        self._analyser.analyze(importing_module)
-        logger.debug(f"Succsessfuly ananlyzed {str(importing_module)}")
-        deps = self._analyser.get_results()
-        self._analyser.clear_results()
-        self._resolve_imports(deps, importing_module)
+        full_path = self._dir_path / importing_module
+        if self._source_reader is not None:
+            return self._source_reader(full_path), None
+        if self._needs_fingerprints():
+            return _read_fingerprinted(full_path)
+        return _read_plain(full_path)
+
+    def _get_cached(self, importing_module: Path) -> Optional[List]:
+
+        if self._parse_cache is None:
+            return None
+
+        if self._blob_ids is not None:
+            cached = self._parse_cache.get_blob(self._blob_ids[importing_module])
+        else:
+            cached = self._parse_cache.get(self._dir_path / importing_module)
+        if cached is None:
+            return None
+
+        deps, symbols = cached
+        if self._by_symbol:
+            if symbols is None:
+                # запись сделана без таблицы имён
+                return None
+            self._symbols[importing_module] = _NameIndex.from_symbols(symbols)
+
+        logger.debug("parse cache hit for %s", importing_module)
+        return deps
+
+    def _store_cached(
+        self,
+        importing_module: Path,
+        deps: List,
+        symbols: Optional[SymbolTable],
+        fingerprint: Optional[Fingerprint],
+    ) -> None:
+
+        if self._parse_cache is None:
+            return
+
+        if self._blob_ids is not None:
+            self._parse_cache.put_blob(self._blob_ids[importing_module], deps, symbols)
+        elif fingerprint is not None:
+            self._parse_cache.put(
+                self._dir_path / importing_module, fingerprint, deps, symbols
+            )
+
+    def _analyze_module(
+        self, importing_module: Path, source: Optional[Future] = None
+    ) -> List:
+        """
+        Разбирает модуль и кладёт результат в кеш.
+
+        Args:
+            importing_module (Path): модуль (относительно self._dir_path).
+            source (Optional[Future]): заранее запущенное чтение файла.
+        """
+        logger.debug("Starting analyzing %s", importing_module)
+
+        read = (
+            source.result
+            if source is not None
+            else partial(self._read_source, importing_module)
+        )
+        deps = self._store_result(
+            importing_module, _extract_imports(self._analyser, read)
+        )
+
+        logger.debug("Succsessfuly ananlyzed %s", importing_module)
+        return deps
+
+    def _store_result(self, importing_module: Path, result: AnalysisResult) -> List:
+        """
+        Запоминает результат разбора модуля. Модули с диагностикой в кеш
+        не попадают, чтобы проблема была видна и в следующих прогонах.
+        """
+        deps, symbols, diagnostic, fingerprint = result
+
+        if symbols is not None:
+            self._symbols[importing_module] = _NameIndex.from_symbols(symbols)
+        else:
+            self._symbols.pop(importing_module, None)
+
+        if diagnostic is None:
+            self._store_cached(importing_module, deps, symbols, fingerprint)
+            self._diagnostics.pop(importing_module, None)
+            return deps
+
+        if diagnostic.recovered:
+            logger.warning(
+                f"{str(importing_module)}: {diagnostic.message}, "
+                "imports were extracted by the fallback scanner"
+            )
+        else:
+            logger.warning(f"skipping {str(importing_module)}: {diagnostic.message}")
+
+        self._diagnostics[importing_module] = diagnostic
+        return deps
 
     def _resolve_imports(self, deps: List, importing_module: Path) -> None:
-        
+
+        self._dep_dict[importing_module] = self._resolve_module(deps, importing_module)
+
+    def _resolve_module(self, deps: List, importing_module: Path) -> List[Path]:
+
+        self._found_imports += len(deps)
+
+        if self._by_symbol:
+            names = self._resolve_symbols(deps, importing_module)
+            self._edge_names[importing_module] = names
+            self._resolved_dependencies += len(names)
+            return list(names)
+
+        resolved = []
 
         for module_import in deps:
-            self._resolve_import_path(module_import, importing_module)
+            resolved_path = self._resolve_import_path(module_import, importing_module)
+            if resolved_path is not None:
+                resolved.append(resolved_path)
 
-        if importing_module.name == '__init__.py':
-            self._dep_dict[importing_module].extend(_get_sibling_python_files(importing_module))
+        if importing_module.name == "__init__.py":
+            resolved.extend(self._get_siblings(importing_module))
 
-        self._dep_dict[importing_module] = unique_paths(
-            self._dep_dict[importing_module]
-        )
+        resolved = unique_paths(resolved, self._dir_path)
+        self._resolved_dependencies += len(resolved)
+        return resolved
+
+    def _resolve_symbols(
+        self, deps: List, importing_module: Path
+    ) -> Dict[Path, List[str]]:
+        """
+        Разрешает импорты модуля до модулей, где импортированные имена
+        определены. Соседние модули пакета к __init__.py не добавляются:
+        ребро появляется, только если пакет действительно их импортирует.
+
+        Returns:
+            Dict[Path, List[str]]: импортируемый модуль -> импортированные из него имена.
+        """
+        names: Dict[Path, List[str]] = {}
+
+        for module_import in deps:
+            target = self._resolve_symbol(
+                module_import, importing_module, importing_module, 0
+            )
+            if target is None or target == importing_module:
+                continue
+
+            target_names = names.setdefault(target, [])
+            if module_import.name not in target_names:
+                target_names.append(module_import.name)
+
+        logger.debug("Resolved symbols of %s: %s", importing_module, names)
+        return names
+
+    def _resolve_symbol(
+        self, module_import: ImportRecord, context: Path, importing_module: Path, depth: int
+    ) -> Optional[Path]:
+        """
+        Находит модуль, определяющий импортируемое имя.
+
+        "from x import name" ведёт в подмодуль x.name, если он есть, иначе
+        в модуль, где name определено: реэкспорты в x (чаще всего в
+        __init__.py) прослеживаются до источника. Если имя нигде не найдено,
+        ребро ведёт в сам x, как в режиме "module".
+
+        Args:
+            module_import (ImportRecord): импорт.
+            context (Path): модуль, в котором записан импорт (для относительных).
+            importing_module (Path): модуль, для которого идёт разрешение;
+                            на него записываются проверенные кандидаты.
+            depth (int): глубина цепочки реэкспортов.
+        """
+        module, name, _, level = module_import
+        parts = tuple(module.split(".")) if module else ()
+
+        if name == "*":
+            return self._lookup_module(parts, level, context, importing_module)
+
+        submodule = self._lookup_module(parts + (name,), level, context, importing_module)
+        if submodule is not None or (not parts and level == 0):
+            return submodule
+
+        source = self._lookup_module(parts, level, context, importing_module)
+        if source is None:
+            return None
+
+        return self._find_definition(source, name, importing_module, depth) or source
+
+    def _find_definition(
+        self, source: Path, name: str, importing_module: Path, depth: int
+    ) -> Optional[Path]:
+        """
+        Ищет модуль, где определено имя, видимое в source.
 
-    def _resolve_import_path(self, module_import: Dict, importing_module: Path) -> None:
+        Returns:
+            Optional[Path]: модуль-источник имени или None, если source
+                            имени не определяет и не реэкспортирует.
         """
-        Разрешает путь импортируемого модуля внутри проекта и добавляет его в dep_dict.
+        # изменение таблицы имён source должно перерешать importing_module
+        self._add_probe(importing_module, module_key(source))
+
+        symbols = self._symbols.get(source)
+        if symbols is None or depth >= _MAX_REEXPORT_DEPTH:
+            return None
+
+        if name in symbols.defined:
+            return source
+
+        reexport = symbols.exports.get(name)
+        if reexport is not None:
+            return (
+                self._resolve_symbol(reexport, source, importing_module, depth + 1)
+                or source
+            )
+
+        for reexport in symbols.star_imports:
+            star_source = self._resolve_symbol(
+                reexport, source, importing_module, depth + 1
+            )
+            if star_source is not None:
+                definition = self._find_definition(
+                    star_source, name, importing_module, depth + 1
+                )
+                if definition is not None:
+                    return definition
+
+        return None
+
+    def _lookup_module(
+        self, parts: ModuleKey, level: int, context: Path, importing_module: Path
+    ) -> Optional[Path]:
+        """
+        Находит модуль по частям абсолютного или относительного имени.
+        """
+        if level == 0:
+            self._add_probe(importing_module, parts)
+            return self._import_trie.lookup(parts)
+
+        base_parts = context.parts[:-1]
+        if level > 1:
+            base_parts = base_parts[: max(0, len(base_parts) - (level - 1))]
+
+        key = base_parts + parts
+        self._add_probe(importing_module, key)
+        return self._module_index.lookup(key)
+
+    def get_imported_names(
+        self, importing_module: Path, imported_module: Path
+    ) -> Optional[List[str]]:
+        """
+        Имена, импортированные по ребру (только в режиме "symbol").
+        """
+        return self._edge_names.get(importing_module, {}).get(imported_module)
+
+    def get_edge_names(self) -> Dict[Path, Dict[Path, List[str]]]:
+        return self._edge_names
+
+    def get_unresolved_imports(self) -> Dict[Path, List[ImportRecord]]:
+        """
+        Импорты, которые не разрешились внутри проекта: внешние зависимости
+        и модули соседних репозиториев. Нужны для слияния шардов.
+        Доступно после start_dep_finding().
+
+        Returns:
+            Dict[Path, List[ImportRecord]]: модуль -> его неразрешённые импорты.
+        """
+        unresolved: Dict[Path, List[ImportRecord]] = {}
+
+        # проверочный проход не должен попадать в индекс кандидатов
+        track_changes, self._track_changes = self._track_changes, False
+        try:
+            for importing_module in self._modules:
+                records = [
+                    module_import
+                    for module_import in self._module_imports.get(importing_module, ())
+                    if self._resolve_import_path(module_import, importing_module) is None
+                ]
+                if records:
+                    unresolved[importing_module] = records
+        finally:
+            self._track_changes = track_changes
+
+        return unresolved
+
+    def _get_siblings(self, init_module: Path) -> List[Path]:
+
+        if self._file_finder is None:
+            return _get_sibling_python_files(init_module, self._dir_path)
+        return self._file_finder.get_package_siblings(init_module)
+
+    def _resolve_import_path(
+        self, module_import: ImportRecord, importing_module: Path
+    ) -> Optional[Path]:
+        """
+        Разрешает путь импортируемого модуля внутри проекта.
         Внешние зависимости (stdlib, сторонние пакеты) игнорируются.
+
+        Абсолютные импорты разрешаются одним проходом по дереву имён
+        (ImportTrie), относительные - по ключу из частей пути в индексе
+        модулей, без построения Path на каждый импорт.
         """
-        level: int = module_import.get("level", 0)
-        module: Optional[str] = module_import.get("module")
-        name: str = module_import.get("name")
+        module, name, _, level = module_import
 
         resolved_path = None
 
         if level == 0:
-            for root in self._project_roots:
-                if module:
-                    parts = module.split(".")
-                    # если первый элемент модуля совпадает с именем рутового пакета, убираем его
-                    if parts[0] == root.name:
-                        parts = parts[1:]
-                    candidate = root / Path("/".join(parts))
-                else:
-                    candidate = root / Path(name.replace(".", "/"))
-
-                # Приводим к относительному пути относительно self._dir_path
-                candidate_py = candidate.with_suffix(".py")
-                candidate_init = candidate / "__init__.py"
-
-                try:
-                    candidate_py_rel = candidate_py.relative_to(self._dir_path)
-                except ValueError:
-                    candidate_py_rel = candidate_py
-
-                try:
-                    candidate_init_rel = candidate_init.relative_to(self._dir_path)
-                except ValueError:
-                    candidate_init_rel = candidate_init
-
-                if candidate_py_rel in self._modules:
-                    resolved_path = candidate_py_rel
-                    break
-                elif candidate_init_rel in self._modules:
-                    resolved_path = candidate_init_rel
-                    break
-
-        else:
-            base = importing_module.parent
-            for _ in range(level - 1):
-                base = base.parent
+            import_parts = tuple(module.split(".")) if module else (name,)
 
-            if module:
-                candidate = base / Path(module.replace(".", "/"))
-            else:
-                candidate = base / Path(name.replace(".", "/"))
+            self._add_probe(importing_module, import_parts)
+            resolved_path = self._import_trie.lookup(import_parts, bare=not module)
 
-            candidate_py = candidate.with_suffix(".py")
-            candidate_init = candidate / "__init__.py"
+            if (
+                resolved_path is None
+                and module
+                and self._import_trie.is_namespace(import_parts)
+            ):
+                # "from ns import mod": у пакета пространства имён нет своего модуля
+                import_parts += (name,)
+                self._add_probe(importing_module, import_parts)
+                resolved_path = self._import_trie.lookup(import_parts)
 
-            try:
-                candidate_py_rel = candidate_py.relative_to(self._dir_path)
-            except ValueError:
-                candidate_py_rel = candidate_py
+        else:
+            base_parts = importing_module.parts[:-1]
+            if level > 1:
+                base_parts = base_parts[: max(0, len(base_parts) - (level - 1))]
 
-            try:
-                candidate_init_rel = candidate_init.relative_to(self._dir_path)
-            except ValueError:
-                candidate_init_rel = candidate_init
+            key = base_parts + tuple((module or name).split("."))
 
-            if candidate_py_rel in self._modules:
-                resolved_path = candidate_py_rel
-            elif candidate_init_rel in self._modules:
-                resolved_path = candidate_init_rel
+            self._add_probe(importing_module, key)
+            resolved_path = self._module_index.lookup(key)
 
         if resolved_path:
-            self._dep_dict[importing_module].append(resolved_path)
             logger.debug(
-                f"Resolved import {module_import} in {importing_module} -> {resolved_path}"
+                "Resolved import %s in %s -> %s",
+                module_import,
+                importing_module,
+                resolved_path,
             )
         else:
             logger.debug(
-                f"Could not resolve import {module_import} in {importing_module}"
+                "Could not resolve import %s in %s", module_import, importing_module
             )
 
+        return resolved_path
+
+    def _add_probe(self, importing_module: Path, key: ModuleKey) -> None:
+
+        if not self._track_changes:
+            return
+
+        importers = self._probe_index.get(key)
+        if importers is None:
+            self._probe_index[key] = {importing_module}
+            if key:
+                self._probe_heads.setdefault(key[0], set()).add(key)
+        else:
+            importers.add(importing_module)
+
+    def _index_roots(self) -> None:
+
+        model = self._resolution_model
+        if model is not None:
+            self._import_trie = ImportTrie.for_model(
+                self._module_index,
+                [root.parts for root in model.source_roots],
+                [
+                    (tuple(name.split(".")), path.parts)
+                    for name, path in model.packages
+                ],
+                model.namespace_packages,
+            )
+            return
+
+        root_keys: List[Tuple[ModuleKey, str]] = []
+        for root in self._project_roots:
+            try:
+                root_parts = root.relative_to(self._dir_path).parts
+            except ValueError:
+                logger.debug(f"project root {str(root)} is outside of {self._dir_path}")
+                continue
+            root_keys.append((root_parts, root.name))
+
+        self._import_trie = ImportTrie.for_roots(self._module_index, root_keys)
+
+    def get_diagnostics(self) -> Dict[Path, Diagnostic]:
+        """
+        Returns:
+            Dict[Path, Diagnostic]: модули, которые не удалось прочитать
+                            или разобрать полностью, и что с ними случилось.
+        """
+        return dict(self._diagnostics)
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: число проанализированных модулей, найденных импортов,
+                            разрешённых зависимостей (при перерешивании
+                            в update() импорты считаются повторно), пропущенных
+                            модулей и модулей, разобранных запасным сканером.
+        """
+        return {
+            "files": self._analyzed_modules,
+            "imports": self._found_imports,
+            "dependencies": self._resolved_dependencies,
+            "errors": sum(
+                not diagnostic.recovered for diagnostic in self._diagnostics.values()
+            ),
+            "recovered": sum(
+                diagnostic.recovered for diagnostic in self._diagnostics.values()
+            ),
+        }
+
     def get_dep_dict(self) -> Dict:
         return self._dep_dict
@@ -0,0 +1,106 @@
+import logging
+import tomllib
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+__all__ = ["ResolutionModel", "read_pyproject_layout"]
+logger = logging.getLogger(__name__)
+
+
+class ResolutionModel(NamedTuple):
+    """
+    Модель разрешения абсолютных импортов в духе sys.path.
+
+    source_roots - каталоги проекта, от которых отсчитываются имена
+    ("." - сам проект, "src" для src-раскладки), в порядке просмотра;
+    packages - явно объявленные пакеты: полное имя -> каталог
+    (например, из pyproject.toml); namespace_packages - считать ли
+    каталоги без __init__.py пакетами пространства имён (PEP 420).
+    """
+
+    source_roots: Tuple[Path, ...] = (Path("."),)
+    packages: Tuple[Tuple[str, Path], ...] = ()
+    namespace_packages: bool = False
+
+
+def _table(data: Dict[str, Any], *keys: str) -> Dict[str, Any]:
+
+    for key in keys:
+        value = data.get(key)
+        if not isinstance(value, dict):
+            return {}
+        data = value
+    return data
+
+
+def _add_package(packages: List[Tuple[str, Path]], name: str, path: Path) -> None:
+
+    if name and all(part.isidentifier() for part in name.split(".")):
+        packages.append((name, path))
+    else:
+        logger.debug(f"skipping package {name} declared in pyproject.toml")
+
+
+def read_pyproject_layout(
+    project_path: Path,
+) -> Tuple[List[Path], List[Tuple[str, Path]]]:
+    """
+    Читает раскладку пакетов из pyproject.toml проекта: poetry
+    (packages с include/from), setuptools (package-dir, packages,
+    packages.find.where) и hatch (packages колеса).
+
+    Args:
+        project_path (Path): корень проекта.
+
+    Returns:
+        Tuple[List[Path], List[Tuple[str, Path]]]: корни исходников и
+                        пакеты (имя -> каталог) относительно корня проекта.
+    """
+    pyproject = project_path / "pyproject.toml"
+    if not pyproject.is_file():
+        return [], []
+
+    try:
+        with pyproject.open("rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        logger.warning(f"could not read {str(pyproject)}: {e}")
+        return [], []
+
+    source_roots: List[Path] = []
+    packages: List[Tuple[str, Path]] = []
+
+    for entry in _table(data, "tool", "poetry").get("packages", []):
+        if isinstance(entry, dict) and isinstance(entry.get("include"), str):
+            include = entry["include"]
+            source = Path(entry.get("from", "."))
+            if include.endswith(".py") or any(c in include for c in "*?["):
+                # модуль верхнего уровня или шаблон: достаточно корня исходников
+                source_roots.append(source)
+            else:
+                _add_package(packages, include.replace("/", "."), source / include)
+
+    setuptools = _table(data, "tool", "setuptools")
+    package_dir = setuptools.get("package-dir", {})
+    if isinstance(package_dir, dict):
+        for name, path in package_dir.items():
+            if not isinstance(path, str):
+                continue
+            if name == "":
+                source_roots.append(Path(path))
+            else:
+                _add_package(packages, name, Path(path))
+
+    where = _table(setuptools, "packages", "find").get("where", [])
+    if isinstance(where, list):
+        source_roots.extend(Path(path) for path in where if isinstance(path, str))
+
+    wheel = _table(data, "tool", "hatch", "build", "targets", "wheel")
+    for path in wheel.get("packages", []):
+        if isinstance(path, str):
+            _add_package(packages, Path(path).name, Path(path))
+
+    logger.debug(
+        f"pyproject.toml declares source roots {source_roots} and packages {packages}"
+    )
+    return source_roots, packages
@@ -0,0 +1,141 @@
+import logging
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+__all__ = ["GitIgnore"]
+logger = logging.getLogger(__name__)
+
+# (regex, negate, dir_only)
+_Rule = Tuple[Pattern, bool, bool]
+
+
+def _translate(pattern: str) -> str:
+    """
+    Переводит glob из .gitignore в регулярное выражение по частям пути.
+    """
+    result = []
+    i, length = 0, len(pattern)
+
+    while i < length:
+        char = pattern[i]
+
+        if char == "*":
+            if pattern.startswith("**/", i):
+                result.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i) and i + 2 == length:
+                result.append(".*")
+                i += 2
+                continue
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end
+        elif char == "\\" and i + 1 < length:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+
+        i += 1
+
+    return "".join(result)
+
+
+def _compile(line: str) -> Optional[_Rule]:
+
+    line = line.rstrip("\n").rstrip("\r")
+    if not line.strip() or line.startswith("#"):
+        return None
+
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # разделитель в начале или середине привязывает шаблон к каталогу .gitignore
+    anchored = "/" in line
+    regex = _translate(line.lstrip("/"))
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    return re.compile(regex + r"\Z"), negate, dir_only
+
+
+class GitIgnore:
+    """
+    Правила одного .gitignore (или набора шаблонов исключения в том же синтаксисе).
+
+    Поддерживаются комментарии, отрицание "!", шаблоны только для каталогов "dir/",
+    привязка к каталогу через "/" и "**". Как и в git, побеждает последнее
+    совпавшее правило.
+    """
+
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        self._base = base
+        self._prefix = base + "/" if base else ""
+        self._rules: List[_Rule] = []
+
+        for pattern in patterns:
+            rule = _compile(pattern)
+            if rule is not None:
+                self._rules.append(rule)
+
+    @classmethod
+    def from_file(cls, file_path: Path, base: str = "") -> "GitIgnore":
+
+        try:
+            lines = file_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError as e:
+            logger.warning(f"could not read {str(file_path)}: {e}")
+            lines = []
+
+        return cls(lines, base)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Проверяет путь по правилам.
+
+        Args:
+            rel_path (str): posix-путь относительно корня проекта.
+            is_dir (bool): является ли путь каталогом.
+
+        Returns:
+            Optional[bool]: True - путь игнорируется, False - явно возвращён
+                            правилом "!", None - ни одно правило не совпало.
+        """
+        if self._prefix:
+            if not rel_path.startswith(self._prefix):
+                return None
+            rel_path = rel_path[len(self._prefix) :]
+
+        for regex, negate, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
@@ -0,0 +1,97 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .python_file_finder import PythonFileFinder
+
+__all__ = ["ListingFileFinder"]
+logger = logging.getLogger(__name__)
+
+
+class ListingFileFinder(PythonFileFinder):
+    """
+    Обход проекта по готовому списку файлов вместо файловой системы,
+    например по дереву git-ревизии.
+
+    Модули, корневые пакеты, соседи __init__.py и исключения - как у
+    PythonFileFinder. .gitignore не читается: в ревизии лежат только
+    отслеживаемые файлы.
+    """
+
+    def __init__(
+        self,
+        dir_path: Path,
+        exclude: Iterable[str] = (),
+        use_default_excludes: bool = True,
+    ):
+        super().__init__(
+            dir_path,
+            exclude=exclude,
+            use_gitignore=False,
+            use_default_excludes=use_default_excludes,
+        )
+        # каталог (posix-путь относительно dir_path) -> имя записи -> каталог ли
+        self._tree: Dict[str, Dict[str, bool]] = {"": {}}
+
+    def set_files(self, files: Iterable[str]) -> None:
+        """
+        Задаёт список файлов для следующего обхода.
+
+        Args:
+            files (Iterable[str]): posix-пути всех файлов относительно dir_path.
+        """
+        tree: Dict[str, Dict[str, bool]] = {"": {}}
+
+        for file in files:
+            *dirs, name = file.split("/")
+            rel = ""
+            for part in dirs:
+                child = f"{rel}/{part}" if rel else part
+                tree[rel][part] = True
+                tree.setdefault(child, {})
+                rel = child
+            tree[rel][name] = False
+
+        self._tree = tree
+
+    def iter_modules(self) -> Iterator[Path]:
+
+        self._project_roots = set()
+        self._gitignores = {}
+        self._package_listings = {}
+        self._package_dirs = set()
+
+        parent_is_package = (self._dir_path.parent / "__init__.py").exists()
+        yield from self._walk_listing("", parent_is_package)
+
+    def _list_directory(self, rel: str) -> List[Tuple[str, bool]]:
+        return list(self._tree.get(rel, {}).items())
+
+    def _walk_listing(self, rel: str, parent_is_package: bool) -> Iterator[Path]:
+
+        entries = self._tree.get(rel, {})
+
+        if rel and self._skip_venvs and "pyvenv.cfg" in entries:
+            logger.debug(f"skipping virtual environment {rel}")
+            return
+
+        is_package = "__init__.py" in entries
+        if is_package:
+            self._package_dirs.add(rel)
+            if not parent_is_package:
+                self._project_roots.add(self._dir_path / rel)
+            self._package_listings[rel] = list(entries.items())
+
+        subdirs = []
+
+        for name, is_dir in entries.items():
+            child_rel = f"{rel}/{name}" if rel else name
+
+            if is_dir:
+                if not self._is_ignored(child_rel, True, []):
+                    subdirs.append(child_rel)
+            elif name.endswith(".py") and not self._is_ignored(child_rel, False, []):
+                yield Path(child_rel)
+
+        for sub_rel in subdirs:
+            yield from self._walk_listing(sub_rel, is_package)
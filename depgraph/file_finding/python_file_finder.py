@@ -0,0 +1,274 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .gitignore import GitIgnore
+
+__all__ = ["PythonFileFinder", "DEFAULT_EXCLUDES"]
+logger = logging.getLogger(__name__)
+
+# каталоги, в которые обход не спускается без явного отказа от умолчаний;
+# build/dist привязаны к корню, чтобы не отсекать пакеты с такими именами
+DEFAULT_EXCLUDES = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".tox/",
+    ".nox/",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    "/build/",
+    "/dist/",
+    "site-packages/",
+    "__pycache__/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    "*.egg-info/",
+)
+
+
+class PythonFileFinder:
+    """
+    Однопроходный обход проекта через os.scandir.
+
+    За один обход находит Python-модули и корневые пакеты (каталог с __init__.py,
+    родитель которого пакетом не является). Каталоги виртуальных окружений
+    (с pyvenv.cfg), шаблоны исключения и правила .gitignore отсекаются целиком,
+    в них обход не спускается. Символические ссылки на каталоги не обходятся.
+    """
+
+    def __init__(
+        self,
+        dir_path: Path,
+        exclude: Iterable[str] = (),
+        use_gitignore: bool = True,
+        use_default_excludes: bool = True,
+    ):
+        self._dir_path = dir_path
+        self._use_gitignore = use_gitignore
+        self._skip_venvs = use_default_excludes
+
+        patterns = list(DEFAULT_EXCLUDES) if use_default_excludes else []
+        patterns.extend(exclude)
+        self._excludes = GitIgnore(patterns)
+
+        self._project_roots: Set[Path] = set()
+        self._gitignores: Dict[str, GitIgnore] = {}
+        # содержимое каталогов-пакетов (имя, каталог ли), снятое при обходе
+        self._package_listings: Dict[str, List[Tuple[str, bool]]] = {}
+        self._package_dirs: Set[str] = set()
+
+    def find_all(self) -> List[Path]:
+
+        modules = list(self.iter_modules())
+        logger.info(f"founded {len(modules)} modules in {str(self._dir_path)}")
+        return modules
+
+    def iter_modules(self) -> Iterator[Path]:
+        """
+        Лениво отдаёт пути Python-модулей относительно dir_path.
+        Корневые пакеты доступны через get_project_roots() после окончания обхода.
+        """
+        if not self._dir_path.exists():
+            raise FileExistsError(f"specified path {str(self._dir_path)} does not exist")
+
+        if not self._dir_path.is_dir():
+            raise FileExistsError(
+                f"specified path {str(self._dir_path)} is not a directory"
+            )
+
+        logger.debug(f"start searching python modules in {str(self._dir_path)}")
+
+        self._project_roots = set()
+        self._gitignores = {}
+        self._package_listings = {}
+        self._package_dirs = set()
+
+        parent_is_package = (self._dir_path.parent / "__init__.py").exists()
+        yield from self._walk(str(self._dir_path), "", parent_is_package, [])
+
+    def get_project_roots(self) -> Set[Path]:
+        return self._project_roots
+
+    def get_package_siblings(self, init_module: Path) -> List[Path]:
+        """
+        Соседи __init__.py по данным обхода, без обращений к файловой системе:
+        файлы каталога пакета и __init__.py его подпакетов.
+
+        Args:
+            init_module (Path): путь к __init__.py относительно dir_path.
+
+        Returns:
+            List[Path]: пути соседей относительно dir_path.
+        """
+        package = self._posix(init_module.parent)
+        listing = self._package_listings.get(package)
+
+        if listing is None:
+            # пакет появился после обхода
+            listing = self._list_directory(package)
+            self._package_listings[package] = listing
+
+        siblings = []
+        for name, is_dir in listing:
+            child = f"{package}/{name}" if package else name
+            if is_dir:
+                if child in self._package_dirs:
+                    siblings.append(Path(child, "__init__.py"))
+            elif name != "__init__.py":
+                siblings.append(Path(child))
+
+        return siblings
+
+    def add_path(self, path: Path) -> None:
+        """
+        Учитывает в снятых при обходе листингах файл, появившийся после обхода.
+        """
+        parent = self._posix(path.parent)
+
+        if path.name == "__init__.py":
+            self._package_dirs.add(parent)
+            if parent:
+                grandparent = self._package_listings.get(
+                    self._posix(path.parent.parent)
+                )
+                if grandparent is not None and (path.parent.name, True) not in grandparent:
+                    grandparent.append((path.parent.name, True))
+
+        listing = self._package_listings.get(parent)
+        if listing is not None and (path.name, False) not in listing:
+            listing.append((path.name, False))
+
+    def remove_path(self, path: Path) -> None:
+        """
+        Убирает из снятых при обходе листингов удалённый файл.
+        """
+        parent = self._posix(path.parent)
+
+        if path.name == "__init__.py":
+            self._package_dirs.discard(parent)
+            self._package_listings.pop(parent, None)
+            return
+
+        listing = self._package_listings.get(parent)
+        if listing is not None and (path.name, False) in listing:
+            listing.remove((path.name, False))
+
+    @staticmethod
+    def _posix(path: Path) -> str:
+        rel = path.as_posix()
+        return "" if rel == "." else rel
+
+    def _list_directory(self, rel: str) -> List[Tuple[str, bool]]:
+
+        try:
+            with os.scandir(self._dir_path / rel) as it:
+                return [(entry.name, entry.is_dir()) for entry in it]
+        except OSError as e:
+            logger.warning(f"could not list directory {rel}: {e}")
+            return []
+
+    def is_excluded(self, path: Path, is_dir: bool = False) -> bool:
+        """
+        Проверяет, отсёк бы обход путь (относительно dir_path) или один из его каталогов.
+        Используются .gitignore, прочитанные последним обходом.
+        """
+        parts = path.parts
+
+        for i in range(1, len(parts) + 1):
+            rel = "/".join(parts[:i])
+            rules = [
+                self._gitignores[base]
+                for base in self._rule_bases(parts[: i - 1])
+                if base in self._gitignores
+            ]
+            if self._is_ignored(rel, i < len(parts) or is_dir, rules):
+                return True
+
+        return False
+
+    @staticmethod
+    def _rule_bases(dir_parts: Iterable[str]) -> Iterator[str]:
+        yield ""
+        current = ""
+        for part in dir_parts:
+            current = f"{current}/{part}" if current else part
+            yield current
+
+    def _is_ignored(self, rel: str, is_dir: bool, rules: List[GitIgnore]) -> bool:
+
+        if self._excludes.match(rel, is_dir):
+            return True
+
+        # более глубокий .gitignore переопределяет более общий
+        for rule in reversed(rules):
+            verdict = rule.match(rel, is_dir)
+            if verdict is not None:
+                return verdict
+
+        return False
+
+    def _walk(
+        self,
+        dir_path: str,
+        rel: str,
+        parent_is_package: bool,
+        rules: List[GitIgnore],
+    ) -> Iterator[Path]:
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"could not list directory {dir_path}: {e}")
+            return
+
+        names = {entry.name for entry in entries}
+
+        if rel and self._skip_venvs and "pyvenv.cfg" in names:
+            logger.debug(f"skipping virtual environment {dir_path}")
+            return
+
+        if self._use_gitignore and ".gitignore" in names:
+            gitignore = GitIgnore.from_file(Path(dir_path, ".gitignore"), rel)
+            if gitignore:
+                self._gitignores[rel] = gitignore
+                rules = rules + [gitignore]
+
+        is_package = "__init__.py" in names
+        if is_package:
+            self._package_dirs.add(rel)
+            if not parent_is_package:
+                self._project_roots.add(Path(dir_path))
+
+        subdirs = []
+        listing = []
+
+        for entry in entries:
+            name = entry.name
+            child_rel = f"{rel}/{name}" if rel else name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            listing.append((name, is_dir))
+
+            if is_dir:
+                if not self._is_ignored(child_rel, True, rules):
+                    subdirs.append((entry.path, child_rel))
+            elif name.endswith(".py") and not self._is_ignored(child_rel, False, rules):
+                module = Path(child_rel)
+                logger.debug("Found Python module in %s", module)
+                yield module
+
+        if is_package:
+            self._package_listings[rel] = listing
+
+        for sub_path, sub_rel in subdirs:
+            yield from self._walk(sub_path, sub_rel, is_package, rules)
+
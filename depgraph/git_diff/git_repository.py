@@ -0,0 +1,142 @@
+import logging
+import subprocess
+import threading
+from pathlib import Path
+from typing import IO, Dict, List, Optional
+
+__all__ = ["GitRepository", "GitBlobReader"]
+logger = logging.getLogger(__name__)
+
+# обычные и исполняемые файлы; символические ссылки и подмодули не читаются
+_FILE_MODES = ("100644", "100755")
+
+
+class GitRepository:
+    """
+    Чтение ревизий локального git-репозитория без checkout.
+
+    Команды запускаются в каталоге path, поэтому списки файлов
+    ограничены этим каталогом, а пути в них - относительно него.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+
+    def _run(self, args: List[str]) -> bytes:
+
+        try:
+            completed = subprocess.run(
+                ["git", *args],
+                cwd=self._path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        except FileNotFoundError:
+            raise OSError("git executable is not found") from None
+
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip()
+            raise ValueError(f"git {args[0]} failed: {message}")
+        return completed.stdout
+
+    def resolve(self, revision: str) -> str:
+        """
+        Returns:
+            str: id коммита, на который указывает revision (ветка, тег, HEAD~1, ...).
+        Raises:
+            ValueError: каталог не в git-репозитории или ревизии нет.
+        """
+        try:
+            self._run(["rev-parse", "--git-dir"])
+        except ValueError:
+            raise ValueError(f"{self._path} is not inside a git repository") from None
+
+        try:
+            output = self._run(["rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"])
+        except ValueError:
+            raise ValueError(f"revision '{revision}' is not found") from None
+        return output.decode("ascii").strip()
+
+    def list_files(self, commit: str) -> Dict[str, str]:
+        """
+        Файлы ревизии под каталогом репозитория.
+
+        Returns:
+            Dict[str, str]: posix-путь относительно каталога -> id блоба.
+        """
+        output = self._run(["ls-tree", "-r", "-z", commit])
+
+        files = {}
+        for line in output.split(b"\0"):
+            if not line:
+                continue
+            meta, _, path = line.partition(b"\t")
+            mode, kind, blob_id = meta.decode("ascii").split()
+            if kind == "blob" and mode in _FILE_MODES:
+                files[path.decode("utf-8", "surrogateescape")] = blob_id
+
+        logger.debug(f"listed {len(files)} files in {commit}")
+        return files
+
+    def open_blobs(self) -> "GitBlobReader":
+        return GitBlobReader(self._path)
+
+
+class GitBlobReader:
+    """
+    Читает содержимое блобов через один долгоживущий `git cat-file --batch`.
+
+    Запросы сериализуются блокировкой, поэтому читать можно из нескольких потоков.
+    Используется как контекстный менеджер.
+    """
+
+    def __init__(self, path: Path):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+
+    def read(self, blob_id: str) -> bytes:
+        """
+        Raises:
+            OSError: блоба нет в репозитории или git завершился.
+        """
+        stdin: Optional[IO[bytes]] = self._process.stdin
+        stdout: Optional[IO[bytes]] = self._process.stdout
+        assert stdin is not None and stdout is not None
+
+        with self._lock:
+            try:
+                stdin.write(blob_id.encode("ascii") + b"\n")
+                stdin.flush()
+            except BrokenPipeError:
+                raise OSError("git cat-file exited unexpectedly") from None
+
+            header = stdout.readline().split()
+            if len(header) != 3:
+                raise OSError(f"blob {blob_id} is missing from the repository")
+
+            size = int(header[2])
+            data = stdout.read(size)
+            # за содержимым следует перевод строки
+            stdout.read(1)
+
+        return data
+
+    def close(self) -> None:
+
+        if self._process.stdin is not None:
+            self._process.stdin.close()
+        self._process.wait()
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,185 @@
+import logging
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from ..analyzing.python_analyzer import PythonImportsAnalyzer
+from ..caching.parse_cache import ParseCache
+from ..dep_finding.python_dep_finder import PythonDepFinder
+from ..dep_finding.resolution_model import ResolutionModel
+from ..file_finding.listing_file_finder import ListingFileFinder
+from ..graph_analytics.graph_analytics import GraphAnalytics
+from ..graph_building.compact_graph import CompactGraph
+from ..utils import _to_dep_dict
+from .git_repository import GitRepository
+
+__all__ = ["GraphDelta", "RevisionDiff"]
+logger = logging.getLogger(__name__)
+
+Edge = Tuple[Path, Path]
+
+
+class GraphDelta(NamedTuple):
+    """
+    Изменение графа зависимостей между двумя ревизиями.
+    """
+
+    base: str
+    head: str
+    added_modules: List[Path]
+    removed_modules: List[Path]
+    added_edges: List[Edge]
+    removed_edges: List[Edge]
+    # циклы импортов head, которых в base не было (в том числе разросшиеся)
+    new_cycles: List[List[Path]]
+    # модули, разобранные заново: новые или с другим блобом
+    changed_modules: List[Path]
+
+    def to_dict(self) -> Dict:
+
+        return {
+            "base": self.base,
+            "head": self.head,
+            "added_modules": [module.as_posix() for module in self.added_modules],
+            "removed_modules": [module.as_posix() for module in self.removed_modules],
+            "added_edges": [[u.as_posix(), v.as_posix()] for u, v in self.added_edges],
+            "removed_edges": [
+                [u.as_posix(), v.as_posix()] for u, v in self.removed_edges
+            ],
+            "new_cycles": [
+                [module.as_posix() for module in cycle] for cycle in self.new_cycles
+            ],
+            "changed_modules": [module.as_posix() for module in self.changed_modules],
+        }
+
+
+def _edges(dep_dict: Dict[Path, List[Path]]) -> Set[Edge]:
+    return {
+        (module, imported_module)
+        for module, imported_modules in dep_dict.items()
+        for imported_module in imported_modules
+    }
+
+
+def _cycles(dep_dict: Dict[Path, List[Path]]) -> List[List[Path]]:
+    return GraphAnalytics(CompactGraph.from_dep_dict(dep_dict)).cycles()
+
+
+class RevisionDiff:
+    """
+    Сравнивает графы зависимостей двух ревизий git-репозитория без checkout.
+
+    Файлы читаются из репозитория по id блобов. Base анализируется целиком
+    (при кеше разбора с прошлых прогонов почти без разбора), head - как
+    инкрементальное обновление base: заново разбираются только модули
+    с другим блобом, перерешиваются только затронутые ими модули.
+    Кеш разбора ведётся по id блоба, так что одинаковое содержимое
+    не разбирается дважды ни в одном прогоне, ни между прогонами.
+    """
+
+    def __init__(
+        self,
+        project_path: Path,
+        analyser: PythonImportsAnalyzer,
+        parse_cache: ParseCache,
+        file_finder: ListingFileFinder,
+        resolution: str = "module",
+        resolution_model: Optional[ResolutionModel] = None,
+    ):
+        self._project_path = project_path
+        self._analyser = analyser
+        self._parse_cache = parse_cache
+        self._file_finder = file_finder
+        self._resolution = resolution
+        self._resolution_model = resolution_model
+        self._repository = GitRepository(project_path)
+
+    def run(self, base: str, head: str) -> GraphDelta:
+        """
+        Args:
+            base (str): исходная ревизия (ветка, тег, коммит).
+            head (str): новая ревизия.
+
+        Returns:
+            GraphDelta: изменения модулей, рёбер и циклов.
+        """
+        start = time.perf_counter()
+
+        base_commit = self._repository.resolve(base)
+        head_commit = self._repository.resolve(head)
+        base_files = self._repository.list_files(base_commit)
+        head_files = self._repository.list_files(head_commit)
+
+        self._file_finder.set_files(base_files)
+        modules = self._file_finder.find_all()
+        dep_dict = _to_dep_dict(modules)
+        # общий для обеих ревизий: перед обновлением до head дополняется её блобами
+        blob_ids = {module: base_files[module.as_posix()] for module in modules}
+
+        with self._repository.open_blobs() as blobs:
+
+            def read_blob(full_path: Path) -> bytes:
+                return blobs.read(blob_ids[full_path.relative_to(self._project_path)])
+
+            dep_finder = PythonDepFinder(
+                dir_path=self._project_path,
+                project_roots=set(self._file_finder.get_project_roots()),
+                dep_dict=dep_dict,
+                modules=modules,
+                analyser=self._analyser,
+                parse_cache=self._parse_cache,
+                file_finder=self._file_finder,
+                read_threads=0,
+                resolution=self._resolution,
+                resolution_model=self._resolution_model,
+                source_reader=read_blob,
+                blob_ids=blob_ids,
+            )
+            dep_finder.start_dep_finding()
+
+            base_deps = {module: list(deps) for module, deps in dep_dict.items()}
+
+            self._file_finder.set_files(head_files)
+            head_modules = self._file_finder.find_all()
+            head_set = set(head_modules)
+
+            changed = [
+                module
+                for module in head_modules
+                if blob_ids.get(module) != head_files[module.as_posix()]
+            ]
+            removed = [module for module in modules if module not in head_set]
+            blob_ids.update(
+                (module, head_files[module.as_posix()]) for module in changed
+            )
+
+            dep_finder.update(changed, removed)
+
+        base_edges = _edges(base_deps)
+        head_edges = _edges(dep_dict)
+        base_cycles: Set[FrozenSet[Path]] = {
+            frozenset(cycle) for cycle in _cycles(base_deps)
+        }
+
+        delta = GraphDelta(
+            base=base_commit,
+            head=head_commit,
+            added_modules=sorted(head_set - base_deps.keys()),
+            removed_modules=sorted(removed),
+            added_edges=sorted(head_edges - base_edges),
+            removed_edges=sorted(base_edges - head_edges),
+            new_cycles=[
+                cycle
+                for cycle in _cycles(dep_dict)
+                if frozenset(cycle) not in base_cycles
+            ],
+            changed_modules=sorted(changed),
+        )
+
+        logger.info(
+            f"compared {base_commit[:12]}..{head_commit[:12]} in "
+            f"{time.perf_counter() - start:.3f}s: {len(changed)} changed modules, "
+            f"+{len(delta.added_edges)}/-{len(delta.removed_edges)} edges, "
+            f"{len(delta.new_cycles)} new cycles"
+        )
+        return delta
@@ -0,0 +1,347 @@
+import logging
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+from ..graph_building.compact_graph import CompactGraph, _build_csr
+from ..graph_building.graph_snapshot import GraphSnapshot
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__all__ = ["GraphAnalytics"]
+logger = logging.getLogger(__name__)
+
+
+def _iter_bits(bitset: int) -> Iterator[int]:
+    # поиск единиц по строке идёт на C-скорости, в отличие от сдвигов в цикле
+    bits = bin(bitset)[:1:-1]
+    i = bits.find("1")
+    while i != -1:
+        yield i
+        i = bits.find("1", i + 1)
+
+
+def _tarjan(offsets: array, targets: array) -> Tuple[List[int], List[List[int]]]:
+    """
+    Итеративный алгоритм Тарьяна по CSR.
+
+    Компоненты выдаются в обратном топологическом порядке: если модуль из
+    компоненты A импортирует модуль из B != A, то id(B) < id(A).
+
+    Returns:
+        Tuple[List[int], List[List[int]]]: компонента каждой ноды и состав компонент.
+    """
+    node_count = len(offsets) - 1
+    index = [-1] * node_count
+    low = [0] * node_count
+    on_stack = bytearray(node_count)
+    component = [-1] * node_count
+    components: List[List[int]] = []
+    stack: List[int] = []
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+
+        while work:
+            node, edge = work[-1]
+
+            if edge < offsets[node + 1]:
+                work[-1] = (node, edge + 1)
+                target = targets[edge]
+
+                if index[target] == -1:
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append((target, offsets[target]))
+                elif on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+
+            if low[node] == index[node]:
+                component_id = len(components)
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = component_id
+                    members.append(member)
+                    if member == node:
+                        break
+                components.append(members)
+
+    return component, components
+
+
+class GraphAnalytics:
+    """
+    Аналитика графа зависимостей поверх CompactGraph или GraphSnapshot.
+
+    Компоненты сильной связности (циклы импортов) и граф конденсации
+    строятся один раз. Запросы транзитивного влияния отвечаются из индекса
+    достижимости: для каждой компоненты конденсации хранится битовое множество
+    компонент-предков (или потомков), посчитанное одним проходом
+    динамики в топологическом порядке при первом запросе. Память индекса
+    в худшем случае квадратична по числу компонент (C^2 / 8 байт).
+
+    Импорты пакета ведут в ноду каталога, а зависимости пакета выходят
+    из его __init__.py. Для анализа обе ноды - один модуль: каталог
+    сливается с __init__.py, иначе цепочки через пакет обрывались бы.
+    В результатах пакет представлен своим __init__.py.
+    """
+
+    def __init__(self, graph: Union[CompactGraph, GraphSnapshot, "nx.DiGraph"]):
+        if not isinstance(graph, (CompactGraph, GraphSnapshot)):
+            graph = CompactGraph.from_networkx(graph)
+
+        self._graph = graph
+        # нода каталога пакета -> нода его __init__.py, остальные ноды - сами в себя
+        self._merged_into = self._package_nodes()
+        offsets, targets = self._merged_csr()
+        self._component, self._components = self._condense(offsets, targets)
+
+        src = array("I")
+        dst = array("I")
+        for node, component_id in enumerate(self._component):
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                target_component = self._component[target]
+                if target_component != component_id:
+                    src.append(component_id)
+                    dst.append(target_component)
+
+        component_count = len(self._components)
+        self._dag = _build_csr(component_count, src, dst)
+        self._reverse_dag = _build_csr(component_count, dst, src)
+
+        self._ancestors: Optional[List[int]] = None
+        self._descendants: Optional[List[int]] = None
+        self._layers: Optional[List[int]] = None
+
+        logger.info(
+            f"Condensed {graph.number_of_nodes()} nodes into {component_count} components"
+        )
+
+    def _package_nodes(self) -> array:
+        """
+        Для каждой ноды - нода, с которой она слита: каталог пакета
+        сливается с нодой своего __init__.py, если она есть в графе.
+        """
+        node_count = self._graph.number_of_nodes()
+        merged_into = array("I", range(node_count))
+
+        for node in range(node_count):
+            name = self._graph.node_name(node)
+            if name != "__init__.py" and not name.endswith("/__init__.py"):
+                continue
+            # корень проекта, если он сам пакет, - нода "."
+            package = Path(name).parent.as_posix()
+            if package in self._graph:
+                merged_into[self._graph.node_id(package)] = node
+
+        return merged_into
+
+    def _merged_csr(self) -> Tuple[array, array]:
+        """
+        CSR графа, в котором рёбра каталогов пакетов перенесены на их __init__.py.
+        """
+        offsets, targets = self._graph.csr()
+        merged_into = self._merged_into
+
+        src = array("I")
+        dst = array("I")
+        for node in range(len(offsets) - 1):
+            source = merged_into[node]
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                src.append(source)
+                dst.append(merged_into[target])
+
+        return _build_csr(len(offsets) - 1, src, dst)
+
+    def _condense(
+        self, offsets: array, targets: array
+    ) -> Tuple[List[int], List[List[int]]]:
+        """
+        Компоненты сильной связности слитого графа. Слитые каталоги пакетов
+        получают компоненту своего __init__.py и не входят в состав компонент.
+        """
+        component, components = _tarjan(offsets, targets)
+        merged_into = self._merged_into
+
+        renumbered = [-1] * len(components)
+        kept: List[List[int]] = []
+        for component_id, members in enumerate(components):
+            if len(members) == 1 and merged_into[members[0]] != members[0]:
+                continue
+            renumbered[component_id] = len(kept)
+            kept.append(members)
+
+        merged_component = [
+            renumbered[component[merged_into[node]]] for node in range(len(component))
+        ]
+        return merged_component, kept
+
+    def strongly_connected_components(self) -> List[List[Path]]:
+        """
+        Компоненты сильной связности в обратном топологическом порядке
+        (зависимости раньше зависящих от них модулей).
+        """
+        return [self._to_paths(members) for members in self._components]
+
+    def cycles(self) -> List[List[Path]]:
+        """
+        Циклы импортов: компоненты из нескольких модулей и модули, импортирующие себя.
+        """
+        cycles = []
+        for members in self._components:
+            if len(members) > 1 or members[0] in self._graph.successor_ids(members[0]):
+                cycles.append(sorted(self._to_paths(members)))
+        return cycles
+
+    def layers(self) -> List[List[Path]]:
+        """
+        Топологические слои: в слое 0 модули без внутренних зависимостей,
+        в слое k - модули, чья самая длинная цепочка зависимостей имеет длину k.
+        Модули одного цикла попадают в один слой.
+        """
+        layer_of = self._component_layers()
+        layers: List[List[Path]] = [[] for _ in range(max(layer_of, default=-1) + 1)]
+
+        for node, component_id in enumerate(self._component):
+            layers[layer_of[component_id]].append(Path(self._graph.node_name(node)))
+
+        return [sorted(layer) for layer in layers]
+
+    def node_layers(self) -> List[int]:
+        """
+        Слой каждой ноды по её id в CompactGraph.
+        """
+        layer_of = self._component_layers()
+        return [layer_of[component_id] for component_id in self._component]
+
+    def fan_in(self, top: int = 10) -> List[Tuple[Path, int]]:
+        """
+        Модули, которые импортируют чаще всего.
+        """
+        offsets, _ = self._graph.reverse_csr()
+        return self._ranking(offsets, top)
+
+    def fan_out(self, top: int = 10) -> List[Tuple[Path, int]]:
+        """
+        Модули с наибольшим числом зависимостей.
+        """
+        offsets, _ = self._graph.csr()
+        return self._ranking(offsets, top)
+
+    def impacted_by(self, module: Union[Path, str]) -> List[Path]:
+        """
+        Модули, транзитивно зависящие от module, то есть затронутые его изменением.
+
+        Для __init__.py учитываются и импорты пакета, рёбра которых ведут
+        в ноду каталога.
+        """
+        if self._ancestors is None:
+            self._ancestors = self._reachability(self._reverse_dag, descending=True)
+        return self._closure(module, self._ancestors)
+
+    def dependencies_of(self, module: Union[Path, str]) -> List[Path]:
+        """
+        Модули, от которых module зависит транзитивно.
+        """
+        if self._descendants is None:
+            self._descendants = self._reachability(self._dag, descending=False)
+        return self._closure(module, self._descendants)
+
+    def _closure(self, module: Union[Path, str], index: List[int]) -> List[Path]:
+
+        query_ids = self._query_ids(Path(module))
+        if not query_ids:
+            raise KeyError(f"module {str(module)} is not in the graph")
+
+        reached = 0
+        for node in query_ids:
+            component_id = self._component[node]
+            reached |= index[component_id]
+            # остальные модули того же цикла тоже затронуты
+            if len(self._components[component_id]) > 1:
+                reached |= 1 << component_id
+
+        nodes = [
+            node
+            for component_id in _iter_bits(reached)
+            for node in self._components[component_id]
+            if node not in query_ids
+        ]
+        return sorted(self._to_paths(nodes))
+
+    def _reachability(self, dag: Tuple[array, array], descending: bool) -> List[int]:
+        """
+        Динамика по конденсации: reach[c] = OR(reach[n] | bit(n)) по соседям n.
+        Соседи в reverse_dag имеют больший id, в dag - меньший, поэтому
+        порядок обхода id гарантирует, что соседи уже посчитаны.
+        """
+        offsets, targets = dag
+        count = len(offsets) - 1
+        reach = [0] * count
+        order = range(count - 1, -1, -1) if descending else range(count)
+
+        for component_id in order:
+            bits = 0
+            for neighbour in targets[offsets[component_id] : offsets[component_id + 1]]:
+                bits |= reach[neighbour] | (1 << neighbour)
+            reach[component_id] = bits
+
+        logger.debug("Built reachability index for %s components", count)
+        return reach
+
+    def _component_layers(self) -> List[int]:
+
+        if self._layers is None:
+            offsets, targets = self._dag
+            layers = [0] * len(self._components)
+            # зависимости компоненты имеют меньший id и уже посчитаны
+            for component_id in range(len(self._components)):
+                start, end = offsets[component_id], offsets[component_id + 1]
+                if start != end:
+                    layers[component_id] = 1 + max(
+                        layers[target] for target in targets[start:end]
+                    )
+            self._layers = layers
+        return self._layers
+
+    def _query_ids(self, module: Path) -> List[int]:
+
+        ids = []
+        if module in self._graph:
+            ids.append(self._merged_into[self._graph.node_id(module)])
+        if module.name == "__init__.py" and module.parent in self._graph:
+            ids.append(self._merged_into[self._graph.node_id(module.parent)])
+        return ids
+
+    def _ranking(self, offsets: array, top: int) -> List[Tuple[Path, int]]:
+
+        degrees: Dict[int, int] = {
+            node: offsets[node + 1] - offsets[node] for node in range(len(offsets) - 1)
+        }
+        ranked = sorted(
+            degrees.items(), key=lambda item: (-item[1], self._graph.node_name(item[0]))
+        )
+        return [(Path(self._graph.node_name(node)), degree) for node, degree in ranked[:top]]
+
+    def _to_paths(self, nodes: List[int]) -> List[Path]:
+        return [Path(self._graph.node_name(node)) for node in nodes]
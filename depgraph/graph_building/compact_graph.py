@@ -0,0 +1,269 @@
+import logging
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__all__ = ["CompactGraph"]
+logger = logging.getLogger(__name__)
+
+
+def _node_label(name: str) -> str:
+    module = Path(name)
+    return str(module.parent if module.stem == "__init__" else module)
+
+
+def _build_csr(node_count: int, src: array, dst: array) -> Tuple[array, array]:
+    """
+    Строит CSR (offsets, targets) из списков рёбер сортировкой подсчётом;
+    повторяющиеся рёбра схлопываются, соседи внутри строки отсортированы.
+    """
+    counts = array("I", bytes(4 * (node_count + 1)))
+    for source in src:
+        counts[source + 1] += 1
+
+    for i in range(node_count):
+        counts[i + 1] += counts[i]
+
+    targets = array("I", bytes(4 * len(dst)))
+    fill = array("I", counts)
+    for source, target in zip(src, dst):
+        targets[fill[source]] = target
+        fill[source] += 1
+
+    offsets = array("I", [0])
+    unique = array("I")
+    for i in range(node_count):
+        row = sorted(set(targets[counts[i] : counts[i + 1]]))
+        unique.extend(row)
+        offsets.append(len(unique))
+
+    return offsets, unique
+
+
+class CompactGraph:
+    """
+    Компактный граф зависимостей.
+
+    Модули интернируются в целые id (таблица строк вместо Path-ключей),
+    смежность хранится в CSR-буферах array("I"), а label вычисляется
+    по требованию. Рёбра к __init__.py, как и в GraphCreator, ведут в ноду
+    каталога пакета. При необходимости экспортируется в nx.DiGraph.
+    """
+
+    def __init__(self) -> None:
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # 1 - нода модуля (ключ dep_dict), 0 - нода, появившаяся только как цель ребра
+        self._is_module = bytearray()
+
+        self._src = array("I")
+        self._dst = array("I")
+
+        self._offsets: Optional[array] = None
+        self._targets: Optional[array] = None
+        self._rev_offsets: Optional[array] = None
+        self._rev_targets: Optional[array] = None
+
+    @classmethod
+    def from_dep_dict(cls, dep_dict: Dict[Path, list[Path]]) -> "CompactGraph":
+
+        graph = cls()
+        for module in dep_dict.keys():
+            graph.add_module(module)
+        for importing_module, imported_modules in dep_dict.items():
+            for imported_module in imported_modules:
+                graph.add_dependency(importing_module, imported_module)
+        graph.freeze()
+        return graph
+
+    @classmethod
+    def from_networkx(cls, nx_graph: "nx.DiGraph") -> "CompactGraph":
+        """
+        Сжимает готовый nx.DiGraph; ноды с атрибутом label считаются модулями.
+        """
+        graph = cls()
+        for node, data in nx_graph.nodes(data=True):
+            node_id = graph.intern(node)
+            if "label" in data:
+                graph._is_module[node_id] = 1
+        for from_node, to_node in nx_graph.edges():
+            graph._src.append(graph.intern(from_node))
+            graph._dst.append(graph.intern(to_node))
+        graph.freeze()
+        return graph
+
+    def intern(self, node: Union[Path, str]) -> int:
+
+        name = node if isinstance(node, str) else node.as_posix()
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = len(self._names)
+            self._ids[name] = node_id
+            self._names.append(name)
+            self._is_module.append(0)
+        return node_id
+
+    def add_module(self, module: Path) -> None:
+        self._is_module[self.intern(module)] = 1
+
+    def add_dependency(self, importing_module: Path, imported_module: Path) -> None:
+
+        to_node = (
+            imported_module.parent
+            if imported_module.stem == "__init__"
+            else imported_module
+        )
+        self._thaw()
+        self._src.append(self.intern(importing_module))
+        self._dst.append(self.intern(to_node))
+
+    def freeze(self) -> None:
+        """
+        Переводит накопленные рёбра в CSR и освобождает списки рёбер.
+        """
+        if self._offsets is not None and not self._src:
+            return
+
+        self._offsets, self._targets = _build_csr(
+            len(self._names), self._src, self._dst
+        )
+        self._src = array("I")
+        self._dst = array("I")
+        self._rev_offsets = self._rev_targets = None
+        logger.debug(
+            "Compacted graph: %s nodes, %s edges", len(self._names), len(self._targets)
+        )
+
+    def _thaw(self) -> None:
+        # после freeze() рёбра живут только в CSR - возвращаем их в списки
+        if self._offsets is None:
+            return
+
+        assert self._targets is not None
+        for source in range(len(self._offsets) - 1):
+            for i in range(self._offsets[source], self._offsets[source + 1]):
+                self._src.append(source)
+                self._dst.append(self._targets[i])
+
+        self._offsets = self._targets = None
+        self._rev_offsets = self._rev_targets = None
+
+    def _csr(self) -> Tuple[array, array]:
+        if self._offsets is None or self._src:
+            self.freeze()
+        assert self._offsets is not None and self._targets is not None
+        return self._offsets, self._targets
+
+    def _reverse_csr(self) -> Tuple[array, array]:
+
+        if self._rev_offsets is None:
+            offsets, targets = self._csr()
+            src = array("I")
+            for source in range(len(self._names)):
+                src.extend([source] * (offsets[source + 1] - offsets[source]))
+            self._rev_offsets, self._rev_targets = _build_csr(
+                len(self._names), targets, src
+            )
+        assert self._rev_targets is not None
+        return self._rev_offsets, self._rev_targets
+
+    def csr(self) -> Tuple[array, array]:
+        """
+        Returns:
+            Tuple[array, array]: offsets и targets; соседи ноды i -
+                            targets[offsets[i]:offsets[i + 1]].
+        """
+        return self._csr()
+
+    def reverse_csr(self) -> Tuple[array, array]:
+        return self._reverse_csr()
+
+    def as_numpy(self) -> Tuple[Any, Any]:
+        """
+        Возвращает CSR-буферы как массивы NumPy без копирования.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("CompactGraph.as_numpy() requires numpy") from e
+
+        offsets, targets = self._csr()
+        return np.frombuffer(offsets, dtype=np.uint32), np.frombuffer(
+            targets, dtype=np.uint32
+        )
+
+    def node_id(self, node: Union[Path, str]) -> int:
+        name = node if isinstance(node, str) else node.as_posix()
+        return self._ids[name]
+
+    def node_name(self, node_id: int) -> str:
+        return self._names[node_id]
+
+    def label(self, node_id: int) -> str:
+        return _node_label(self._names[node_id])
+
+    def is_module(self, node_id: int) -> bool:
+        return bool(self._is_module[node_id])
+
+    def successor_ids(self, node_id: int) -> memoryview:
+        offsets, targets = self._csr()
+        return memoryview(targets)[offsets[node_id] : offsets[node_id + 1]]
+
+    def predecessor_ids(self, node_id: int) -> memoryview:
+        offsets, targets = self._reverse_csr()
+        return memoryview(targets)[offsets[node_id] : offsets[node_id + 1]]
+
+    def successors(self, node: Union[Path, str]) -> List[Path]:
+        return [Path(self._names[i]) for i in self.successor_ids(self.node_id(node))]
+
+    def predecessors(self, node: Union[Path, str]) -> List[Path]:
+        return [Path(self._names[i]) for i in self.predecessor_ids(self.node_id(node))]
+
+    def iter_nodes(self) -> Iterator[Path]:
+        for name in self._names:
+            yield Path(name)
+
+    def iter_edges(self) -> Iterator[Tuple[Path, Path]]:
+        offsets, targets = self._csr()
+        for source, name in enumerate(self._names):
+            for i in range(offsets[source], offsets[source + 1]):
+                yield Path(name), Path(self._names[targets[i]])
+
+    def number_of_nodes(self) -> int:
+        return len(self._names)
+
+    def number_of_edges(self) -> int:
+        return len(self._csr()[1])
+
+    def __contains__(self, node: object) -> bool:
+        if isinstance(node, Path):
+            node = node.as_posix()
+        return node in self._ids
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def to_networkx(self) -> "nx.DiGraph":
+        """
+        Экспортирует граф в nx.DiGraph в том же виде, что строит GraphCreator.
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        nodes = [Path(name) for name in self._names]
+
+        for node_id, node in enumerate(nodes):
+            if self._is_module[node_id]:
+                graph.add_node(node, label=self.label(node_id))
+            else:
+                graph.add_node(node)
+
+        offsets, targets = self._csr()
+        for source, node in enumerate(nodes):
+            for i in range(offsets[source], offsets[source + 1]):
+                graph.add_edge(node, nodes[targets[i]], label="import")
+
+        return graph
@@ -0,0 +1,135 @@
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Protocol, TextIO
+
+__all__ = ["EdgeSink", "EdgeListWriter", "JsonLinesWriter", "DotWriter"]
+logger = logging.getLogger(__name__)
+
+
+class EdgeSink(Protocol):
+    """
+    Приёмник потокового пайплайна: получает модули и рёбра по мере их разрешения.
+    names передаются только в режиме разрешения "symbol" - это имена,
+    импортированные по ребру.
+    """
+
+    def add_module(self, module: Path) -> None: ...
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None: ...
+
+
+class EdgeListWriter:
+    """
+    Пишет рёбра в текстовый поток строками "импортирующий<TAB>импортируемый",
+    ничего не храня в памяти. Если задан project, он пишется первой колонкой.
+    """
+
+    def __init__(self, stream: TextIO, project: Optional[str] = None):
+        self._stream = stream
+        self._prefix = "" if project is None else f"{project}\t"
+        self.modules = 0
+        self.edges = 0
+
+    def add_module(self, module: Path) -> None:
+        self.modules += 1
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        self._stream.write(
+            f"{self._prefix}{importing_module.as_posix()}\t{imported_module.as_posix()}\n"
+        )
+        self.edges += 1
+
+
+class JsonLinesWriter:
+    """
+    Пишет JSON Lines: запись {"type": "module", ...} на каждый модуль
+    и {"type": "edge", ...} на каждое ребро (с "names" в режиме "symbol").
+    """
+
+    def __init__(self, stream: TextIO, project: Optional[str] = None):
+        self._stream = stream
+        self._project = project
+        self.modules = 0
+        self.edges = 0
+
+    def add_module(self, module: Path) -> None:
+        self._write({"type": "module", "path": module.as_posix()})
+        self.modules += 1
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        record = {
+            "type": "edge",
+            "from": importing_module.as_posix(),
+            "to": imported_module.as_posix(),
+        }
+        if names is not None:
+            record["names"] = names
+        self._write(record)
+        self.edges += 1
+
+    def _write(self, record: dict) -> None:
+        if self._project is not None:
+            record["project"] = self._project
+        self._stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _dot_id(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class DotWriter:
+    """
+    Пишет граф в формате Graphviz DOT. Заголовок пишется при первом
+    обращении, закрывающая скобка - в close().
+    """
+
+    def __init__(self, stream: TextIO, name: str = "depgraph"):
+        self._stream = stream
+        self._name = name
+        self._started = False
+        self.modules = 0
+        self.edges = 0
+
+    def add_module(self, module: Path) -> None:
+        self._start()
+        self._stream.write(f"  {_dot_id(module.as_posix())};\n")
+        self.modules += 1
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        self._start()
+        label = "" if names is None else f" [label={_dot_id(', '.join(names))}]"
+        self._stream.write(
+            f"  {_dot_id(importing_module.as_posix())} -> "
+            f"{_dot_id(imported_module.as_posix())}{label};\n"
+        )
+        self.edges += 1
+
+    def close(self) -> None:
+        self._start()
+        self._stream.write("}\n")
+
+    def _start(self) -> None:
+        if not self._started:
+            self._stream.write(f"digraph {_dot_id(self._name)} {{\n")
+            self._started = True
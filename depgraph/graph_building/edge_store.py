@@ -0,0 +1,456 @@
+import json
+import logging
+import os
+import tempfile
+from array import array
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from .edge_sink import EdgeSink
+from .graph_snapshot import (
+    _BYTE_ORDER_MARK,
+    _HEADER,
+    _MAGIC,
+    _MAX_UINT32,
+    SNAPSHOT_FORMAT_VERSION,
+    _aligned,
+    _write_section,
+)
+
+__all__ = ["EdgeStore"]
+logger = logging.getLogger(__name__)
+
+# примерная цена ребра в памяти при сборке блока CSR (int в множестве строки)
+_BLOCK_EDGE_BYTES = 64
+_MIN_CHUNK_EDGES = 1024
+_NO_NODE = _MAX_UINT32
+
+
+class EdgeStore:
+    """
+    Приёмник рёбер, который держит рёбра на диске, а не в памяти.
+
+    В памяти остаётся только таблица имён нод, как у CompactGraph; рёбра
+    копятся в буфере на четверть бюджета и сбрасываются парами uint32
+    во временный файл в spill_dir. Имена на рёбрах (режим "symbol")
+    пишутся в отдельный файл строками JSON. Временные файлы удаляются
+    при close() или при завершении процесса.
+
+    Из хранилища граф собирается сразу в бинарный снимок (save_snapshot):
+    прямой и обратный CSR строятся блоками нод, рёбра каждого блока
+    укладываются в memory_budget. Рёбра и модули можно отдать в другой
+    приёмник через replay().
+    """
+
+    def __init__(self, memory_budget: int, spill_dir: Optional[Path] = None):
+        self._memory_budget = memory_budget
+        self._spill_dir = spill_dir
+        self._chunk_edges = max(_MIN_CHUNK_EDGES, memory_budget // 4 // 8)
+
+        self._names: List[str] = []
+        self._ids: Optional[Dict[str, int]] = {}
+        self._is_module = bytearray()
+        # нода, в которую ведёт ребро к модулю: каталог пакета для __init__.py
+        self._target_node = array("I")
+        # 1 - нода попадёт в граф: модуль, источник или цель ребра
+        self._in_graph = bytearray()
+        self._out_edges = array("I")
+
+        self._buffer = array("I")
+        self._edges_file: IO[bytes] = tempfile.TemporaryFile(
+            prefix="depgraph-edges-", dir=spill_dir
+        )
+        self._names_file: Optional[IO[bytes]] = None
+        # рёбра до первого ребра с именами хранятся без имён
+        self._names_from = 0
+        self._edge_count = 0
+
+    def _intern(self, name: str) -> int:
+
+        assert self._ids is not None, "edge store is finished"
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = len(self._names)
+            self._ids[name] = node_id
+            self._names.append(name)
+            self._is_module.append(0)
+            self._target_node.append(node_id)
+            self._in_graph.append(0)
+            self._out_edges.append(0)
+        return node_id
+
+    def add_module(self, module: Path) -> None:
+        self._is_module[self._intern(module.as_posix())] = 1
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        source = self._intern(importing_module.as_posix())
+        target = self._intern(imported_module.as_posix())
+
+        if imported_module.stem == "__init__":
+            self._target_node[target] = self._intern(imported_module.parent.as_posix())
+        self._in_graph[source] = 1
+        self._in_graph[self._target_node[target]] = 1
+        self._out_edges[source] += 1
+
+        if names is not None or self._names_file is not None:
+            if self._names_file is None:
+                self._names_file = tempfile.TemporaryFile(
+                    prefix="depgraph-names-", dir=self._spill_dir
+                )
+                self._names_from = self._edge_count
+            self._names_file.write(
+                json.dumps(names, ensure_ascii=False).encode("utf-8") + b"\n"
+            )
+
+        self._buffer.append(source)
+        self._buffer.append(target)
+        self._edge_count += 1
+        if len(self._buffer) >= 2 * self._chunk_edges:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._buffer.tofile(self._edges_file)
+        self._buffer = array("I")
+
+    def finish(self) -> None:
+        """
+        Завершает наполнение: сбрасывает буфер и освобождает словарь имён,
+        после этого add_module и add_dependency недоступны.
+        """
+        self._flush()
+        self._edges_file.flush()
+        if self._names_file is not None:
+            self._names_file.flush()
+        self._ids = None
+
+        logger.info(
+            f"Stored {self._edge_count} edges of {len(self._names)} nodes on disk"
+        )
+
+    def close(self) -> None:
+        self._edges_file.close()
+        if self._names_file is not None:
+            self._names_file.close()
+
+    def number_of_edges(self) -> int:
+        return self._edge_count
+
+    def _iter_chunks(self) -> Iterator[array]:
+        """
+        Читает файл рёбер кусками по chunk_edges пар (источник, цель).
+        """
+        self._edges_file.seek(0)
+        while True:
+            data = self._edges_file.read(8 * self._chunk_edges)
+            if not data:
+                return
+            chunk = array("I")
+            chunk.frombytes(data)
+            yield chunk
+
+    def _iter_edge_names(self) -> Iterator[Optional[List[str]]]:
+
+        for _ in range(min(self._names_from, self._edge_count)):
+            yield None
+
+        if self._names_file is None:
+            for _ in range(self._edge_count - self._names_from):
+                yield None
+            return
+
+        self._names_file.seek(0)
+        for line in self._names_file:
+            yield json.loads(line)
+
+    def replay(self, sink: EdgeSink) -> None:
+        """
+        Отдаёт сохранённые модули, затем рёбра (с именами, если они были) в sink.
+        """
+        for node_id, name in enumerate(self._names):
+            if self._is_module[node_id]:
+                sink.add_module(Path(name))
+
+        edge_names = self._iter_edge_names()
+        for chunk in self._iter_chunks():
+            for i in range(0, len(chunk), 2):
+                sink.add_dependency(
+                    Path(self._names[chunk[i]]),
+                    Path(self._names[chunk[i + 1]]),
+                    next(edge_names),
+                )
+
+    def _blocks(self, counts: array) -> Iterator[Tuple[int, int]]:
+        """
+        Делит ноды снимка на отрезки [start, stop), рёбра каждого из
+        которых (по counts) помещаются в бюджет памяти.
+        """
+        capacity = max(_MIN_CHUNK_EDGES, self._memory_budget // _BLOCK_EDGE_BYTES)
+        start = 0
+        size = 0
+        for node, count in enumerate(counts):
+            if size and size + count > capacity:
+                yield start, node
+                start, size = node, 0
+            size += count
+        if start < len(counts):
+            yield start, len(counts)
+
+    def save_snapshot(self, snapshot_file: Path) -> None:
+        """
+        Собирает граф в бинарный снимок того же формата, что save_snapshot():
+        ноды - модули и цели рёбер (рёбра к __init__.py ведут в каталог пакета),
+        повторяющиеся рёбра схлопываются.
+
+        Args:
+            snapshot_file (Path): путь к файлу снимка.
+        """
+        if self._ids is not None:
+            self.finish()
+
+        # нумерация нод снимка: модули и концы рёбер в порядке появления
+        node_of = array("I", bytes(4 * len(self._names)))
+        names: List[int] = []
+        for raw_id in range(len(self._names)):
+            if self._is_module[raw_id] or self._in_graph[raw_id]:
+                node_of[raw_id] = len(names)
+                names.append(raw_id)
+            else:
+                node_of[raw_id] = _NO_NODE
+        node_count = len(names)
+
+        encoded = [self._names[raw_id].encode("utf-8") for raw_id in names]
+        name_offsets = array("I", [0])
+        position = 0
+        for name in encoded:
+            position += len(name)
+            if position > _MAX_UINT32:
+                raise ValueError("names table is too large for snapshot format")
+            name_offsets.append(position)
+
+        is_module = bytearray(self._is_module[raw_id] for raw_id in names)
+        sorted_ids = array("I", sorted(range(node_count), key=encoded.__getitem__))
+        out_counts = array("I", (self._out_edges[raw_id] for raw_id in names))
+        del names
+
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_name(snapshot_file.name + ".tmp")
+
+        with tmp_file.open("w+b") as f:
+            # заголовок и смещения CSR переписываются, когда известно число рёбер
+            _write_section(f, _HEADER.pack(_MAGIC, 0, 0, 0, 0, 0))
+            _write_section(f, name_offsets)
+            _write_section(f, b"".join(encoded))
+            del encoded, name_offsets
+            _write_section(f, is_module)
+            del is_module
+            _write_section(f, sorted_ids)
+            del sorted_ids
+
+            offsets_start = f.tell()
+            _write_section(f, bytes(4 * (node_count + 1)))
+            targets_start = f.tell()
+
+            offsets, in_counts = self._write_forward(f, node_of, out_counts)
+            edge_count = offsets[-1]
+            padding = _aligned(f.tell()) - f.tell()
+            if padding:
+                f.write(bytes(padding))
+
+            rev_offsets = array("I", [0])
+            for count in in_counts:
+                rev_offsets.append(rev_offsets[-1] + count)
+            _write_section(f, rev_offsets)
+            rev_targets_start = f.tell()
+            f.truncate(rev_targets_start + 4 * edge_count)
+
+            self._write_reverse(
+                f, offsets, targets_start, rev_offsets, rev_targets_start, in_counts
+            )
+
+            f.seek(offsets_start)
+            f.write(offsets)
+            f.seek(0)
+            f.write(
+                _HEADER.pack(
+                    _MAGIC,
+                    SNAPSHOT_FORMAT_VERSION,
+                    _BYTE_ORDER_MARK,
+                    node_count,
+                    edge_count,
+                    position,
+                )
+            )
+
+        os.replace(tmp_file, snapshot_file)
+        logger.info(
+            f"Snapshot with {node_count} nodes and {edge_count} edges "
+            f"saved to {snapshot_file}"
+        )
+
+    def _write_forward(
+        self, f: IO[bytes], node_of: array, out_counts: array
+    ) -> Tuple[array, array]:
+        """
+        Пишет прямой CSR блоками источников. Файл рёбер читается один раз:
+        рёбра раскладываются по корзинам блоков, затем каждый блок
+        собирается из своей корзины; в памяти только строки нод блока.
+
+        Returns:
+            Tuple[array, array]: offsets прямого CSR и число входящих рёбер нод.
+        """
+        offsets = array("I", [0])
+        in_counts = array("I", bytes(4 * len(out_counts)))
+        blocks = list(self._blocks(out_counts))
+
+        with _Buckets(blocks, self._chunk_edges, self._spill_dir) as buckets:
+            for chunk in self._iter_chunks():
+                for i in range(0, len(chunk), 2):
+                    buckets.add(
+                        node_of[chunk[i]], node_of[self._target_node[chunk[i + 1]]]
+                    )
+
+            for block_index, (start, stop) in enumerate(blocks):
+                rows: Dict[int, set] = {}
+                for chunk in buckets.read(block_index):
+                    for i in range(0, len(chunk), 2):
+                        rows.setdefault(chunk[i], set()).add(chunk[i + 1])
+
+                block = array("I")
+                for source in range(start, stop):
+                    row = sorted(rows.pop(source, ()))
+                    block.extend(row)
+                    offsets.append(offsets[-1] + len(row))
+                    for target in row:
+                        in_counts[target] += 1
+                f.write(block)
+
+        return offsets, in_counts
+
+    def _iter_forward(
+        self, f: IO[bytes], offsets: array, targets_start: int
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Читает уже записанный прямой CSR по порядку: пары (источник, цель).
+        """
+        edge_count = offsets[-1]
+        source = 0
+        position = 0
+        f.seek(targets_start)
+        while position < edge_count:
+            chunk = array("I")
+            chunk.frombytes(f.read(4 * min(self._chunk_edges, edge_count - position)))
+            for target in chunk:
+                while offsets[source + 1] <= position:
+                    source += 1
+                yield source, target
+                position += 1
+
+    def _write_reverse(
+        self,
+        f: IO[bytes],
+        offsets: array,
+        targets_start: int,
+        rev_offsets: array,
+        rev_targets_start: int,
+        in_counts: array,
+    ) -> None:
+        """
+        Пишет обратный CSR блоками целей. Прямой CSR читается один раз
+        и раскладывается по корзинам блоков; источники в корзине идут
+        по возрастанию, поэтому строки сразу отсортированы.
+        """
+        node_count = len(offsets) - 1
+        blocks = list(self._blocks(in_counts))
+
+        with _Buckets(blocks, self._chunk_edges, self._spill_dir) as buckets:
+            for source, target in self._iter_forward(f, offsets, targets_start):
+                buckets.add(target, source)
+
+            for block_index, (start, stop) in enumerate(blocks):
+                base = rev_offsets[start]
+                block = array("I", bytes(4 * (rev_offsets[stop] - base)))
+                fill = array(
+                    "I", (rev_offsets[node] - base for node in range(start, stop))
+                )
+                for chunk in buckets.read(block_index):
+                    for i in range(0, len(chunk), 2):
+                        target = chunk[i] - start
+                        block[fill[target]] = chunk[i + 1]
+                        fill[target] += 1
+
+                f.seek(rev_targets_start + 4 * base)
+                f.write(block)
+
+        logger.debug("Wrote reverse CSR of %s nodes", node_count)
+
+
+class _Buckets:
+    """
+    Внешняя сортировка корзинами: пары uint32 (нода, значение) раскладываются
+    по блокам нод. Все корзины пишутся в один временный файл кусками,
+    для каждой корзины запоминаются её отрезки файла; в памяти не больше
+    chunk_edges пар.
+    """
+
+    def __init__(
+        self,
+        blocks: List[Tuple[int, int]],
+        chunk_edges: int,
+        spill_dir: Optional[Path],
+    ):
+        self._chunk_edges = chunk_edges
+        self._block_of = array("I")
+        for block_index, (start, stop) in enumerate(blocks):
+            self._block_of.extend([block_index] * (stop - start))
+
+        self._buffers = [array("I") for _ in blocks]
+        self._buffered = 0
+        # отрезки (смещение, число uint32) каждой корзины в файле
+        self._segments: List[List[Tuple[int, int]]] = [[] for _ in blocks]
+        self._file: IO[bytes] = tempfile.TemporaryFile(
+            prefix="depgraph-buckets-", dir=spill_dir
+        )
+
+    def __enter__(self) -> "_Buckets":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._file.close()
+
+    def add(self, node: int, value: int) -> None:
+
+        buffer = self._buffers[self._block_of[node]]
+        buffer.append(node)
+        buffer.append(value)
+        self._buffered += 1
+        if self._buffered >= self._chunk_edges:
+            self._flush()
+
+    def _flush(self) -> None:
+
+        position = self._file.seek(0, os.SEEK_END)
+        for block_index, buffer in enumerate(self._buffers):
+            if buffer:
+                self._segments[block_index].append((position, len(buffer)))
+                buffer.tofile(self._file)
+                position += 4 * len(buffer)
+                self._buffers[block_index] = array("I")
+        self._buffered = 0
+
+    def read(self, block_index: int) -> Iterator[array]:
+        """
+        Читает корзину блока кусками в порядке добавления пар.
+        """
+        if self._buffered:
+            self._flush()
+
+        for position, length in self._segments[block_index]:
+            self._file.seek(position)
+            chunk = array("I")
+            chunk.frombytes(self._file.read(4 * length))
+            yield chunk
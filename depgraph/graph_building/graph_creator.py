@@ -1,16 +1,40 @@
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
 
-import networkx as nx
+from .compact_graph import CompactGraph
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 logger = logging.getLogger(__name__)
 
+# "networkx" - nx.DiGraph с Path-ключами, "compact" - CompactGraph на CSR-буферах
+GRAPH_BACKENDS = ("networkx", "compact")
+
 
 class GraphCreator:
-    def __init__(self):
-        self._graph = nx.DiGraph()
+    def __init__(self, backend: str = "networkx"):
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(
+                f"backend need to be one of {GRAPH_BACKENDS} but given '{backend}'"
+            )
+
+        self._backend = backend
+        self._graph: Union["nx.DiGraph", CompactGraph] = self._empty_graph()
         self._dep_dict: Dict[Path, list[Path]] = {}
+        # импортированные по рёбрам имена (режим разрешения "symbol")
+        self._edge_names: Dict[Path, Dict[Path, List[str]]] = {}
+
+    def _empty_graph(self) -> Union["nx.DiGraph", CompactGraph]:
+
+        if self._backend == "compact":
+            return CompactGraph()
+
+        # networkx нужен только этому бэкенду и грузится при первом графе
+        import networkx as nx
+
+        return nx.DiGraph()
 
     def _nodes_from_keys(self) -> None:
         for module in self._dep_dict.keys():
@@ -19,37 +43,130 @@ class GraphCreator:
     def _node_from_path(self, module: Path) -> None:
         label = str(module.parent if module.stem == "__init__" else module)
         self._graph.add_node(module, label=label)
-        logger.debug(f"Added {str(module)} module to graph")
+        logger.debug("Added %s module to graph", module)
 
     def _edges_from_dict(self) -> None:
         for importing_module in self._dep_dict.keys():
             self._edge_from_module_deps(importing_module)
 
     def _edge_from_module_deps(self, importing_module: Path) -> None:
+        names = self._edge_names.get(importing_module, {})
         for imported_module in self._dep_dict[importing_module]:
-            to_node = (
-                imported_module.parent
-                if imported_module.stem == "__init__"
-                else imported_module
+            self.add_dependency(
+                importing_module, imported_module, names.get(imported_module)
             )
+
+    def add_module(self, module: Path) -> None:
+        if isinstance(self._graph, CompactGraph):
+            self._graph.add_module(module)
+            return
+        self._node_from_path(module)
+
+    def add_dependency(
+        self,
+        importing_module: Path,
+        imported_module: Path,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        if isinstance(self._graph, CompactGraph):
+            # CSR-буферы хранят только структуру графа, имена на рёбрах не сохраняются
+            self._graph.add_dependency(importing_module, imported_module)
+            return
+
+        to_node = (
+            imported_module.parent
+            if imported_module.stem == "__init__"
+            else imported_module
+        )
+        if names is None:
             self._graph.add_edge(importing_module, to_node, label="import")
-            logger.debug(
-                f"Added {str(importing_module)} -> {str(to_node)} edge to graph"
-            )
+        else:
+            self._graph.add_edge(importing_module, to_node, label="import", names=names)
+        logger.debug("Added %s -> %s edge to graph", importing_module, to_node)
 
-    def build_graph(self, dep_dict: Dict[Path, list[Path]]) -> None:
+    def build_graph(
+        self,
+        dep_dict: Dict[Path, list[Path]],
+        edge_names: Optional[Dict[Path, Dict[Path, List[str]]]] = None,
+    ) -> None:
         logger.info("Starting building local dependencies graph")
         self._dep_dict = dep_dict
+        self._edge_names = edge_names or {}
+
+        if self._backend == "compact":
+            self._graph = CompactGraph.from_dep_dict(dep_dict)
+            return
+
         self._nodes_from_keys()
         self._edges_from_dict()
 
+    def finish(self) -> None:
+        """
+        Завершает потоковое наполнение графа через add_module/add_dependency.
+        """
+        if isinstance(self._graph, CompactGraph):
+            self._graph.freeze()
+
+    def update_graph(
+        self,
+        dep_dict: Dict[Path, list[Path]],
+        changed_modules: Iterable[Path],
+        removed_modules: Iterable[Path],
+        edge_names: Optional[Dict[Path, Dict[Path, List[str]]]] = None,
+    ) -> None:
+        """
+        Патчит уже построенный граф вместо полной перестройки.
+
+        Args:
+            dep_dict (Dict[Path, list[Path]]): актуальный словарь зависимостей.
+            changed_modules (Iterable[Path]): модули с пересчитанными зависимостями.
+            removed_modules (Iterable[Path]): удалённые модули.
+            edge_names (Optional[Dict]): актуальные имена на рёбрах (режим "symbol").
+        """
+        if isinstance(self._graph, CompactGraph):
+            # CSR-буферы неизменяемы: дешевле пересобрать их целиком за O(E)
+            logger.debug("Rebuilding compact graph after update")
+            self.build_graph(dep_dict, edge_names)
+            return
+
+        self._dep_dict = dep_dict
+        self._edge_names = edge_names or {}
+        stale_targets: Set[Path] = set()
+
+        for module in removed_modules:
+            if module in self._graph:
+                stale_targets.update(self._graph.successors(module))
+                self._graph.remove_node(module)
+                logger.debug(f"Removed {str(module)} module from graph")
+
+        for module in changed_modules:
+            if module in self._graph:
+                stale_targets.update(self._graph.successors(module))
+                self._graph.remove_edges_from(list(self._graph.out_edges(module)))
+            self._node_from_path(module)
+            self._edge_from_module_deps(module)
+
+        # ноды, появившиеся только как цель ребра, больше никому не нужны
+        for node in stale_targets:
+            if (
+                node not in self._dep_dict
+                and node in self._graph
+                and self._graph.in_degree(node) == 0
+            ):
+                self._graph.remove_node(node)
+
     def print_nodes(self) -> None:
-        for node, data in self._graph.nodes(data=True):
+        for node, data in self.get_networkx_graph().nodes(data=True):
             print(f"{node} -> {data}")
 
     def print_edges(self) -> None:
-        for u, v, data in self._graph.edges(data=True):
+        for u, v, data in self.get_networkx_graph().edges(data=True):
             print(f"{u} -> {v}, {data}")
 
-    def get_graph(self) -> nx.DiGraph:
+    def get_graph(self) -> Union["nx.DiGraph", CompactGraph]:
+        return self._graph
+
+    def get_networkx_graph(self) -> "nx.DiGraph":
+        if isinstance(self._graph, CompactGraph):
+            return self._graph.to_networkx()
         return self._graph
@@ -0,0 +1,355 @@
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from .compact_graph import CompactGraph, _node_label
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__all__ = ["GraphSnapshot", "save_snapshot", "SNAPSHOT_FORMAT_VERSION"]
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b"DEPGRAPH"
+# по маркеру определяется порядок байт машины, записавшей снимок
+_BYTE_ORDER_MARK = 0x01020304
+
+# magic, версия, маркер порядка байт, число нод, число рёбер, размер таблицы имён
+_HEADER = struct.Struct("=8sIIIIQ")
+_ALIGN = 8
+_MAX_UINT32 = 0xFFFFFFFF
+_COPY_CHUNK = 1 << 20
+
+
+def _aligned(position: int) -> int:
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _section_sizes(node_count: int, edge_count: int, names_size: int) -> List[int]:
+    """
+    Размеры секций снимка в порядке их следования в файле.
+    Каждая секция начинается с границы в 8 байт.
+    """
+    return [
+        4 * (node_count + 1),  # смещения имён в таблице имён
+        names_size,  # таблица имён: utf-8 пути без разделителей
+        node_count,  # признак модуля (ключ dep_dict) для каждой ноды
+        4 * node_count,  # id нод, упорядоченные по имени, для бинарного поиска
+        4 * (node_count + 1),  # CSR offsets
+        4 * edge_count,  # CSR targets
+        4 * (node_count + 1),  # обратный CSR offsets
+        4 * edge_count,  # обратный CSR targets
+    ]
+
+
+def _write_section(f: BinaryIO, data: Union[bytes, bytearray, array]) -> None:
+
+    f.write(data)
+    padding = _aligned(f.tell()) - f.tell()
+    if padding:
+        f.write(bytes(padding))
+
+
+def save_snapshot(
+    graph: Union[CompactGraph, "GraphSnapshot", "nx.DiGraph"], snapshot_file: Path
+) -> None:
+    """
+    Сохраняет граф в версионированный бинарный снимок.
+
+    Формат: заголовок, таблица имён с массивом смещений, признаки модулей,
+    отсортированный по имени индекс и прямой/обратный CSR из uint32.
+    Числа пишутся в порядке байт текущей машины, чтобы при загрузке
+    буферы читались через mmap без копирования и преобразований.
+
+    Args:
+        graph (Union[CompactGraph, GraphSnapshot, nx.DiGraph]): граф зависимостей;
+                        открытый снимок копируется как есть.
+        snapshot_file (Path): путь к файлу снимка.
+    """
+    if isinstance(graph, GraphSnapshot):
+        graph.copy_to(snapshot_file)
+        return
+
+    if not isinstance(graph, CompactGraph):
+        graph = CompactGraph.from_networkx(graph)
+
+    node_count = graph.number_of_nodes()
+    encoded = [graph.node_name(node_id).encode("utf-8") for node_id in range(node_count)]
+
+    name_offsets = array("I", [0])
+    position = 0
+    for name in encoded:
+        position += len(name)
+        if position > _MAX_UINT32:
+            raise ValueError("names table is too large for snapshot format")
+        name_offsets.append(position)
+
+    is_module = bytearray(graph.is_module(node_id) for node_id in range(node_count))
+    sorted_ids = array("I", sorted(range(node_count), key=encoded.__getitem__))
+    offsets, targets = graph.csr()
+    rev_offsets, rev_targets = graph.reverse_csr()
+
+    snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = snapshot_file.with_name(snapshot_file.name + ".tmp")
+
+    with tmp_file.open("wb") as f:
+        _write_section(
+            f,
+            _HEADER.pack(
+                _MAGIC,
+                SNAPSHOT_FORMAT_VERSION,
+                _BYTE_ORDER_MARK,
+                node_count,
+                len(targets),
+                position,
+            ),
+        )
+        _write_section(f, name_offsets)
+        _write_section(f, b"".join(encoded))
+        _write_section(f, is_module)
+        _write_section(f, sorted_ids)
+        _write_section(f, offsets)
+        _write_section(f, targets)
+        _write_section(f, rev_offsets)
+        _write_section(f, rev_targets)
+
+    os.replace(tmp_file, snapshot_file)
+    logger.info(
+        f"Snapshot with {node_count} nodes and {len(targets)} edges "
+        f"saved to {snapshot_file}"
+    )
+
+
+class GraphSnapshot:
+    """
+    Граф, загруженный из бинарного снимка через mmap.
+
+    Открытие читает только заголовок: все массивы - это memoryview поверх
+    отображённого файла, страницы подгружаются ОС по мере обращения.
+    Поиск ноды по имени - бинарный поиск по отсортированному индексу,
+    без построения словаря. Интерфейс запросов совпадает с CompactGraph,
+    поэтому снимок можно передать в GraphAnalytics.
+    """
+
+    def __init__(self, snapshot_file: Path):
+
+        self._snapshot_file = snapshot_file
+        self._views: List[memoryview] = []
+
+        with snapshot_file.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._map_sections()
+        except Exception:
+            self.close()
+            raise
+
+        logger.debug(
+            "Opened snapshot %s: %s nodes, %s edges",
+            snapshot_file,
+            self._node_count,
+            self._edge_count,
+        )
+
+    def _map_sections(self) -> None:
+
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{str(self._snapshot_file)} is not a graph snapshot")
+
+        magic, version, byte_order, node_count, edge_count, names_size = (
+            _HEADER.unpack_from(self._mmap)
+        )
+
+        if magic != _MAGIC:
+            raise ValueError(f"{str(self._snapshot_file)} is not a graph snapshot")
+
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"snapshot version is need to be {SNAPSHOT_FORMAT_VERSION} "
+                f"but given {version}"
+            )
+
+        if byte_order != _BYTE_ORDER_MARK:
+            raise ValueError("snapshot was written on a machine with other byte order")
+
+        sizes = _section_sizes(node_count, edge_count, names_size)
+        position = _aligned(_HEADER.size)
+
+        if position + sum(_aligned(size) for size in sizes[:-1]) + sizes[-1] > len(
+            self._mmap
+        ):
+            raise ValueError(f"snapshot {str(self._snapshot_file)} is truncated")
+
+        whole = memoryview(self._mmap)
+        self._views.append(whole)
+        sections = []
+        for size in sizes:
+            sections.append(whole[position : position + size])
+            position = _aligned(position + size)
+        self._views.extend(sections)
+
+        (
+            name_offsets,
+            self._names,
+            self._is_module,
+            sorted_ids,
+            offsets,
+            targets,
+            rev_offsets,
+            rev_targets,
+        ) = sections
+
+        self._name_offsets = self._cast(name_offsets)
+        self._sorted_ids = self._cast(sorted_ids)
+        self._offsets = self._cast(offsets)
+        self._targets = self._cast(targets)
+        self._rev_offsets = self._cast(rev_offsets)
+        self._rev_targets = self._cast(rev_targets)
+
+        self._node_count = node_count
+        self._edge_count = edge_count
+
+    def _cast(self, section: memoryview) -> memoryview:
+        view = section.cast("I")
+        self._views.append(view)
+        return view
+
+    def close(self) -> None:
+        """
+        Освобождает буферы и закрывает отображение файла. После закрытия
+        memoryview, полученные из снимка, использовать нельзя.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def copy_to(self, snapshot_file: Path) -> None:
+        """
+        Копирует снимок в другой файл кусками, не читая его в память целиком.
+        """
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_name(snapshot_file.name + ".tmp")
+
+        with tmp_file.open("wb") as f:
+            for position in range(0, len(self._mmap), _COPY_CHUNK):
+                f.write(self._mmap[position : position + _COPY_CHUNK])
+
+        os.replace(tmp_file, snapshot_file)
+        logger.info(f"Snapshot {self._snapshot_file} copied to {snapshot_file}")
+
+    def __enter__(self) -> "GraphSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _name_bytes(self, node_id: int) -> bytes:
+        return bytes(
+            self._names[self._name_offsets[node_id] : self._name_offsets[node_id + 1]]
+        )
+
+    def _find(self, node: Union[Path, str]) -> Optional[int]:
+
+        name = (node if isinstance(node, str) else node.as_posix()).encode("utf-8")
+        low, high = 0, self._node_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(self._sorted_ids[middle]) < name:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._node_count:
+            node_id = self._sorted_ids[low]
+            if self._name_bytes(node_id) == name:
+                return node_id
+        return None
+
+    def csr(self) -> Tuple[memoryview, memoryview]:
+        return self._offsets, self._targets
+
+    def reverse_csr(self) -> Tuple[memoryview, memoryview]:
+        return self._rev_offsets, self._rev_targets
+
+    def node_id(self, node: Union[Path, str]) -> int:
+        node_id = self._find(node)
+        if node_id is None:
+            raise KeyError(node)
+        return node_id
+
+    def node_name(self, node_id: int) -> str:
+        return self._name_bytes(node_id).decode("utf-8")
+
+    def label(self, node_id: int) -> str:
+        return _node_label(self.node_name(node_id))
+
+    def is_module(self, node_id: int) -> bool:
+        return bool(self._is_module[node_id])
+
+    def successor_ids(self, node_id: int) -> memoryview:
+        return self._targets[self._offsets[node_id] : self._offsets[node_id + 1]]
+
+    def predecessor_ids(self, node_id: int) -> memoryview:
+        return self._rev_targets[
+            self._rev_offsets[node_id] : self._rev_offsets[node_id + 1]
+        ]
+
+    def successors(self, node: Union[Path, str]) -> List[Path]:
+        return [Path(self.node_name(i)) for i in self.successor_ids(self.node_id(node))]
+
+    def predecessors(self, node: Union[Path, str]) -> List[Path]:
+        return [
+            Path(self.node_name(i)) for i in self.predecessor_ids(self.node_id(node))
+        ]
+
+    def iter_nodes(self) -> Iterator[Path]:
+        for node_id in range(self._node_count):
+            yield Path(self.node_name(node_id))
+
+    def iter_edges(self) -> Iterator[Tuple[Path, Path]]:
+        for source in range(self._node_count):
+            for target in self.successor_ids(source):
+                yield Path(self.node_name(source)), Path(self.node_name(target))
+
+    def number_of_nodes(self) -> int:
+        return self._node_count
+
+    def number_of_edges(self) -> int:
+        return self._edge_count
+
+    def __contains__(self, node: object) -> bool:
+        if not isinstance(node, (Path, str)):
+            return False
+        return self._find(node) is not None
+
+    def __len__(self) -> int:
+        return self._node_count
+
+    def to_compact(self) -> CompactGraph:
+        """
+        Копирует снимок в изменяемый CompactGraph.
+        """
+        graph = CompactGraph()
+        for node_id in range(self._node_count):
+            graph.intern(self.node_name(node_id))
+            if self._is_module[node_id]:
+                graph._is_module[node_id] = 1
+
+        for source in range(self._node_count):
+            for target in self.successor_ids(source):
+                graph._src.append(source)
+                graph._dst.append(target)
+
+        graph.freeze()
+        return graph
+
+    def to_networkx(self) -> "nx.DiGraph":
+        return self.to_compact().to_networkx()
@@ -13,6 +13,11 @@ def setup_logger() -> logging.Logger:
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
+    # Чтобы не дублировались сообщения при повторной настройке
+    # (и не обнулялся app.log уже настроенного приложения)
+    if logger.handlers:
+        return logger
+
     # Вывод в stdout
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)  # уровень для консоли
@@ -23,9 +28,7 @@ def setup_logger() -> logging.Logger:
     file_handler.setLevel(logging.DEBUG)  # более подробные логи в файл
     file_handler.setFormatter(formatter)
 
-    # Чтобы не дублировались сообщения при повторной настройке
-    if not logger.handlers:
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
 
     return logger
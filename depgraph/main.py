@@ -1,18 +1,41 @@
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import Executor
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from .analyzing.python_analyzer import PythonImportsAnalyzer
-from .dep_finding.python_dep_finder import PythonDepFinder
-from .graph_building.graph_creator import GraphCreator
-from .logging_setup import setup_logger
-from .utils import (
-    _find_all_python_modules,
-    _find_project_roots,
-    _to_dep_dict,
-    visualize_graph,
-
+from .analyzing.python_analyzer import (
+    ANALYZER_ENGINES,
+    ANALYZER_VERSION,
+    Diagnostic,
+    PythonImportsAnalyzer,
 )
+from .caching.parse_cache import ParseCache
+from .dep_finding.module_index import ModuleIndex
+from .dep_finding.resolution_model import ResolutionModel, read_pyproject_layout
+from .file_finding.listing_file_finder import ListingFileFinder
+from .file_finding.python_file_finder import PythonFileFinder
+from .dep_finding.python_dep_finder import (
+    READ_THREADS,
+    RESOLUTION_MODES,
+    PythonDepFinder,
+)
+from .git_diff.revision_diff import GraphDelta, RevisionDiff
+from .graph_analytics.graph_analytics import GraphAnalytics
+from .graph_building.edge_sink import EdgeSink
+from .graph_building.edge_store import EdgeStore
+from .graph_building.graph_creator import GRAPH_BACKENDS, GraphCreator
+from .graph_building.graph_snapshot import GraphSnapshot, save_snapshot
+from .logging_setup import setup_logger
+from .profiling.pipeline_stats import PipelineStats, ProfilerFactory
+from .sharding.partial_result import PartialResult, load_partial, save_partial
+from .sharding.shard_merger import ShardMerger
+from .utils import _to_dep_dict, visualize_graph
+from .visualizing.scalable_renderer import render_scalable_html
 
-logger = setup_logger()
+logger = logging.getLogger(__name__)
 
 
 class Depgraph:
@@ -28,6 +51,32 @@ class Depgraph:
         self._dep_dict = None
         self._graph = None
         self._suffix = ".html"
+        self._workers = 1
+        self._read_threads = READ_THREADS
+        self._resilient = False
+        self._resolution = "module"
+        # модель путей импорта: корни исходников, PEP 420, pyproject.toml
+        self._source_roots: List[Path] = []
+        self._namespace_packages = False
+        self._use_pyproject = False
+        self._diagnostics: Dict[Path, Diagnostic] = {}
+        # имена на рёбрах графа, слитого из шардов
+        self._merged_edge_names: Optional[Dict[Path, Dict[Path, List[str]]]] = None
+        self._parse_cache = None
+        self._analyzer_engine = "ast"
+        self._file_finder = None
+        self._exclude_patterns: List[str] = []
+        self._use_default_excludes = True
+        self._use_gitignore = True
+        self._graph_backend = "networkx"
+        self._analytics = None
+        self._executor = None
+        self._stats = PipelineStats()
+        # бюджет памяти в байтах; None - зависимости и граф целиком в памяти
+        self._memory_budget: Optional[int] = None
+        self._spill_dir: Optional[Path] = None
+        self._edge_store: Optional[EdgeStore] = None
+        self._spilled_snapshot: Optional[Path] = None
 
     def set_proj_path(self, path: str) -> None:
 
@@ -64,53 +113,925 @@ class Depgraph:
 
         self._save_file_path = temp_path
 
+    def set_workers(self, workers: Optional[int]) -> None:
+        """
+        Задаёт число процессов для анализа модулей.
+
+        Args:
+            workers (Optional[int]): число процессов; 1 - последовательный анализ,
+                            None - по числу ядер процессора.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if not isinstance(workers, int) or isinstance(workers, bool):
+            raise ValueError(
+                f"workers is need to be an integer but given {type(workers)}"
+            )
+
+        if workers < 1:
+            raise ValueError(f"workers is need to be positive but given {workers}")
+
+        self._workers = workers
+
+    def set_read_threads(self, threads: int) -> None:
+        """
+        Задаёт число потоков, читающих файлы заранее, пока разбираются
+        предыдущие. Помогает на сетевых ФС (NFS, FUSE), где каждое чтение
+        ждёт сервер; 0 - читать файлы по одному.
+        """
+        if not isinstance(threads, int) or isinstance(threads, bool):
+            raise ValueError(
+                f"threads is need to be an integer but given {type(threads)}"
+            )
+
+        if threads < 0:
+            raise ValueError(f"threads is need to be non-negative but given {threads}")
+
+        self._read_threads = threads
+
+    def set_process_pool(self, executor: Optional[Executor]) -> None:
+        """
+        Задаёт внешний пул процессов для анализа модулей, чтобы не создавать
+        новый пул на каждый проект. Depgraph пул не закрывает; размер окна
+        задач по-прежнему определяется set_workers().
+
+        Args:
+            executor (Optional[Executor]): пул процессов или None - свой пул на каждый запуск.
+        """
+        if executor is not None and not isinstance(executor, Executor):
+            raise ValueError(
+                f"executor is need to be an Executor but given {type(executor)}"
+            )
+
+        self._executor = executor
+
+    def set_profiler(self, profiler: Optional[ProfilerFactory]) -> None:
+        """
+        Запускает каждый этап внутри profiler(имя этапа), например
+        cprofile_profiler(Path("depgraph.prof")) или lambda _: pyinstrument.Profiler().
+
+        Args:
+            profiler (Optional[ProfilerFactory]): фабрика контекстных менеджеров
+                            или None, чтобы отключить профилирование.
+        """
+        if profiler is not None and not callable(profiler):
+            raise ValueError(f"profiler is need to be callable but given {type(profiler)}")
+
+        self._stats.set_profiler(profiler)
+
+    def get_proj_path(self) -> Optional[Path]:
+        return self._project_path
+
+    def get_dep_dict(self) -> Optional[Dict[Path, List[Path]]]:
+        return self._dep_dict
+
+    def get_stats(self) -> PipelineStats:
+        return self._stats
+
+    def save_stats_report(self, path: str) -> None:
+
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        self._stats.save_report(Path(path).resolve())
+
+    def set_analyzer_engine(self, engine: str) -> None:
+        """
+        Выбирает способ извлечения импортов.
+
+        Args:
+            engine (str): "ast" - обход полного AST (по умолчанию),
+                            "scan" - разбор только операторов импорта.
+        """
+        if engine not in ANALYZER_ENGINES:
+            raise ValueError(
+                f"engine is need to be one of {ANALYZER_ENGINES} but given '{engine}'"
+            )
+
+        self._analyzer_engine = engine
+
+    def set_resilient(self, resilient: bool) -> None:
+        """
+        Устойчивый режим: файлы с синтаксическими ошибками (например, код
+        на Python 2) или в неверной кодировке не обрывают анализ - импорты
+        из них извлекаются сканером, а сами файлы попадают в get_diagnostics().
+        """
+        if not isinstance(resilient, bool):
+            raise ValueError(
+                f"resilient is need to be a boolean but given {type(resilient)}"
+            )
+
+        self._resilient = resilient
+
+    def set_resolution(self, resolution: str) -> None:
+        """
+        Выбирает, куда ведут рёбра из from-импортов.
+
+        Args:
+            resolution (str): "module" - в импортируемый модуль или пакет
+                            (по умолчанию), "symbol" - в модуль, где имя
+                            определено, с прослеживанием реэкспортов через
+                            __init__.py; имена сохраняются на рёбрах.
+        """
+        if resolution not in RESOLUTION_MODES:
+            raise ValueError(
+                f"resolution is need to be one of {RESOLUTION_MODES} "
+                f"but given '{resolution}'"
+            )
+
+        self._resolution = resolution
+
+    def set_resolution_model(
+        self,
+        source_roots: Optional[List[str]] = None,
+        namespace_packages: bool = False,
+        use_pyproject: bool = False,
+    ) -> None:
+        """
+        Задаёт, как абсолютные импорты отображаются на файлы проекта.
+
+        По умолчанию имена отсчитываются от найденных корневых пакетов
+        (каталогов с __init__.py). С любым из параметров импорты разрешаются
+        как через sys.path: от корней исходников по порядку, на каждом уровне
+        имени побеждает первый корень с модулем или пакетом.
+
+        Args:
+            source_roots (Optional[List[str]]): корни исходников относительно
+                            проекта, например ["src"]; по умолчанию ".".
+            namespace_packages (bool): каталоги без __init__.py - пакеты
+                            пространства имён (PEP 420), их порции из разных
+                            корней сливаются.
+            use_pyproject (bool): брать корни и пакеты из pyproject.toml
+                            проекта (poetry, setuptools, hatch).
+        """
+        if source_roots is not None and (
+            not isinstance(source_roots, list)
+            or not all(isinstance(root, str) for root in source_roots)
+        ):
+            raise ValueError("source_roots is need to be a list of strings")
+
+        if not isinstance(namespace_packages, bool):
+            raise ValueError(
+                f"namespace_packages is need to be a bool "
+                f"but given {type(namespace_packages)}"
+            )
+
+        if not isinstance(use_pyproject, bool):
+            raise ValueError(
+                f"use_pyproject is need to be a bool but given {type(use_pyproject)}"
+            )
+
+        self._source_roots = [Path(root) for root in source_roots or []]
+        for root in self._source_roots:
+            if root.is_absolute() or ".." in root.parts:
+                raise ValueError(
+                    f"source root is need to be inside the project but given {root}"
+                )
+
+        self._namespace_packages = namespace_packages
+        self._use_pyproject = use_pyproject
+
+    def set_exclude_patterns(
+        self, patterns: List[str], use_default_excludes: bool = True
+    ) -> None:
+        """
+        Задаёт шаблоны исключения в синтаксисе .gitignore ("build/", "**/gen_*.py").
+
+        Args:
+            patterns (List[str]): шаблоны относительно корня проекта.
+            use_default_excludes (bool): исключать ли также .git, .venv,
+                            node_modules, build, site-packages и т.п.
+        """
+        if not isinstance(patterns, list) or not all(
+            isinstance(pattern, str) for pattern in patterns
+        ):
+            raise ValueError("patterns is need to be a list of strings")
+
+        self._exclude_patterns = patterns
+        self._use_default_excludes = use_default_excludes
+
+    def set_use_gitignore(self, use_gitignore: bool) -> None:
+
+        if not isinstance(use_gitignore, bool):
+            raise ValueError(
+                f"use_gitignore is need to be a bool but given {type(use_gitignore)}"
+            )
+
+        self._use_gitignore = use_gitignore
+
+    def set_graph_backend(self, backend: str) -> None:
+        """
+        Выбирает представление графа.
+
+        Args:
+            backend (str): "networkx" - nx.DiGraph (по умолчанию),
+                            "compact" - CompactGraph с целыми id и CSR-смежностью.
+        """
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(
+                f"backend is need to be one of {GRAPH_BACKENDS} but given '{backend}'"
+            )
+
+        self._graph_backend = backend
+
+    def set_memory_budget(
+        self, budget_mb: Optional[int], spill_dir: Optional[str] = None
+    ) -> None:
+        """
+        Режим ограниченной памяти для очень больших проектов.
+
+        start_dep_finding() отдаёт рёбра не в dep_dict, а в хранилище на
+        диске (EdgeStore); start_graph_generating() собирает из него
+        бинарный снимок графа блоками в пределах бюджета и открывает его
+        через mmap; визуализация пишет HTML прямо из снимка. В памяти
+        остаются только индекс модулей и таблица имён нод, так что бюджет
+        ограничивает всё, что растёт с числом рёбер.
+
+        В этом режиме get_dep_dict() возвращает None, а update(),
+        get_dependencies() и save_partial() недоступны. Временные файлы
+        удаляются через close().
+
+        Args:
+            budget_mb (Optional[int]): бюджет в мегабайтах или None, чтобы
+                            вернуться к обычному режиму.
+            spill_dir (Optional[str]): каталог временных файлов; по умолчанию
+                            системный каталог временных файлов.
+        """
+        if budget_mb is not None and (
+            not isinstance(budget_mb, int) or isinstance(budget_mb, bool)
+        ):
+            raise ValueError(
+                f"budget_mb is need to be an integer but given {type(budget_mb)}"
+            )
+
+        if budget_mb is not None and budget_mb < 1:
+            raise ValueError(f"budget_mb is need to be positive but given {budget_mb}")
+
+        if spill_dir is not None and not isinstance(spill_dir, str):
+            raise ValueError(
+                f"spill_dir is need to be a string but given {type(spill_dir)}"
+            )
+
+        self._memory_budget = None if budget_mb is None else budget_mb * 2**20
+        self._spill_dir = None if spill_dir is None else Path(spill_dir).resolve()
+
+    def close(self) -> None:
+        """
+        Закрывает снимок и удаляет временные файлы режима ограниченной памяти.
+        """
+        self._release_spilled()
+
+    def set_cache_path(self, path: str) -> None:
+        """
+        Включает персистентный кеш разобранных импортов.
+
+        Args:
+            path (str): путь к файлу кеша; создаётся при первом сохранении.
+        """
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        self._parse_cache = ParseCache(Path(path).resolve(), ANALYZER_VERSION)
+        self._parse_cache.load()
+
     def start_dep_finding(self) -> None:
 
-        self._prepare_for_start()
-        self._dep_finder.start_dep_finding()
+        if self._memory_budget is not None:
+            self._find_deps_on_disk()
+            return
+
+        with self._stats.stage("prepare_data"):
+            self._prepare_for_start()
+
+        with self._stats.stage("dep_finding"):
+            self._dep_finder.start_dep_finding()
+
+            if self._parse_cache is not None:
+                self._parse_cache.prune(self._project_path, self._all_modules)
+                self._parse_cache.save()
+
+        self._record_counters(self._dep_finder)
+
+    def start_streaming(self, sink: Optional[EdgeSink] = None) -> None:
+        """
+        Потоковый режим: модули анализируются, а их рёбра отдаются в sink
+        по мере разрешения, без списка модулей, dep_dict и списков импортов.
+
+        Сначала обход файлов заполняет индекс модулей: без него нельзя
+        разрешить импорт. Дальше память от размера проекта почти не зависит
+        (если sink сам ничего не копит). После этого режима update() недоступен.
+
+        Args:
+            sink (Optional[EdgeSink]): приёмник модулей и рёбер; по умолчанию
+                            строится граф, как в start_graph_generating().
+        """
+        self._check_proj_path()
+
+        with self._stats.stage("prepare_data"):
+            self._file_finder = self._create_file_finder()
+            module_index = ModuleIndex(self._file_finder.iter_modules())
+            self._project_roots = self._file_finder.get_project_roots()
+        self._analyzer = self._create_analyzer()
+
+        if sink is None:
+            self._graph_creator = GraphCreator(self._graph_backend)
+            sink = self._graph_creator
+
+        dep_finder = PythonDepFinder(
+            dir_path=self._project_path,
+            project_roots=self._project_roots,
+            dep_dict={},
+            modules=[],
+            analyser=self._analyzer,
+            workers=self._workers,
+            parse_cache=self._parse_cache,
+            module_index=module_index,
+            file_finder=self._file_finder,
+            executor=self._executor,
+            read_threads=self._read_threads,
+            resolution=self._resolution,
+            resolution_model=self._create_resolution_model(),
+        )
+
+        with self._stats.stage("streaming"):
+            edge_names = dep_finder.get_edge_names()
+
+            for importing_module, deps in dep_finder.iter_dependencies(module_index):
+                sink.add_module(importing_module)
+                # имена уже не нужны искателю: отдаём их sink и не держим в памяти
+                names = edge_names.pop(importing_module, None)
+                for imported_module in deps:
+                    if names is None:
+                        sink.add_dependency(importing_module, imported_module)
+                    else:
+                        sink.add_dependency(
+                            importing_module, imported_module, names[imported_module]
+                        )
+
+            if sink is self._graph_creator:
+                self._graph_creator.finish()
+                self._graph = self._graph_creator.get_graph()
+                self._analytics = None
+
+            if self._parse_cache is not None:
+                self._parse_cache.prune(self._project_path, module_index)
+                self._parse_cache.save()
+
+        self._record_counters(dep_finder)
+
+    def _find_deps_on_disk(self) -> None:
+
+        self._release_spilled()
+        self._dep_finder = None
+        self._dep_dict = None
+        self._all_modules = None
+        self._merged_edge_names = None
+        self._graph = None
+        self._graph_creator = None
+        self._analytics = None
+
+        assert self._memory_budget is not None
+        store = EdgeStore(self._memory_budget, self._spill_dir)
+        try:
+            self.start_streaming(store)  # type: ignore[arg-type]
+        except Exception:
+            store.close()
+            raise
+
+        store.finish()
+        self._edge_store = store
+        self._stats.set("edges", store.number_of_edges())
 
     def start_graph_generating(self) -> None:
 
-        self._graph_creator.build_graph(self._dep_dict)
-        self._graph = self._graph_creator._graph
+        if self._edge_store is not None:
+            with self._stats.stage("graph_generating"):
+                self._graph = self._open_spilled_snapshot(self._edge_store)
+                self._graph_creator = None
+                self._analytics = None
+
+            self._stats.set("graph_nodes", self._graph.number_of_nodes())
+            self._stats.set("graph_edges", self._graph.number_of_edges())
+            return
+
+        with self._stats.stage("graph_generating"):
+            self._graph_creator = GraphCreator(self._graph_backend)
+            self._graph_creator.build_graph(self._dep_dict, self._get_edge_names())
+            self._graph = self._graph_creator.get_graph()
+            self._analytics = None
+
+        self._stats.set("graph_nodes", self._graph.number_of_nodes())
+        self._stats.set("graph_edges", self._graph.number_of_edges())
+
+    def update(
+        self,
+        changed_paths: Iterable[Union[str, Path]],
+        removed_paths: Iterable[Union[str, Path]] = (),
+    ) -> None:
+        """
+        Применяет изменения файлов к уже найденным зависимостям и графу.
+
+        Args:
+            changed_paths (Iterable[Union[str, Path]]): новые или изменённые файлы.
+            removed_paths (Iterable[Union[str, Path]]): удалённые файлы.
+        """
+        self._check_in_memory("update()")
+
+        if self._dep_finder is None:
+            raise ValueError(
+                "dependencies not found yet. use 'Depgraph.start_dep_finding()' first"
+            )
+
+        changed = self._to_project_paths(changed_paths)
+        removed = self._to_project_paths(removed_paths)
+        removed_modules = [path for path in removed if path in self._dep_dict]
+        before = self._dep_finder.get_counters()
+
+        with self._stats.stage("update"):
+            affected = self._dep_finder.update(changed, removed)
+
+            if self._graph is not None:
+                self._graph_creator.update_graph(
+                    self._dep_dict, affected, removed_modules, self._get_edge_names()
+                )
+                self._graph = self._graph_creator.get_graph()
+                self._analytics = None
+
+            if self._parse_cache is not None:
+                self._parse_cache.save()
+
+        self._record_counters(self._dep_finder, before)
+
+    def _record_counters(
+        self, dep_finder: PythonDepFinder, before: Optional[Dict[str, int]] = None
+    ) -> None:
+
+        self._diagnostics = dep_finder.get_diagnostics()
+
+        for counter, value in dep_finder.get_counters().items():
+            self._stats.add(counter, value - (before or {}).get(counter, 0))
+
+        if self._parse_cache is not None:
+            self._stats.set("cache_hits", self._parse_cache.hits)
+            self._stats.set("cache_misses", self._parse_cache.misses)
+
+    def get_diagnostics(self) -> Dict[Path, Diagnostic]:
+        """
+        Модули последнего прогона, которые не удалось прочитать или разобрать
+        полностью. Непрочитанные модули попадают в граф без зависимостей.
+        """
+        return dict(self._diagnostics)
+
+    def save_diagnostics_report(self, path: str) -> None:
+        """
+        Сохраняет диагностику последнего прогона в JSON: список записей
+        с путём модуля, видом проблемы, сообщением и строкой.
+        """
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        report = [
+            {"path": module.as_posix(), **diagnostic._asdict()}
+            for module, diagnostic in sorted(self._diagnostics.items())
+        ]
+        Path(path).resolve().write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    def diff_revisions(self, base: str, head: str) -> GraphDelta:
+        """
+        Сравнивает графы зависимостей проекта в двух ревизиях его
+        git-репозитория, без checkout: файлы читаются из репозитория.
+
+        Заново разбираются только файлы с другим id блоба. С кешем разбора
+        (set_cache_path) записи о блобах переиспользуются между прогонами,
+        и сравнение типичного PR почти не требует разбора.
+
+        Args:
+            base (str): исходная ревизия (ветка, тег, коммит).
+            head (str): новая ревизия.
+
+        Returns:
+            GraphDelta: добавленные и удалённые модули и рёбра, новые циклы.
+        """
+        if not isinstance(base, str) or not isinstance(head, str):
+            raise ValueError(
+                f"revisions is need to be strings but given {type(base)}, {type(head)}"
+            )
+
+        self._check_proj_path()
+
+        parse_cache = self._parse_cache
+        if parse_cache is None:
+            parse_cache = ParseCache(None, ANALYZER_VERSION)
+
+        file_finder = ListingFileFinder(
+            self._project_path,
+            exclude=self._exclude_patterns,
+            use_default_excludes=self._use_default_excludes,
+        )
+
+        with self._stats.stage("revision_diff"):
+            delta = RevisionDiff(
+                self._project_path,
+                self._create_analyzer(),
+                parse_cache,
+                file_finder,
+                self._resolution,
+                self._create_resolution_model(),
+            ).run(base, head)
+
+            if self._parse_cache is not None:
+                self._parse_cache.save()
+
+        self._stats.set("changed_modules", len(delta.changed_modules))
+        self._stats.set("cache_hits", parse_cache.hits)
+        self._stats.set("cache_misses", parse_cache.misses)
+        return delta
+
+    def write_edges(self, sink: EdgeSink) -> None:
+        """
+        Отдаёт найденные (или слитые из шардов) зависимости в sink.
+        """
+        if self._edge_store is not None:
+            self._edge_store.replay(sink)
+            return
+
+        if self._dep_dict is None:
+            raise ValueError(
+                "dependencies not found yet. use 'Depgraph.start_dep_finding()' first"
+            )
+
+        edge_names = self._get_edge_names() or {}
+
+        for importing_module, deps in self._dep_dict.items():
+            sink.add_module(importing_module)
+            names = edge_names.get(importing_module)
+            for imported_module in deps:
+                if names is None:
+                    sink.add_dependency(importing_module, imported_module)
+                else:
+                    sink.add_dependency(
+                        importing_module, imported_module, names.get(imported_module)
+                    )
+
+    def save_partial(self, path: str, prefix: Optional[str] = None) -> None:
+        """
+        Сохраняет найденные зависимости как результат шарда для merge_partials().
+
+        Шарды (репозитории или поддеревья большого репозитория) можно
+        анализировать в отдельных процессах или на разных машинах:
+        между ними передаются только эти файлы.
+
+        Args:
+            path (str): путь к файлу результата.
+            prefix (Optional[str]): путь шарда в общем графе; по умолчанию
+                            имя каталога проекта.
+        """
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        if prefix is not None and not isinstance(prefix, str):
+            raise ValueError(f"prefix is need to be a string but given {type(prefix)}")
+
+        self._check_in_memory("save_partial()")
+
+        if self._dep_finder is None:
+            raise ValueError(
+                "dependencies not found yet. use 'Depgraph.start_dep_finding()' first"
+            )
+
+        partial = PartialResult(
+            prefix=Path(prefix if prefix is not None else self._project_path.name),
+            resolution=self._resolution,
+            dep_dict=self._dep_dict,
+            edge_names=self._get_edge_names(),
+            unresolved=self._dep_finder.get_unresolved_imports(),
+        )
+        save_partial(partial, Path(path).resolve())
+
+    def merge_partials(self, paths: List[str]) -> None:
+        """
+        Сливает результаты шардов в общий dep_dict; граф затем строится
+        через start_graph_generating(). Импорты между шардами разрешаются
+        по общему индексу модулей всех шардов.
+
+        Пути модулей в общем графе - prefix шарда / путь в шарде;
+        update() для слитого графа недоступен.
+
+        Args:
+            paths (List[str]): файлы, сохранённые save_partial().
+        """
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            raise ValueError(f"paths is need to be a list of strings but given {paths}")
+
+        merger = ShardMerger()
+        self._release_spilled()
+
+        with self._stats.stage("merge"):
+            for path in paths:
+                merger.add(load_partial(Path(path).resolve()))
+            self._dep_dict, self._merged_edge_names = merger.merge()
+
+        self._dep_finder = None
+        self._graph = None
+        self._analytics = None
+        self._stats.set("shards", len(paths))
+
+    def get_analytics(self) -> GraphAnalytics:
+        """
+        Аналитика построенного графа: циклы импортов, слои, fan-in/fan-out
+        и транзитивное влияние изменений. Строится один раз и переиспользуется
+        до следующего изменения графа.
+        """
+        if self._graph is None:
+            raise ValueError(
+                "graph not generated yet. use 'Depgraph.start_graph_generating()' first"
+            )
+
+        if self._analytics is None:
+            self._analytics = GraphAnalytics(self._graph)
+        return self._analytics
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Сохраняет построенный граф в бинарный снимок, который потом
+        открывается через Depgraph.load_snapshot() без повторного анализа.
+        """
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        if self._graph is None:
+            raise ValueError(
+                "graph not generated yet. use 'Depgraph.start_graph_generating()' first"
+            )
+
+        save_snapshot(self._graph, Path(path).resolve())
+
+    @staticmethod
+    def load_snapshot(path: str) -> GraphSnapshot:
+        """
+        Открывает снимок графа через mmap; массивы не копируются в память.
+        Снимок стоит закрыть через close() или использовать как контекстный менеджер.
+        """
+        if not isinstance(path, str):
+            raise ValueError(f"path is need to be a string but given {type(path)}")
+
+        return GraphSnapshot(Path(path).resolve())
+
+    def get_dependencies(self, module: Union[str, Path]) -> List[Path]:
+        """
+        Прямые зависимости модуля внутри проекта.
+        """
+        self._check_in_memory("get_dependencies()")
+
+        if self._dep_dict is None:
+            raise ValueError(
+                "dependencies not found yet. use 'Depgraph.start_dep_finding()' first"
+            )
+
+        return list(self._dep_dict[self._to_project_paths([module])[0]])
+
+    def get_dependents(self, module: Union[str, Path]) -> List[Path]:
+        """
+        Модули, напрямую импортирующие module. Импорты пакета в графе ведут
+        в ноду каталога, поэтому для __init__.py учитываются и они.
+        """
+        if self._graph is None:
+            raise ValueError(
+                "graph not generated yet. use 'Depgraph.start_graph_generating()' first"
+            )
+
+        module = self._to_project_paths([module])[0]
+        nodes = [module]
+        if module.name == "__init__.py":
+            nodes.append(module.parent)
+
+        nodes = [node for node in nodes if node in self._graph]
+        if not nodes:
+            raise KeyError(f"module {str(module)} is not in the graph")
+
+        dependents = set()
+        for node in nodes:
+            dependents.update(self._graph.predecessors(node))
+        return sorted(dependents)
+
+    def is_excluded(self, path: Union[str, Path], is_dir: bool = False) -> bool:
+        """
+        Проверяет, исключён ли путь проекта шаблонами, .gitignore или
+        исключениями по умолчанию (по данным последнего обхода файлов).
+        """
+        if self._file_finder is None:
+            self._check_proj_path()
+            self._file_finder = self._create_file_finder()
+            self._file_finder.find_all()
+
+        return self._file_finder.is_excluded(self._to_project_paths([path])[0], is_dir)
+
+    def find_cycles(self) -> List[List[Path]]:
+        return self.get_analytics().cycles()
+
+    def get_impacted_modules(self, module: Union[str, Path]) -> List[Path]:
+        """
+        Модули, транзитивно зависящие от module (путь относительно корня проекта).
+        """
+        return self.get_analytics().impacted_by(self._to_project_paths([module])[0])
+
+    def _to_project_paths(self, paths: Iterable[Union[str, Path]]) -> List[Path]:
+
+        result = []
+        for path in paths:
+            path = Path(path)
+            if path.is_absolute():
+                path = path.relative_to(self._project_path)
+            result.append(path)
+        return result
 
     def _prepare_for_start(self) -> None:
 
+        self._release_spilled()
         self._prepare_data()
-        self._analyzer = PythonImportsAnalyzer(self._project_path)
-        self._graph_creator = GraphCreator()
+        self._merged_edge_names = None
+        self._analyzer = self._create_analyzer()
         self._dep_finder = PythonDepFinder(
             dir_path=self._project_path,
             project_roots=self._project_roots,
             dep_dict=self._dep_dict,
             modules=self._all_modules,
             analyser=self._analyzer,
+            workers=self._workers,
+            parse_cache=self._parse_cache,
+            file_finder=self._file_finder,
+            executor=self._executor,
+            read_threads=self._read_threads,
+            resolution=self._resolution,
+            resolution_model=self._create_resolution_model(),
         )
 
-    def _prepare_data(self) -> None:
+    def _create_resolution_model(self) -> Optional[ResolutionModel]:
+        """
+        Модель путей импорта для прогона или None для модели корневых пакетов.
+        pyproject.toml перечитывается на каждый прогон.
+        """
+        if not (self._source_roots or self._namespace_packages or self._use_pyproject):
+            return None
+
+        source_roots = list(self._source_roots)
+        packages: List[Tuple[str, Path]] = []
+        if self._use_pyproject:
+            pyproject_roots, packages = read_pyproject_layout(self._project_path)
+            source_roots.extend(
+                root for root in pyproject_roots if root not in source_roots
+            )
+
+        model = ResolutionModel(
+            source_roots=tuple(source_roots or [Path(".")]),
+            packages=tuple(packages),
+            namespace_packages=self._namespace_packages,
+        )
+        logger.info(f"Resolving imports with {model}")
+        return model
+
+    def _create_analyzer(self) -> PythonImportsAnalyzer:
+
+        return PythonImportsAnalyzer(
+            self._project_path,
+            self._analyzer_engine,
+            self._resilient,
+            symbols=self._resolution == "symbol",
+        )
+
+    def _get_edge_names(self) -> Optional[Dict[Path, Dict[Path, List[str]]]]:
+
+        if self._dep_finder is None:
+            return self._merged_edge_names
+        if self._resolution != "symbol":
+            return None
+        return self._dep_finder.get_edge_names()
+
+    def _create_file_finder(self) -> PythonFileFinder:
+
+        return PythonFileFinder(
+            self._project_path,
+            exclude=self._exclude_patterns,
+            use_gitignore=self._use_gitignore,
+            use_default_excludes=self._use_default_excludes,
+        )
+
+    def _check_proj_path(self) -> None:
 
         if not self._project_path:
             raise ValueError(
                 "project path not specified. use 'Depgraph.set_proj_path()' to set it"
             )
 
+    def _check_in_memory(self, action: str) -> None:
+
+        if self._edge_store is not None:
+            raise ValueError(
+                f"{action} needs dependencies in memory. use "
+                "'Depgraph.set_memory_budget(None)' and find dependencies again"
+            )
+
+    def _open_spilled_snapshot(self, store: EdgeStore) -> GraphSnapshot:
+
+        if isinstance(self._graph, GraphSnapshot):
+            self._graph.close()
+        self._remove_spilled_snapshot()
+
+        fd, name = tempfile.mkstemp(
+            prefix="depgraph-", suffix=".snapshot", dir=self._spill_dir
+        )
+        os.close(fd)
+        self._spilled_snapshot = Path(name)
+        store.save_snapshot(self._spilled_snapshot)
+        graph = GraphSnapshot(self._spilled_snapshot)
+
+        # отображение переживает удаление файла, место освободится при close()
+        if os.name == "posix":
+            self._remove_spilled_snapshot()
+        return graph
+
+    def _remove_spilled_snapshot(self) -> None:
+
+        if self._spilled_snapshot is not None:
+            self._spilled_snapshot.unlink(missing_ok=True)
+            self._spilled_snapshot = None
+
+    def _release_spilled(self) -> None:
+
+        if self._edge_store is None:
+            return
+
+        if isinstance(self._graph, GraphSnapshot):
+            self._graph.close()
+            self._graph = None
+            self._analytics = None
+        self._remove_spilled_snapshot()
+        self._edge_store.close()
+        self._edge_store = None
+
+    def _check_save_file_path(self) -> None:
+
         if not self._save_file_path:
             raise ValueError(
                 "save file path not specified. use 'Depgraph.set_save_file_path()' to set it"
             )
 
-        self._all_modules = _find_all_python_modules(self._project_path)
-        self._project_roots = _find_project_roots(self._project_path)
+    def _prepare_data(self) -> None:
+
+        self._check_proj_path()
+
+        self._file_finder = self._create_file_finder()
+        self._all_modules = self._file_finder.find_all()
+        self._project_roots = self._file_finder.get_project_roots()
         self._dep_dict = _to_dep_dict(self._all_modules)
 
     def visualize_graph_pyvis(self):
-        visualize_graph(
-            self._graph,
-            self._save_file_path,
-        )
+        self._check_save_file_path()
+
+        if self._edge_store is not None:
+            # pyvis держит копию всего графа в памяти, в пределах бюджета её нет
+            logger.warning(
+                "pyvis needs the whole graph in memory, "
+                "rendering with the scalable renderer under the memory budget"
+            )
+            self.visualize_graph_scalable()
+            return
+
+        with self._stats.stage("visualization"):
+            visualize_graph(
+                self._graph_creator.get_networkx_graph(),
+                self._save_file_path,
+            )
+
+    def visualize_graph_scalable(
+        self, layout: str = "packages", collapse_depth: int = 1, max_nodes: int = 2000
+    ) -> None:
+        """
+        Визуализация для больших графов: статическая раскладка без физики,
+        пакеты сворачиваются в агрегированные ноды с раскрытием по двойному щелчку.
+        """
+        self._check_save_file_path()
+
+        if self._graph is None:
+            raise ValueError(
+                "graph not generated yet. use 'Depgraph.start_graph_generating()' first"
+            )
+
+        with self._stats.stage("visualization"):
+            render_scalable_html(
+                self._graph,
+                self._save_file_path,
+                layout=layout,
+                collapse_depth=collapse_depth,
+                max_nodes=max_nodes,
+            )
 
 
 if __name__ == "__main__":
+    setup_logger()
     dg = Depgraph()
 
     dg.set_proj_path(r"/home/hajemet/Рабочий стол/py/dependency-graph-builder")
@@ -0,0 +1,195 @@
+import cProfile
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+__all__ = ["PipelineStats", "StageTiming", "cprofile_profiler", "ProfilerFactory"]
+logger = logging.getLogger(__name__)
+
+# фабрика профилировщика: по имени этапа возвращает контекстный менеджер,
+# внутри которого этап выполняется (cProfile, pyinstrument и т.п.)
+ProfilerFactory = Callable[[str], ContextManager]
+
+# этапы, на которых разбираются файлы: по ним считаются files/s и imports/s
+_ANALYSIS_STAGES = ("dep_finding", "streaming", "update")
+
+
+class StageTiming(NamedTuple):
+    wall: float
+    cpu: float
+    calls: int
+    # пиковый RSS процесса к концу этапа: по нему видно, какой этап поднял пик
+    peak_rss: Optional[int] = None
+
+
+def _cpu_time() -> float:
+    # вместе с процессами-воркерами пула, когда они уже завершены
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _peak_rss(who: int) -> Optional[int]:
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux отдаёт килобайты, macOS - байты
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cprofile_profiler(output_file: Path) -> ProfilerFactory:
+    """
+    Профилировщик для PipelineStats: все этапы выполняются под одним
+    cProfile.Profile, статистика сохраняется в output_file (формат pstats)
+    после каждого этапа.
+
+    Args:
+        output_file (Path): файл для pstats / snakeviz.
+
+    Returns:
+        ProfilerFactory: фабрика контекстных менеджеров для этапов.
+    """
+    profile = cProfile.Profile()
+
+    @contextmanager
+    def run_stage(stage: str) -> Iterator[None]:
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(str(output_file))
+            logger.debug(f"profile of stage {stage} saved to {str(output_file)}")
+
+    return run_stage
+
+
+class PipelineStats:
+    """
+    Статистика прогона: время каждого этапа (wall и CPU), счётчики
+    (файлы, импорты, рёбра, попадания в кеш), производные скорости
+    и пиковое потребление памяти.
+    """
+
+    def __init__(self, profiler: Optional[ProfilerFactory] = None):
+        self._profiler = profiler
+        self._stages: Dict[str, StageTiming] = {}
+        self._counters: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Замеряет этап; повторные вызовы одного этапа суммируются.
+        """
+        profiler = self._profiler(name) if self._profiler else nullcontext()
+
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+        try:
+            with profiler:
+                yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_time() - cpu_start
+            peak_rss = _peak_rss(resource.RUSAGE_SELF) if resource else None
+
+            previous = self._stages.get(name, StageTiming(0.0, 0.0, 0))
+            self._stages[name] = StageTiming(
+                previous.wall + wall,
+                previous.cpu + cpu,
+                previous.calls + 1,
+                peak_rss,
+            )
+            logger.info(
+                f"stage {name} took {wall:.3f}s wall, {cpu:.3f}s cpu"
+                + ("" if peak_rss is None else f", peak rss {peak_rss / 2**20:.1f} MB")
+            )
+
+    def set_profiler(self, profiler: Optional[ProfilerFactory]) -> None:
+        self._profiler = profiler
+
+    def add(self, counter: str, value: int) -> None:
+        self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def set(self, counter: str, value: int) -> None:
+        self._counters[counter] = value
+
+    def get_stages(self) -> Dict[str, StageTiming]:
+        return dict(self._stages)
+
+    def get_counters(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    def to_dict(self) -> Dict:
+        """
+        Returns:
+            Dict: отчёт, пригодный для json.dump.
+        """
+        analysis_wall = sum(
+            self._stages[stage].wall for stage in _ANALYSIS_STAGES if stage in self._stages
+        )
+        files = self._counters.get("files", 0)
+        imports = self._counters.get("imports", 0)
+        hits = self._counters.get("cache_hits", 0)
+        misses = self._counters.get("cache_misses", 0)
+
+        return {
+            "stages": {
+                name: {
+                    "wall_s": timing.wall,
+                    "cpu_s": timing.cpu,
+                    "calls": timing.calls,
+                    "peak_rss_bytes": timing.peak_rss,
+                }
+                for name, timing in self._stages.items()
+            },
+            "counters": dict(self._counters),
+            "files_per_s": files / analysis_wall if analysis_wall else None,
+            "imports_per_s": imports / analysis_wall if analysis_wall else None,
+            "cache_hit_rate": hits / (hits + misses) if hits + misses else None,
+            "peak_rss_bytes": _peak_rss(resource.RUSAGE_SELF) if resource else None,
+            "peak_rss_children_bytes": (
+                _peak_rss(resource.RUSAGE_CHILDREN) if resource else None
+            ),
+        }
+
+    def save_report(self, report_file: Path) -> None:
+        """
+        Сохраняет отчёт в JSON.
+        """
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        with report_file.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info(f"stats report saved to {str(report_file)}")
+
+    def summary(self) -> str:
+        """
+        Краткая сводка для лога или консоли.
+        """
+        report = self.to_dict()
+        lines = [
+            f"{name:<18} {timing['wall_s']:8.3f}s wall {timing['cpu_s']:8.3f}s cpu"
+            + (
+                ""
+                if timing["peak_rss_bytes"] is None
+                else f" {timing['peak_rss_bytes'] / 2**20:8.1f} MB peak"
+            )
+            for name, timing in report["stages"].items()
+        ]
+        for key in ("files_per_s", "imports_per_s", "cache_hit_rate"):
+            if report[key] is not None:
+                lines.append(f"{key:<18} {report[key]:12.2f}")
+        if report["peak_rss_bytes"] is not None:
+            lines.append(f"{'peak_rss_mb':<18} {report['peak_rss_bytes'] / 2**20:12.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from ..analyzing.python_analyzer import ImportRecord
+
+__all__ = [
+    "PartialResult",
+    "save_partial",
+    "load_partial",
+    "PARTIAL_FORMAT_VERSION",
+]
+logger = logging.getLogger(__name__)
+
+PARTIAL_FORMAT_VERSION = 1
+
+_FORMAT_NAME = "depgraph-partial"
+
+
+class PartialResult(NamedTuple):
+    """
+    Результат анализа одного шарда: репозитория или поддерева большого репозитория.
+
+    Пути модулей хранятся относительно шарда, а prefix задаёт, где шард
+    лежит в общем графе; имена пакетов при слиянии берутся из путей общего
+    графа, поэтому шард-пакет должен заканчиваться своим именем пакета
+    (как и prefix по умолчанию - имя каталога проекта). Импорты,
+    не разрешившиеся внутри шарда, разрешаются при слиянии по общему
+    индексу модулей.
+    """
+
+    # путь шарда в общем графе, например "repo-a" или "monorepo/services/billing"
+    prefix: Path
+    # режим разрешения импортов, с которым анализировался шард
+    resolution: str
+    # зависимости внутри шарда
+    dep_dict: Dict[Path, List[Path]]
+    # импортированные по рёбрам имена (только в режиме "symbol")
+    edge_names: Optional[Dict[Path, Dict[Path, List[str]]]]
+    # импорты, которые не удалось разрешить внутри шарда
+    unresolved: Dict[Path, List[ImportRecord]]
+
+
+def save_partial(partial: PartialResult, partial_file: Path) -> None:
+    """
+    Сохраняет результат шарда в JSON.
+
+    Пути пишутся один раз в таблицу, рёбра и импорты ссылаются на них
+    по номерам: первые "modules" путей - проанализированные модули,
+    остальные встречаются только как цели рёбер.
+
+    Args:
+        partial (PartialResult): результат шарда.
+        partial_file (Path): путь к файлу.
+    """
+    paths = list(partial.dep_dict)
+    ids = {module: i for i, module in enumerate(paths)}
+
+    deps = []
+    names = []
+    for module, imported_modules in partial.dep_dict.items():
+        targets = []
+        for imported_module in imported_modules:
+            if imported_module not in ids:
+                ids[imported_module] = len(paths)
+                paths.append(imported_module)
+            targets.append(ids[imported_module])
+        deps.append(targets)
+
+        if partial.edge_names is not None:
+            module_names = partial.edge_names.get(module, {})
+            names.append(
+                [module_names.get(imported_module, []) for imported_module in imported_modules]
+            )
+
+    data = {
+        "format": _FORMAT_NAME,
+        "version": PARTIAL_FORMAT_VERSION,
+        "prefix": partial.prefix.as_posix(),
+        "resolution": partial.resolution,
+        "paths": [path.as_posix() for path in paths],
+        "modules": len(partial.dep_dict),
+        "deps": deps,
+        "names": names if partial.edge_names is not None else None,
+        "unresolved": [
+            [ids[module], *record]
+            for module, records in partial.unresolved.items()
+            for record in records
+        ],
+    }
+
+    with partial_file.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    logger.info(
+        f"saved partial result of {len(partial.dep_dict)} modules "
+        f"to {str(partial_file)}"
+    )
+
+
+def load_partial(partial_file: Path) -> PartialResult:
+    """
+    Загружает результат шарда, сохранённый save_partial().
+
+    Raises:
+        ValueError: файл не является результатом шарда или записан
+                        в другой версии формата.
+    """
+    try:
+        with partial_file.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError:
+        raise ValueError(f"{str(partial_file)} is not a partial result") from None
+
+    if not isinstance(data, dict) or data.get("format") != _FORMAT_NAME:
+        raise ValueError(f"{str(partial_file)} is not a partial result")
+
+    if data.get("version") != PARTIAL_FORMAT_VERSION:
+        raise ValueError(
+            f"partial result {str(partial_file)} has format version "
+            f"{data.get('version')}, expected {PARTIAL_FORMAT_VERSION}"
+        )
+
+    paths = [Path(path) for path in data["paths"]]
+    modules = paths[: data["modules"]]
+    names = data["names"]
+
+    dep_dict: Dict[Path, List[Path]] = {}
+    edge_names: Optional[Dict[Path, Dict[Path, List[str]]]] = (
+        {} if names is not None else None
+    )
+
+    for i, module in enumerate(modules):
+        targets = [paths[j] for j in data["deps"][i]]
+        dep_dict[module] = targets
+        if edge_names is not None:
+            edge_names[module] = dict(zip(targets, names[i]))
+
+    unresolved: Dict[Path, List[ImportRecord]] = {}
+    for i, *record in data["unresolved"]:
+        unresolved.setdefault(paths[i], []).append(ImportRecord(*record))
+
+    return PartialResult(
+        prefix=Path(data["prefix"]),
+        resolution=data["resolution"],
+        dep_dict=dep_dict,
+        edge_names=edge_names,
+        unresolved=unresolved,
+    )
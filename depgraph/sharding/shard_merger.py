@@ -0,0 +1,256 @@
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..analyzing.python_analyzer import ImportRecord
+from ..dep_finding.module_index import ModuleIndex, ModuleKey, module_key
+from .partial_result import PartialResult
+
+__all__ = ["ShardMerger"]
+logger = logging.getLogger(__name__)
+
+EdgeNames = Dict[Path, Dict[Path, List[str]]]
+
+
+class ShardMerger:
+    """
+    Сливает результаты шардов в один граф зависимостей.
+
+    Модуль шарда попадает в общий граф по пути prefix/module. Импорты,
+    которые не разрешились внутри шарда, разрешаются по общему индексу:
+    абсолютные - по пространству имён пакетов всех шардов (pkg.sub -> модуль,
+    где бы ни лежал pkg), относительные - по путям общего графа. Пакеты
+    определяются по общему графу, поэтому поддерево большого репозитория
+    получает полные имена (pkg.sub, а не sub). Внутри шарда добавляются
+    только рёбра, которые шард найти не мог: импорты по полному имени,
+    чей верхний пакет лежит выше шарда, и __init__.py в подпакеты из
+    других шардов; остальные рёбра шарда остаются как есть.
+
+    Каждый модуль, каталог, ребро и неразрешённый импорт обрабатываются
+    один раз словарными поисками: слияние линейно по общему числу рёбер.
+
+    В режиме "symbol" имена прослеживаются только внутри шарда: таблиц
+    имён в результатах нет, и ребро в другой шард ведёт в подмодуль x.name,
+    если он есть (как при анализе целиком), иначе в импортируемый модуль.
+    """
+
+    def __init__(self) -> None:
+        self._partials: List[PartialResult] = []
+        self._resolution: Optional[str] = None
+
+    def add(self, partial: PartialResult) -> None:
+
+        if self._resolution is None:
+            self._resolution = partial.resolution
+        elif partial.resolution != self._resolution:
+            raise ValueError(
+                f"shard {partial.prefix.as_posix()} was analyzed with "
+                f"'{partial.resolution}' resolution but other shards "
+                f"with '{self._resolution}'"
+            )
+        self._partials.append(partial)
+
+    def merge(self) -> Tuple[Dict[Path, List[Path]], Optional[EdgeNames]]:
+        """
+        Returns:
+            Tuple[Dict[Path, List[Path]], Optional[EdgeNames]]: общий dep_dict
+                            и импортированные по рёбрам имена (только если
+                            шарды анализировались в режиме "symbol").
+        """
+        dep_dict: Dict[Path, List[Path]] = {}
+        edge_names: Optional[EdgeNames] = {} if self._resolution == "symbol" else None
+        module_index = ModuleIndex()
+        # шард каждого модуля: при совпадении путей побеждает первый шард
+        shard_of: Dict[Path, int] = {}
+
+        for shard, partial in enumerate(self._partials):
+            for module, deps in partial.dep_dict.items():
+                merged_module = partial.prefix / module
+                if merged_module in shard_of:
+                    logger.warning(
+                        f"module {merged_module.as_posix()} is in several shards, "
+                        "keeping the first one"
+                    )
+                    continue
+
+                dep_dict[merged_module] = [partial.prefix / dep for dep in deps]
+                module_index.add(merged_module)
+                shard_of[merged_module] = shard
+
+                if edge_names is not None and partial.edge_names is not None:
+                    edge_names[merged_module] = {
+                        partial.prefix / dep: names
+                        for dep, names in partial.edge_names.get(module, {}).items()
+                    }
+
+        namespace = self._build_namespace(shard_of)
+
+        by_symbol = self._resolution == "symbol"
+        merged_edges = 0
+        if not by_symbol:
+            merged_edges += self._link_packages(dep_dict, shard_of)
+        for shard, partial in enumerate(self._partials):
+            for module, records in partial.unresolved.items():
+                merged_module = partial.prefix / module
+                if shard_of.get(merged_module) != shard:
+                    continue
+
+                targets = dep_dict[merged_module]
+                known_targets = set(targets)
+
+                for record in records:
+                    target = self._resolve(
+                        record, merged_module, namespace, module_index, by_symbol
+                    )
+                    if target is None or (
+                        shard_of[target] == shard
+                        and not self._is_above_shard(record, target, partial.prefix)
+                    ):
+                        continue
+
+                    if target not in known_targets:
+                        known_targets.add(target)
+                        targets.append(target)
+                        merged_edges += 1
+
+                    if edge_names is not None:
+                        names = edge_names.setdefault(merged_module, {}).setdefault(
+                            target, []
+                        )
+                        if record.name not in names:
+                            names.append(record.name)
+
+        logger.info(
+            f"merged {len(self._partials)} shards: {len(dep_dict)} modules, "
+            f"{merged_edges} dependencies resolved by the combined index"
+        )
+        return dep_dict, edge_names
+
+    @staticmethod
+    def _is_above_shard(record: ImportRecord, target: Path, prefix: Path) -> bool:
+        """
+        Импорт модуля своего же шарда по полному имени, которое шард не знал:
+        верхний пакет имени лежит выше каталога шарда.
+        """
+        if record.level:
+            return False
+
+        dotted_length = len((record.module or record.name).split("."))
+        top_package_depth = len(module_key(target)) - dotted_length + 1
+        return top_package_depth < len(prefix.parts)
+
+    @staticmethod
+    def _link_packages(dep_dict: Dict[Path, List[Path]], shard_of: Dict[Path, int]) -> int:
+        """
+        Добавляет __init__.py рёбра в соседей из других шардов: пакет, из шарда
+        которого поддеревья исключены, связывается с ними, как и при анализе
+        целиком.
+
+        Returns:
+            int: число добавленных рёбер.
+        """
+        # каталог пакета -> файлы в нём и __init__.py его подпакетов
+        children: Dict[Path, List[Path]] = {}
+        for module in shard_of:
+            package = module.parent
+            if module.name == "__init__.py":
+                package = package.parent
+            children.setdefault(package, []).append(module)
+
+        added = 0
+        for module, shard in shard_of.items():
+            if module.name != "__init__.py":
+                continue
+
+            for child in children.get(module.parent, ()):
+                if child != module and shard_of[child] != shard:
+                    dep_dict[module].append(child)
+                    added += 1
+
+        return added
+
+    @staticmethod
+    def _build_namespace(shard_of: Dict[Path, int]) -> Dict[ModuleKey, Path]:
+        """
+        Полное имя модуля -> модуль. Имя строится от самого верхнего каталога
+        с __init__.py; модули вне пакетов по имени не импортируются.
+        Если модуль с тем же именем есть в нескольких шардах, побеждает первый.
+        """
+        packages: Set[Path] = {
+            module.parent for module in shard_of if module.name == "__init__.py"
+        }
+        # каталог-пакет -> его полное имя; каждый каталог считается один раз
+        package_names: Dict[Path, ModuleKey] = {}
+
+        def package_name(directory: Path) -> Optional[ModuleKey]:
+
+            chain = []
+            while (
+                directory in packages
+                and directory not in package_names
+                and directory.parent != directory
+            ):
+                chain.append(directory)
+                directory = directory.parent
+
+            name = package_names.get(directory, ())
+            for package in reversed(chain):
+                name = name + (package.name,)
+                package_names[package] = name
+
+            return name or None
+
+        namespace: Dict[ModuleKey, Path] = {}
+        conflicts: Set[str] = set()
+
+        for module in shard_of:
+            name = package_name(module.parent)
+            if name is None:
+                continue
+
+            if module.name != "__init__.py":
+                name = name + (module.stem,)
+
+            known = namespace.setdefault(name, module)
+            if shard_of[known] != shard_of[module]:
+                conflicts.add(name[0])
+
+        for package in sorted(conflicts):
+            logger.warning(
+                f"package '{package}' is defined in several shards, "
+                "imports resolve to the first one"
+            )
+
+        return namespace
+
+    @staticmethod
+    def _resolve(
+        record: ImportRecord,
+        merged_module: Path,
+        namespace: Dict[ModuleKey, Path],
+        module_index: ModuleIndex,
+        by_symbol: bool,
+    ) -> Optional[Path]:
+        """
+        Разрешает импорт так же, как PythonDepFinder, но по общему индексу.
+        В режиме "symbol" "from x import name" сначала ищется как подмодуль x.name.
+        """
+        module, name, _, level = record
+        parts = tuple((module or name).split("."))
+
+        base_parts: ModuleKey = ()
+        if level:
+            base_parts = merged_module.parts[:-1]
+            if level > 1:
+                base_parts = base_parts[: max(0, len(base_parts) - (level - 1))]
+
+        def lookup(key: ModuleKey) -> Optional[Path]:
+            if level == 0:
+                return namespace.get(key)
+            return module_index.lookup(base_parts + key)
+
+        if by_symbol and module and name != "*":
+            submodule = lookup(parts + (name,))
+            if submodule is not None:
+                return submodule
+        return lookup(parts)
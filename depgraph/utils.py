@@ -1,15 +1,27 @@
 import logging
+import os
 import types
 from pathlib import Path
-from typing import Any, Dict, List, Set, Union, get_args, get_origin
-
-import networkx as nx
-from pyvis.network import Network
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+    get_args,
+    get_origin,
+)
+
+# networkx и pyvis (а через него jinja2) импортируются только при визуализации
+if TYPE_CHECKING:
+    import networkx as nx
 
 logger = logging.getLogger(__name__)
 
 
-__all__ = ["_validate_structure", "_find_all_python_modules"]
+__all__ = ["_validate_structure"]
 
 
 def _validate_structure(data: Dict, template_types: Any, path: str = "") -> None:
@@ -60,27 +72,6 @@ def _validate_structure(data: Dict, template_types: Any, path: str = "") -> None
             )
 
 
-def _find_all_python_modules(dir_path: Path) -> List[Path]:
-
-    if not dir_path.exists():
-        raise FileExistsError(f"specified path {str(dir_path)} does not exist")
-
-    if not dir_path.is_dir():
-        raise FileExistsError(f"specified path {str(dir_path)} is not a directory")
-
-    logger.debug(f"start searching python modules in {str(dir_path)}")
-
-    modules = list(dir_path.glob("**/*.py"))
-
-    for i in range(len(modules)):
-        modules[i] = modules[i].relative_to(dir_path)
-        logger.debug(f"Found Python module in {str(modules[i])}")
-    else:
-        logger.info(f"founded {len(modules)} modules in {str(dir_path)}")
-
-    return modules
-
-
 def _find_project_roots(project_root: Path) -> Set[Path]:
     """
     Находит только корневые пакеты в проекте.
@@ -106,13 +97,18 @@ def _find_project_roots(project_root: Path) -> Set[Path]:
     return roots
 
 
-def unique_paths(paths: List[Path]) -> List[Path]:
+def unique_paths(paths: List[Path], root: Optional[Path] = None) -> List[Path]:
     """
     Убирает дубликаты из списка относительных путей.
     Возвращает их в нормализованном виде (без ./ и ../).
 
+    Нормализация чисто лексическая: ни обращений к файловой системе,
+    ни зависимости от текущего рабочего каталога.
+
     Args:
         paths (List[Path]): список относительных путей
+        root (Optional[Path]): корень проекта; абсолютные пути внутри него
+                            приводятся к относительным
 
     Returns:
         List[Path]: список уникальных относительных путей
@@ -120,15 +116,25 @@ def unique_paths(paths: List[Path]) -> List[Path]:
     seen = set()
     unique = []
     for p in paths:
-        # Нормализуем путь (убираем ./, ../)
-        norm = Path(p).resolve().relative_to(Path.cwd())
-        if norm not in seen:
-            seen.add(norm)
-            unique.append(norm)
+        if root is not None and p.is_absolute():
+            p = _relative_to_root(p, root)
+        if ".." in p.parts:
+            p = Path(os.path.normpath(p))
+        if p not in seen:
+            seen.add(p)
+            unique.append(p)
     return unique
 
 
-def visualize_graph(graph: nx.DiGraph, output_file: Path = Path("graph.html")) -> None:
+def _relative_to_root(path: Path, root: Path) -> Path:
+
+    try:
+        return path.relative_to(root)
+    except ValueError:
+        return path
+
+
+def visualize_graph(graph: "nx.DiGraph", output_file: Path = Path("graph.html")) -> None:
     """
     Визуализирует directed graph с PyVis, используя label нод.
 
@@ -139,6 +145,8 @@ def visualize_graph(graph: nx.DiGraph, output_file: Path = Path("graph.html")) -
     if not isinstance(output_file, Path):
         raise TypeError(f"output_file must be a pathlib.Path, got {type(output_file)}")
 
+    from pyvis.network import Network
+
     # Создаём сеть PyVis, отключаем notebook режим
     net = Network(
         directed=True,
@@ -172,39 +180,35 @@ def _to_dep_dict(modules: List) -> Dict[Path, List]:
     return dep_dict
 
 
-def _get_sibling_python_files(file_path: Path) -> List[Path]:
-    
-    siblings = []
-    root = file_path.parts[0]
-    parent_folder = file_path.parent.resolve()
-
-    for path in parent_folder.iterdir():
-
-        if path.is_dir() and (path / "__init__.py").exists():
-            sib_path = path / "__init__.py"
+def _get_sibling_python_files(file_path: Path, root_folder: Path) -> List[Path]:
+    """
+    Находит соседей __init__.py напрямую в файловой системе: файлы каталога
+    пакета и __init__.py его подпакетов.
 
-            siblings.append(path / "__init__.py")
-            continue
+    Args:
+        file_path (Path): путь к __init__.py относительно root_folder.
+        root_folder (Path): корень проекта.
 
-        if path.is_file() and path.name != "__init__.py":
-            siblings.append(path)
+    Returns:
+        List[Path]: пути соседей относительно root_folder.
+    """
+    siblings = []
+    package = file_path.parent
+
+    try:
+        with os.scandir(root_folder / package) as it:
+            entries = list(it)
+    except OSError as e:
+        logger.warning(f"could not list package {str(package)}: {e}")
+        return siblings
+
+    for entry in entries:
+        if entry.is_dir():
+            if os.path.exists(os.path.join(entry.path, "__init__.py")):
+                siblings.append(package / entry.name / "__init__.py")
             continue
 
-    relative_paths = []
-
-    for p in siblings:
-        try:
-            # ищем 'depgraph' в пути
-            depgraph_index = p.parts.index(root)
-            # строим относительный путь начиная с 'depgraph'
-            rel = Path(*p.parts[depgraph_index:])
-            relative_paths.append(rel)
-        except ValueError:
-            # 'depgraph' нет в этом пути
-            pass
-
-    return relative_paths
-
-
+        if entry.is_file() and entry.name != "__init__.py":
+            siblings.append(package / entry.name)
 
-    
\ No newline at end of file
+    return siblings
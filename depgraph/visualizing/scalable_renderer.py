@@ -0,0 +1,341 @@
+import json
+import logging
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, TextIO, Tuple, Union
+
+from ..graph_analytics.graph_analytics import GraphAnalytics
+from ..graph_building.compact_graph import CompactGraph
+from ..graph_building.graph_snapshot import GraphSnapshot
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__all__ = ["render_scalable_html", "LAYOUTS"]
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ("packages", "grid", "circular", "layered")
+
+# расстояние между соседними нодами в координатах vis-network
+_SPACING = 140
+
+VIS_NETWORK_URL = (
+    "https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js"
+)
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<script src="__VIS_URL__"></script>
+<style>
+  html, body { margin: 0; height: 100%; font-family: sans-serif; }
+  #graph { width: 100%; height: 100%; }
+  #info { position: absolute; top: 8px; left: 8px; padding: 4px 8px;
+          background: rgba(255, 255, 255, 0.85); font-size: 13px; }
+</style>
+</head>
+<body>
+<div id="info"></div>
+<div id="graph"></div>
+<script>
+const DATA = __DATA__;
+const expanded = new Set(DATA.expanded);
+
+// нода видна сама, если её пакет раскрыт, иначе вместо неё виден пакет
+function visibleId(nodeId) {
+  const group = DATA.nodes[nodeId][3];
+  return expanded.has(group) ? nodeId : "g" + group;
+}
+
+function buildNodes() {
+  const nodes = [];
+  DATA.groups.forEach(function (group, index) {
+    if (expanded.has(index)) {
+      return;
+    }
+    nodes.push({id: "g" + index, label: group[0] + " (" + group[1] + ")",
+                x: group[2], y: group[3], shape: "box", group: index,
+                value: group[1]});
+  });
+  DATA.nodes.forEach(function (node, index) {
+    if (expanded.has(node[3])) {
+      nodes.push({id: index, label: node[0], x: node[1], y: node[2],
+                  group: node[3]});
+    }
+  });
+  return nodes;
+}
+
+function buildEdges() {
+  const counts = new Map();
+  for (let i = 0; i < DATA.edges.length; i += 2) {
+    const from = visibleId(DATA.edges[i]);
+    const to = visibleId(DATA.edges[i + 1]);
+    if (from === to) {
+      continue;
+    }
+    const key = from + ">" + to;
+    const edge = counts.get(key);
+    if (edge) {
+      edge.value += 1;
+    } else {
+      counts.set(key, {id: key, from: from, to: to, value: 1});
+    }
+  }
+  return Array.from(counts.values());
+}
+
+const nodes = new vis.DataSet();
+const edges = new vis.DataSet();
+const network = new vis.Network(
+  document.getElementById("graph"),
+  {nodes: nodes, edges: edges},
+  {
+    physics: false,
+    layout: {improvedLayout: false},
+    interaction: {hideEdgesOnDrag: DATA.light, tooltipDelay: 200},
+    edges: {arrows: DATA.light ? "" : "to", smooth: false,
+            scaling: {min: 1, max: 8}},
+    nodes: {shape: "dot", size: 10, scaling: {min: 10, max: 40}}
+  }
+);
+
+function refresh() {
+  nodes.clear();
+  edges.clear();
+  nodes.add(buildNodes());
+  edges.add(buildEdges());
+  document.getElementById("info").textContent =
+    DATA.nodes.length + " modules, " + (DATA.edges.length / 2) + " edges; " +
+    "double click a package to expand it, a module to collapse its package";
+}
+
+network.on("doubleClick", function (params) {
+  if (!params.nodes.length) {
+    return;
+  }
+  const id = params.nodes[0];
+  if (typeof id === "string") {
+    expanded.add(Number(id.slice(1)));
+  } else {
+    expanded.delete(DATA.nodes[id][3]);
+  }
+  refresh();
+});
+
+refresh();
+</script>
+</body>
+</html>
+"""
+
+
+def _node_group(node: Path, depth: int) -> str:
+    """
+    Пакет ноды: каталог модуля (или сам каталог-пакет), обрезанный до depth частей.
+    """
+    parts = node.parts if node.suffix == "" else node.parts[:-1]
+    return "/".join(parts[:depth]) or "."
+
+
+def _grid_positions(count: int, origin: Tuple[float, float]) -> List[Tuple[float, float]]:
+
+    side = max(1, math.ceil(math.sqrt(count)))
+    x0, y0 = origin
+    return [
+        (x0 + (i % side) * _SPACING, y0 + (i // side) * _SPACING) for i in range(count)
+    ]
+
+
+def _circular_positions(count: int) -> List[Tuple[float, float]]:
+
+    radius = max(_SPACING, count * _SPACING / (2 * math.pi))
+    return [
+        (
+            radius * math.cos(2 * math.pi * i / count),
+            radius * math.sin(2 * math.pi * i / count),
+        )
+        for i in range(count)
+    ]
+
+
+def _layered_positions(node_layers: List[int]) -> List[Tuple[float, float]]:
+    """
+    Слои зависимостей снизу вверх: модули без зависимостей внизу,
+    каждый слой - горизонтальный ряд, отцентрированный по оси x.
+    """
+    widths: Dict[int, int] = {}
+    for layer in node_layers:
+        widths[layer] = widths.get(layer, 0) + 1
+
+    placed: Dict[int, int] = {}
+    positions = []
+    for layer in node_layers:
+        column = placed.get(layer, 0)
+        placed[layer] = column + 1
+        positions.append(
+            ((column - (widths[layer] - 1) / 2) * _SPACING, -layer * _SPACING * 2)
+        )
+    return positions
+
+
+def _layout(
+    layout: str,
+    node_groups: List[int],
+    group_count: int,
+    graph: Union[CompactGraph, GraphSnapshot],
+) -> List[Tuple[float, float]]:
+    """
+    Статическая раскладка: координаты считаются здесь, физика в браузере не нужна.
+    """
+    if not node_groups:
+        return []
+
+    if layout == "layered":
+        return _layered_positions(GraphAnalytics(graph).node_layers())
+
+    if layout == "grid":
+        return _grid_positions(len(node_groups), (0, 0))
+
+    if layout == "circular":
+        return _circular_positions(len(node_groups))
+
+    # packages: каждый пакет - квадратный блок, блоки уложены сеткой
+    members: List[List[int]] = [[] for _ in range(group_count)]
+    for node_id, group in enumerate(node_groups):
+        members[group].append(node_id)
+
+    block = max(math.ceil(math.sqrt(len(ids))) for ids in members) + 1
+    blocks = _grid_positions(group_count, (0, 0))
+    positions: List[Tuple[float, float]] = [(0.0, 0.0)] * len(node_groups)
+
+    for group, ids in enumerate(members):
+        bx, by = blocks[group]
+        origin = (bx * block, by * block)
+        for node_id, position in zip(ids, _grid_positions(len(ids), origin)):
+            positions[node_id] = position
+
+    return positions
+
+
+def _json(value: object) -> str:
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
+
+def _write_data(
+    f: TextIO,
+    graph: Union[CompactGraph, GraphSnapshot],
+    positions: List[Tuple[float, float]],
+    node_groups: List[int],
+    groups: List[list],
+    expanded: List[int],
+    light: bool,
+) -> None:
+    """
+    Пишет JSON с нодами и рёбрами по частям, не собирая его целиком в памяти.
+    """
+    f.write('{"nodes":[')
+    for node_id, ((x, y), group) in enumerate(zip(positions, node_groups)):
+        if node_id:
+            f.write(",")
+        f.write(_json([graph.label(node_id), round(x), round(y), group]))
+
+    f.write('],"edges":[')
+    first = True
+    for source in range(graph.number_of_nodes()):
+        targets = graph.successor_ids(source)
+        if not len(targets):
+            continue
+        f.write(("" if first else ",") + ",".join(f"{source},{t}" for t in targets))
+        first = False
+
+    f.write(
+        f'],"groups":{_json(groups)},"expanded":{_json(expanded)},'
+        f'"light":{_json(light)}}}'
+    )
+
+
+def render_scalable_html(
+    graph: Union["nx.DiGraph", CompactGraph, GraphSnapshot],
+    output_file: Path,
+    layout: str = "packages",
+    collapse_depth: int = 1,
+    max_nodes: int = 2000,
+) -> bool:
+    """
+    Визуализирует большой граф одним HTML-файлом без физики в браузере.
+
+    Ноды и рёбра выгружаются одним JSON-массивом, координаты считаются
+    заранее. Ноды группируются по пакетам (первые collapse_depth
+    частей пути); пакет отображается одной агрегированной нодой и
+    раскрывается двойным щелчком. Если нод больше max_nodes, граф
+    открывается со свёрнутыми пакетами и облегчённой отрисовкой рёбер.
+
+    JSON пишется в файл по частям прямо из CSR графа, поэтому снимок
+    (GraphSnapshot) визуализируется без копии графа в памяти.
+
+    Args:
+        graph (Union[nx.DiGraph, CompactGraph, GraphSnapshot]): Граф для визуализации.
+        output_file (Path): Путь к HTML-файлу для вывода.
+        layout (str): раскладка: "packages", "grid", "circular" или
+                        "layered" (топологические слои зависимостей).
+        collapse_depth (int): глубина пакетов для агрегации.
+        max_nodes (int): порог, после которого включается облегчённый режим.
+
+    Returns:
+        bool: True, если был включён облегчённый режим.
+    """
+    if not isinstance(output_file, Path):
+        raise TypeError(f"output_file must be a pathlib.Path, got {type(output_file)}")
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}, got '{layout}'")
+
+    if collapse_depth < 1:
+        raise ValueError(f"collapse_depth must be positive, got {collapse_depth}")
+
+    if not isinstance(graph, (CompactGraph, GraphSnapshot)):
+        graph = CompactGraph.from_networkx(graph)
+
+    node_count = graph.number_of_nodes()
+    node_groups: List[int] = []
+    group_ids: Dict[str, int] = {}
+
+    for node_id in range(node_count):
+        group = _node_group(Path(graph.node_name(node_id)), collapse_depth)
+        node_groups.append(group_ids.setdefault(group, len(group_ids)))
+
+    positions = _layout(layout, node_groups, len(group_ids), graph)
+
+    # агрегированная нода пакета стоит в центре масс своих модулей
+    sums = [[0.0, 0.0, 0] for _ in group_ids]
+    for (x, y), group in zip(positions, node_groups):
+        sums[group][0] += x
+        sums[group][1] += y
+        sums[group][2] += 1
+
+    groups = [
+        [name, count, round(sx / count), round(sy / count)]
+        for name, (sx, sy, count) in zip(group_ids, sums)
+    ]
+
+    light = node_count > max_nodes
+    expanded = [] if light else list(range(len(groups)))
+
+    head, tail = (
+        _HTML_TEMPLATE.replace("__TITLE__", output_file.stem)
+        .replace("__VIS_URL__", VIS_NETWORK_URL)
+        .split("__DATA__")
+    )
+    with output_file.open("w", encoding="utf-8") as f:
+        f.write(head)
+        _write_data(f, graph, positions, node_groups, groups, expanded, light)
+        f.write(tail)
+
+    logger.info(
+        f"Graph with {node_count} nodes and {graph.number_of_edges()} edges "
+        f"saved to {output_file}" + (" (collapsed by packages)" if light else "")
+    )
+    return light
@@ -0,0 +1,246 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple, Union
+
+__all__ = ["InotifyWatcher", "PollingWatcher", "create_watcher"]
+logger = logging.getLogger(__name__)
+
+# путь относительно корня -> True, если это каталог
+ExcludeCheck = Callable[[Path, bool], bool]
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+)
+
+_EVENT = struct.Struct("iIII")
+
+
+def _walk_dirs(
+    root: Path, is_excluded: ExcludeCheck, start: Path = Path()
+) -> Iterator[Path]:
+    """
+    Каталоги под root/start (пути относительно root), кроме исключённых.
+    """
+    stack = [start]
+    while stack:
+        rel = stack.pop()
+        yield rel
+        try:
+            with os.scandir(root / rel) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        child = rel / entry.name
+                        if not is_excluded(child, True):
+                            stack.append(child)
+        except OSError as e:
+            logger.debug(f"cannot list {str(root / rel)}: {e}")
+
+
+class InotifyWatcher:
+    """
+    Наблюдение за деревом проекта через inotify (Linux), без сторонних пакетов.
+
+    На каждый неисключённый каталог ставится отдельный watch; новые
+    каталоги подхватываются по событию IN_CREATE. wait() возвращает
+    затронутые пути, пачкой: после первого события ждёт, пока поток событий
+    не затихнет на settle секунд (но не дольше max_delay).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        is_excluded: ExcludeCheck,
+        settle: float = 0.05,
+        max_delay: float = 1.0,
+    ):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is available only on Linux")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._root = root
+        self._is_excluded = is_excluded
+        self._settle = settle
+        self._max_delay = max_delay
+        self._watches: Dict[int, Path] = {}
+
+        for rel in _walk_dirs(root, is_excluded):
+            self._add_watch(rel)
+        logger.info(f"watching {len(self._watches)} directories with inotify")
+
+    def _add_watch(self, rel: Path) -> None:
+
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(self._root / rel), _WATCH_MASK
+        )
+        if wd < 0:
+            # каталог мог исчезнуть между событием и добавлением
+            logger.debug(f"cannot watch {str(rel)}: errno {ctypes.get_errno()}")
+            return
+        self._watches[wd] = rel
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[Path]]:
+        """
+        Ждёт изменений не дольше timeout секунд.
+
+        Returns:
+            Optional[Set[Path]]: затронутые пути (файлы и каталоги) относительно
+                            корня, пустое множество по таймауту или None, если
+                            очередь событий переполнилась и нужен полный пересчёт.
+        """
+        touched: Set[Path] = set()
+
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return touched
+
+        deadline = time.monotonic() + self._max_delay
+        while True:
+            if self._read_events(touched):
+                return None
+
+            remaining = min(self._settle, deadline - time.monotonic())
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                return touched
+
+    def _read_events(self, touched: Set[Path]) -> bool:
+
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return False
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, full rescan is needed")
+                return True
+
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = directory / name
+            if mask & _IN_ISDIR:
+                if self._is_excluded(path, True):
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    for rel in _walk_dirs(self._root, self._is_excluded, path):
+                        self._add_watch(rel)
+                touched.add(path)
+            elif path.suffix == ".py":
+                touched.add(path)
+
+        return False
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    Переносимая замена inotify: раз в interval секунд сравнивает
+    (mtime, size) всех .py файлов проекта с предыдущим снимком.
+    """
+
+    def __init__(self, root: Path, is_excluded: ExcludeCheck, interval: float = 1.0):
+        self._root = root
+        self._is_excluded = is_excluded
+        self._interval = interval
+        self._snapshot = self._scan()
+        logger.info(f"polling {len(self._snapshot)} files every {interval}s")
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+
+        snapshot = {}
+        for rel in _walk_dirs(self._root, self._is_excluded):
+            try:
+                with os.scandir(self._root / rel) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".py") and entry.is_file():
+                            stat = entry.stat()
+                            snapshot[rel / entry.name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[Path]]:
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            touched = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if touched:
+                return touched
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(
+                self._interval
+                if deadline is None
+                else max(0.0, min(self._interval, deadline - time.monotonic()))
+            )
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+def create_watcher(
+    root: Path, is_excluded: ExcludeCheck, use_inotify: bool = True
+) -> Union[InotifyWatcher, PollingWatcher]:
+    """
+    Создаёт InotifyWatcher, если он доступен, иначе PollingWatcher.
+    """
+    if use_inotify:
+        try:
+            return InotifyWatcher(root, is_excluded)
+        except OSError as e:
+            logger.info(f"inotify is unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, is_excluded)
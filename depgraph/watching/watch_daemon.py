@@ -0,0 +1,298 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from ..main import Depgraph
+from .file_watcher import create_watcher
+
+__all__ = ["WatchDaemon", "query", "parse_address", "QUERY_OPS"]
+logger = logging.getLogger(__name__)
+
+# путь к unix-сокету или (host, port)
+Address = Union[str, Tuple[str, int]]
+
+QUERY_OPS = ("ping", "dependents", "dependencies", "impacted", "cycles", "diagnostics")
+
+
+def parse_address(address: str) -> Address:
+    """
+    "host:port" - TCP (например, на Windows), всё остальное - путь к unix-сокету.
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit() and "/" not in address:
+        return host, int(port)
+    return address
+
+
+def query(address: Address, request: Dict[str, Any], timeout: float = 5.0) -> Dict:
+    """
+    Отправляет один запрос демону и возвращает ответ.
+
+    Args:
+        address (Address): адрес демона.
+        request (Dict[str, Any]): например {"op": "dependents", "module": "pkg/mod.py"}.
+    """
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+def _paths(paths: List[Path]) -> List[str]:
+    return [path.as_posix() for path in paths]
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """
+    Протокол: JSON-запрос на строку, JSON-ответ на строку; соединение
+    может переиспользоваться для любого числа запросов.
+    """
+
+    server: "_QueryServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = self.server.answer(request)
+            except ValueError as e:
+                response = {"ok": False, "error": f"bad request: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _QueryServer(socketserver.ThreadingMixIn, socketserver.BaseServer):
+    daemon_threads = True
+    answer: Callable[[Dict], Dict]
+
+
+def _create_server(address: Address, answer: Callable[[Dict], Dict]) -> _QueryServer:
+
+    if isinstance(address, tuple):
+        server_class: Any = type(
+            "_TCPQueryServer", (_QueryServer, socketserver.TCPServer), {}
+        )
+        server_class.allow_reuse_address = True
+    else:
+        if os.path.exists(address):
+            # сокет остался от упавшего демона
+            os.unlink(address)
+        server_class = type(
+            "_UnixQueryServer", (_QueryServer, socketserver.UnixStreamServer), {}
+        )
+
+    server = server_class(address, _QueryHandler)
+    server.answer = answer
+    return server
+
+
+class WatchDaemon:
+    """
+    Держит граф зависимостей проекта актуальным и отвечает на запросы по сокету.
+
+    Изменения файлов приходят от InotifyWatcher (или PollingWatcher),
+    пачкой после затишья, и применяются через Depgraph.update(): заново
+    разбираются только затронутые модули. Запросы обслуживаются из памяти
+    в отдельных потоках; на время применения изменений они ждут блокировку.
+
+    Анализ всегда идёт в устойчивом режиме: файл, сохранённый с синтаксической
+    ошибкой, не останавливает демон, а попадает в диагностику (запрос
+    diagnostics). Если не удалась и полная пересборка, ошибка пишется в лог,
+    демон продолжает отвечать, а при следующих изменениях граф снова
+    строится целиком.
+    """
+
+    def __init__(
+        self,
+        depgraph: Depgraph,
+        address: Address,
+        use_inotify: bool = True,
+    ):
+        self._depgraph = depgraph
+        self._address = address
+        self._use_inotify = use_inotify
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server: Optional[_QueryServer] = None
+        self._root: Optional[Path] = None
+        # граф после неудачной пересборки неполон: следующие изменения
+        # применяются полной пересборкой, а не update()
+        self._needs_rebuild = False
+
+    def start(self) -> None:
+        """
+        Строит граф, начинает наблюдение и открывает сокет (в фоновом потоке).
+        """
+        # сохранённый с ошибкой файл не должен останавливать демон
+        self._depgraph.set_resilient(True)
+
+        with self._lock:
+            self._depgraph.start_dep_finding()
+            self._depgraph.start_graph_generating()
+            self._depgraph.get_analytics()
+
+        self._root = self._depgraph.get_proj_path()
+        self._watcher = create_watcher(
+            self._root, self._depgraph.is_excluded, self._use_inotify
+        )
+
+        self._server = _create_server(self._address, self.answer)
+        threading.Thread(
+            target=self._server.serve_forever, name="depgraph-queries", daemon=True
+        ).start()
+        logger.info(f"serving dependency queries on {self._address}")
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """
+        Цикл применения изменений; завершается после stop().
+        """
+        if self._server is None:
+            self.start()
+
+        try:
+            while not self._stopped.is_set():
+                touched = self._watcher.wait(poll_interval)
+                if touched is None or touched:
+                    self._apply_safely(None if self._needs_rebuild else touched)
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _close(self) -> None:
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self._address, str) and os.path.exists(self._address):
+                os.unlink(self._address)
+        self._watcher.close()
+
+    def _apply_safely(self, touched: Optional[Set[Path]]) -> None:
+        """
+        Применяет изменения; если update() упал, граф пересобирается целиком.
+        Ошибка и пересборки только пишется в лог: демон продолжает работать.
+        """
+        try:
+            self._apply(touched)
+            self._needs_rebuild = False
+            return
+        except Exception as e:
+            if touched is None:
+                logger.error(f"failed to rebuild graph: {e}")
+                self._needs_rebuild = True
+                return
+            # граф мог остаться наполовину обновлённым
+            logger.error(f"failed to apply changes: {e}, rebuilding")
+
+        self._apply_safely(None)
+
+    def _apply(self, touched: Optional[Set[Path]]) -> None:
+
+        start = time.perf_counter()
+
+        if touched is None:
+            with self._lock:
+                self._depgraph.start_dep_finding()
+                self._depgraph.start_graph_generating()
+                self._depgraph.get_analytics()
+            logger.info(f"rebuilt graph in {time.perf_counter() - start:.3f}s")
+            return
+
+        changed, removed = self._classify(touched)
+
+        with self._lock:
+            self._depgraph.update(changed, removed)
+            # циклы и слои пересчитываются сейчас, а не в первом запросе
+            self._depgraph.get_analytics()
+
+        logger.info(
+            f"applied {len(changed)} changes and {len(removed)} removals "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+
+    def _classify(self, touched: Set[Path]) -> Tuple[List[Path], List[Path]]:
+        """
+        Итоговое состояние пути определяется по диску, а не по последовательности
+        событий: удалённый и тут же созданный заново файл - просто изменённый.
+        """
+        assert self._root is not None
+        modules = self._depgraph.get_dep_dict()
+        # каталог и файлы в нём могут прийти в одной пачке
+        changed: Set[Path] = set()
+        removed: Set[Path] = set()
+
+        for path in touched:
+            full_path = self._root / path
+
+            if full_path.is_dir():
+                for directory, _, files in os.walk(full_path):
+                    rel_dir = Path(directory).relative_to(self._root)
+                    changed.update(rel_dir / name for name in files if name.endswith(".py"))
+            elif full_path.is_file():
+                changed.add(path)
+            else:
+                if path in modules:
+                    removed.add(path)
+                removed.update(module for module in modules if path in module.parents)
+
+        return sorted(changed), sorted(removed)
+
+    def answer(self, request: Dict) -> Dict:
+        """
+        Отвечает на запрос {"op": ..., "module": ...}.
+
+        Операции: ping, dependents и dependencies (прямые связи),
+        impacted (транзитивно зависящие модули), cycles (циклы импортов),
+        diagnostics (модули, которые не удалось разобрать полностью).
+        """
+        start = time.perf_counter()
+        op = request.get("op")
+
+        if op not in QUERY_OPS:
+            return {"ok": False, "error": f"op must be one of {QUERY_OPS}"}
+
+        module = request.get("module")
+        if op in ("dependents", "dependencies", "impacted") and not isinstance(
+            module, str
+        ):
+            return {"ok": False, "error": f"op '{op}' needs a 'module' string"}
+
+        try:
+            with self._lock:
+                result: Any = None
+                if op == "dependents":
+                    result = _paths(self._depgraph.get_dependents(module))
+                elif op == "dependencies":
+                    result = _paths(self._depgraph.get_dependencies(module))
+                elif op == "impacted":
+                    result = _paths(self._depgraph.get_impacted_modules(module))
+                elif op == "cycles":
+                    result = [_paths(cycle) for cycle in self._depgraph.find_cycles()]
+                elif op == "diagnostics":
+                    result = [
+                        {"path": module.as_posix(), **diagnostic._asdict()}
+                        for module, diagnostic in sorted(
+                            self._depgraph.get_diagnostics().items()
+                        )
+                    ]
+        except KeyError:
+            return {"ok": False, "error": f"module {module} is not in the graph"}
+
+        return {
+            "ok": True,
+            "result": result,
+            "elapsed_us": round((time.perf_counter() - start) * 1e6),
+        }
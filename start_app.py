@@ -1,4 +1,6 @@
-from depgraph.main import run
+import sys
+
+from depgraph.cli import main
 
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
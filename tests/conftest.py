@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import pytest
+
+from .helpers import SAMPLE_PROJECT, write_project
+
+
+@pytest.fixture
+def sample_project(tmp_path: Path) -> Path:
+    return write_project(tmp_path / "project", SAMPLE_PROJECT)
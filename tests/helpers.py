@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from depgraph.main import Depgraph
+
+__all__ = [
+    "SAMPLE_PROJECT",
+    "as_posix_deps",
+    "run_depgraph",
+    "sorted_paths",
+    "write_project",
+]
+
+# небольшой проект с пакетами, относительными импортами и циклом,
+# который проходит через __init__.py пакетов app.core и app.util
+SAMPLE_PROJECT: Dict[str, str] = {
+    "app/__init__.py": "",
+    "app/main.py": "import app.core.a\nimport sys\n",
+    "app/core/__init__.py": "from . import b\n",
+    "app/core/a.py": "import json\n",
+    "app/core/b.py": "from app.util import helpers\n",
+    "app/util/__init__.py": "",
+    "app/util/helpers.py": "from app.core import a\n",
+    "other/m.py": "from app.core import a\n",
+}
+
+
+def write_project(root: Path, files: Dict[str, str]) -> Path:
+    """
+    Пишет файлы проекта (путь относительно root -> исходный код).
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    for rel, source in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+    return root
+
+
+def as_posix_deps(dep_dict: Optional[Dict[Path, List[Path]]]) -> Dict[str, List[str]]:
+    """
+    dep_dict в сравнимом виде: строки путей, зависимости отсортированы.
+    """
+    assert dep_dict is not None
+    return {
+        module.as_posix(): sorted(dep.as_posix() for dep in deps)
+        for module, deps in dep_dict.items()
+    }
+
+
+def run_depgraph(project: Path, graph: bool = False, **settings: object) -> Depgraph:
+    """
+    Запускает поиск зависимостей (и построение графа) с настройками
+    вида set_<имя>=значение, например workers=2, resolution="symbol".
+    """
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(project))
+    for name, value in settings.items():
+        getattr(depgraph, f"set_{name}")(value)
+
+    depgraph.start_dep_finding()
+    if graph:
+        depgraph.start_graph_generating()
+    return depgraph
+
+
+def sorted_paths(paths: Iterable[Path]) -> List[str]:
+    return sorted(path.as_posix() for path in paths)
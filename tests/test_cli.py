@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from depgraph import cli
+from depgraph.cli import main
+from depgraph.profiling.pipeline_stats import PipelineStats
+
+from .helpers import write_project
+
+PACKAGE = {
+    "pkg/__init__.py": "",
+    "pkg/a.py": "from pkg import b\n",
+    "pkg/b.py": "",
+}
+
+
+def run_cli(capsys: pytest.CaptureFixture, *args: str) -> tuple:
+
+    code = main(list(args))
+    return code, capsys.readouterr().out
+
+
+def test_batch_labels_lines_with_project(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    first = write_project(tmp_path / "first", PACKAGE)
+    second = write_project(tmp_path / "second", PACKAGE)
+
+    code, out = run_cli(capsys, str(first), str(second), "-f", "jsonl")
+
+    assert code == 0
+    records = [json.loads(line) for line in out.splitlines()]
+    assert {record["project"] for record in records} == {str(first), str(second)}
+    edges = {
+        (record["project"], record["from"], record["to"])
+        for record in records
+        if record["type"] == "edge"
+    }
+    assert (str(second), "pkg/a.py", "pkg/__init__.py") in edges
+
+
+@pytest.mark.parametrize("spool_bytes", [cli._SPOOL_BYTES, 16])
+@pytest.mark.parametrize("output_format", ["jsonl", "edgelist", "dot"])
+def test_failed_project_leaves_no_partial_output(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    output_format: str,
+    spool_bytes: int,
+) -> None:
+    # 16 байт: вывод проекта уходит во временный файл
+    monkeypatch.setattr(cli, "_SPOOL_BYTES", spool_bytes)
+    good = write_project(tmp_path / "good", PACKAGE)
+    # синтаксическая ошибка в последнем модуле: рёбра первых уже разрешены
+    bad = write_project(tmp_path / "bad", {**PACKAGE, "pkg/z.py": "def (:\n"})
+
+    code, out = run_cli(capsys, str(good), str(bad), "-f", output_format)
+    _, good_only = run_cli(capsys, str(good), str(good), "-f", output_format)
+
+    assert code == 1
+    assert out
+    assert out == good_only[: len(good_only) // 2]
+
+
+def test_stats_summary_is_built_only_when_logged(
+    tmp_path: Path, capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = write_project(tmp_path / "project", PACKAGE)
+
+    def summary(self: PipelineStats) -> str:
+        raise AssertionError("summary built with INFO logging off")
+
+    monkeypatch.setattr(PipelineStats, "summary", summary)
+    code, out = run_cli(capsys, str(project))
+
+    assert code == 0
+    assert out
@@ -0,0 +1,55 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Set, Tuple
+
+from depgraph.graph_building.compact_graph import CompactGraph
+
+from .helpers import run_depgraph
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+def edge_set(graph: "nx.DiGraph") -> Set[Tuple[str, str]]:
+    return {(Path(a).as_posix(), Path(b).as_posix()) for a, b in graph.edges()}
+
+
+def test_compact_graph_matches_networkx_graph(sample_project: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+    nx_graph = depgraph._graph
+
+    graph = CompactGraph.from_dep_dict(depgraph.get_dep_dict() or {})
+    exported = graph.to_networkx()
+
+    assert graph.number_of_nodes() == nx_graph.number_of_nodes()
+    assert graph.number_of_edges() == nx_graph.number_of_edges()
+    assert edge_set(exported) == edge_set(nx_graph)
+    assert dict(exported.nodes(data="label")) == dict(nx_graph.nodes(data="label"))
+
+
+def test_edges_to_init_point_at_package_directory() -> None:
+    graph = CompactGraph.from_dep_dict(
+        {
+            Path("pkg/__init__.py"): [Path("pkg/a.py")],
+            Path("pkg/a.py"): [],
+            Path("main.py"): [Path("pkg/__init__.py"), Path("pkg/a.py")],
+        }
+    )
+
+    assert sorted(graph.successors(Path("main.py"))) == [Path("pkg"), Path("pkg/a.py")]
+    assert sorted(graph.predecessors(Path("pkg/a.py"))) == [
+        Path("main.py"),
+        Path("pkg/__init__.py"),
+    ]
+    assert not graph.is_module(graph.node_id(Path("pkg")))
+    assert graph.is_module(graph.node_id(Path("pkg/__init__.py")))
+
+
+def test_compact_backend_survives_update(sample_project: Path) -> None:
+    live = run_depgraph(sample_project, graph=True, graph_backend="compact")
+
+    (sample_project / "app/core/a.py").write_text("from app.util import helpers\n")
+    live.update(["app/core/a.py"])
+    fresh = run_depgraph(sample_project, graph=True, graph_backend="compact")
+
+    assert isinstance(live._graph, CompactGraph)
+    assert set(live._graph.iter_edges()) == set(fresh._graph.iter_edges())
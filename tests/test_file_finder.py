@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from depgraph.file_finding.python_file_finder import PythonFileFinder
+
+from .helpers import sorted_paths, write_project
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/mod.py": "",
+    "pkg/sub/__init__.py": "",
+    "pkg/sub/gen_table.py": "",
+    "scripts/run.py": "",
+    "env/pyvenv.cfg": "",
+    "env/lib/site.py": "",
+    ".venv/lib/x.py": "",
+    "node_modules/pkg/y.py": "",
+    "build/out.py": "",
+    "docs/build/conf.py": "",
+    "pkg/generated/.gitignore": "*.py\n!keep.py\n",
+    "pkg/generated/skip.py": "",
+    "pkg/generated/keep.py": "",
+    ".gitignore": "scripts/\n",
+    "README.md": "",
+}
+
+
+def test_default_excludes_venvs_and_gitignore(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "project", FILES)
+    finder = PythonFileFinder(project)
+
+    assert sorted_paths(finder.find_all()) == [
+        "docs/build/conf.py",
+        "pkg/__init__.py",
+        "pkg/generated/keep.py",
+        "pkg/mod.py",
+        "pkg/sub/__init__.py",
+        "pkg/sub/gen_table.py",
+    ]
+    assert finder.get_project_roots() == {project / "pkg"}
+    assert finder.is_excluded(Path("scripts/run.py"))
+    assert finder.is_excluded(Path("pkg/generated/skip.py"))
+    assert not finder.is_excluded(Path("pkg/generated/keep.py"))
+
+
+def test_exclude_patterns_without_defaults(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "project", FILES)
+    finder = PythonFileFinder(
+        project,
+        exclude=["**/gen_*.py", "/docs/"],
+        use_gitignore=False,
+        use_default_excludes=False,
+    )
+
+    modules = sorted_paths(finder.find_all())
+
+    assert "pkg/sub/gen_table.py" not in modules
+    assert "docs/build/conf.py" not in modules
+    assert {"build/out.py", "env/lib/site.py", "scripts/run.py"} <= set(modules)
+    assert "pkg/generated/skip.py" in modules
+
+
+def test_package_siblings_follow_added_and_removed_files(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "project", FILES)
+    finder = PythonFileFinder(project)
+    finder.find_all()
+
+    assert sorted_paths(finder.get_package_siblings(Path("pkg/__init__.py"))) == [
+        "pkg/mod.py",
+        "pkg/sub/__init__.py",
+    ]
+
+    (project / "pkg/new.py").write_text("")
+    finder.add_path(Path("pkg/new.py"))
+    finder.remove_path(Path("pkg/mod.py"))
+
+    assert sorted_paths(finder.get_package_siblings(Path("pkg/__init__.py"))) == [
+        "pkg/new.py",
+        "pkg/sub/__init__.py",
+    ]
@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from depgraph.graph_analytics.graph_analytics import GraphAnalytics
+from depgraph.graph_building.compact_graph import CompactGraph
+
+from .helpers import run_depgraph, sorted_paths
+
+# цикл через пакеты: app/core/__init__.py -> b.py -> app.util ->
+# app/util/helpers.py -> app.core
+PACKAGE_CYCLE = [
+    "app/core/__init__.py",
+    "app/core/b.py",
+    "app/util/__init__.py",
+    "app/util/helpers.py",
+]
+
+
+def analytics_of(dep_dict: Dict[str, List[str]]) -> GraphAnalytics:
+    return GraphAnalytics(
+        CompactGraph.from_dep_dict(
+            {Path(module): [Path(dep) for dep in deps] for module, deps in dep_dict.items()}
+        )
+    )
+
+
+def test_cycle_through_package_init_is_found(sample_project: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+
+    assert [sorted_paths(cycle) for cycle in depgraph.find_cycles()] == [PACKAGE_CYCLE]
+
+
+def test_impact_propagates_through_package_imports(sample_project: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+
+    assert sorted_paths(depgraph.get_impacted_modules("app/core/a.py")) == [
+        "app/__init__.py",
+        "app/core/__init__.py",
+        "app/core/b.py",
+        "app/main.py",
+        "app/util/__init__.py",
+        "app/util/helpers.py",
+        "other/m.py",
+    ]
+
+
+def test_package_init_query_includes_importers_of_package(sample_project: Path) -> None:
+    analytics = run_depgraph(sample_project, graph=True).get_analytics()
+
+    impacted = sorted_paths(analytics.impacted_by("app/util/__init__.py"))
+    assert "other/m.py" in impacted and "app/core/__init__.py" in impacted
+    assert "app/util" not in impacted
+
+
+def test_dependencies_of_reports_package_modules(sample_project: Path) -> None:
+    analytics = run_depgraph(sample_project, graph=True).get_analytics()
+
+    assert sorted_paths(analytics.dependencies_of("other/m.py")) == sorted(
+        PACKAGE_CYCLE + ["app/core/a.py"]
+    )
+
+
+def test_layers_and_components_of_acyclic_graph() -> None:
+    analytics = analytics_of(
+        {
+            "main.py": ["pkg/__init__.py", "util.py"],
+            "pkg/__init__.py": ["pkg/a.py"],
+            "pkg/a.py": ["util.py"],
+            "util.py": [],
+        }
+    )
+
+    assert analytics.cycles() == []
+    assert [sorted_paths(layer) for layer in analytics.layers()] == [
+        ["util.py"],
+        ["pkg/a.py"],
+        ["pkg", "pkg/__init__.py"],
+        ["main.py"],
+    ]
+    assert len(analytics.strongly_connected_components()) == 4
+
+
+def test_self_import_is_a_cycle_but_package_import_of_itself_is_not() -> None:
+    analytics = analytics_of(
+        {
+            "loop.py": ["loop.py"],
+            "pkg/__init__.py": ["pkg/__init__.py", "pkg/a.py"],
+            "pkg/a.py": [],
+        }
+    )
+
+    assert [sorted_paths(cycle) for cycle in analytics.cycles()] == [["loop.py"]]
+
+
+def test_unknown_module_raises_key_error(sample_project: Path) -> None:
+    analytics = run_depgraph(sample_project, graph=True).get_analytics()
+
+    with pytest.raises(KeyError):
+        analytics.impacted_by("missing.py")
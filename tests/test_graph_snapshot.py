@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from depgraph.graph_analytics.graph_analytics import GraphAnalytics
+from depgraph.graph_building.compact_graph import CompactGraph
+from depgraph.graph_building.graph_snapshot import GraphSnapshot, save_snapshot
+from depgraph.main import Depgraph
+
+from .helpers import run_depgraph
+
+
+def test_snapshot_round_trip(sample_project: Path, tmp_path: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+    snapshot_file = tmp_path / "graph.snap"
+    depgraph.save_snapshot(str(snapshot_file))
+
+    graph = CompactGraph.from_networkx(depgraph._graph)
+    with Depgraph.load_snapshot(str(snapshot_file)) as snapshot:
+        assert set(snapshot.iter_nodes()) == set(graph.iter_nodes())
+        assert set(snapshot.iter_edges()) == set(graph.iter_edges())
+        for node in graph.iter_nodes():
+            node_id = snapshot.node_id(node)
+            assert snapshot.is_module(node_id) == graph.is_module(graph.node_id(node))
+            assert sorted(snapshot.predecessors(node)) == sorted(
+                graph.predecessors(node)
+            )
+
+        assert "missing.py" not in snapshot
+        with pytest.raises(KeyError):
+            snapshot.node_id("missing.py")
+
+
+def test_snapshot_copy_and_analytics(sample_project: Path, tmp_path: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+    first, second = tmp_path / "first.snap", tmp_path / "second.snap"
+    depgraph.save_snapshot(str(first))
+
+    with GraphSnapshot(first) as snapshot:
+        save_snapshot(snapshot, second)
+        assert second.read_bytes() == first.read_bytes()
+        cycles = GraphAnalytics(snapshot).cycles()
+        assert cycles == depgraph.find_cycles()
+
+
+def test_corrupted_snapshot_is_rejected(tmp_path: Path) -> None:
+    snapshot_file = tmp_path / "bad.snap"
+    snapshot_file.write_bytes(b"not a snapshot" * 10)
+
+    with pytest.raises(ValueError):
+        GraphSnapshot(snapshot_file)
@@ -0,0 +1,42 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from depgraph.analyzing.python_analyzer import ImportRecord, PythonImportsAnalyzer
+
+SOURCE = b"import a.b.c as d\nfrom ..pkg import name as alias\nimport top\n"
+
+EXPECTED = [
+    ImportRecord("a.b", "c", "d", 0),
+    ImportRecord("pkg", "name", "alias", 2),
+    ImportRecord(None, "top", None, 0),
+]
+
+
+def test_analyzer_returns_import_records() -> None:
+    analyser = PythonImportsAnalyzer(Path("."))
+    analyser.analyze_source(SOURCE)
+
+    assert analyser.get_results() == EXPECTED
+
+
+def test_clear_results_does_not_touch_returned_list() -> None:
+    analyser = PythonImportsAnalyzer(Path("."))
+    analyser.analyze_source(SOURCE)
+    results = analyser.get_results()
+
+    analyser.clear_results()
+    analyser.analyze_source(b"import other\n")
+
+    assert results == EXPECTED
+    assert analyser.get_results() == [ImportRecord(None, "other", None, 0)]
+
+
+def test_records_are_validated_in_debug_mode(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.DEBUG, logger="depgraph.analyzing.python_analyzer"):
+        analyser = PythonImportsAnalyzer(Path("."))
+        analyser.analyze_source(SOURCE)
+
+    assert analyser.get_results() == EXPECTED
+    assert "founded import`s info" in caplog.text
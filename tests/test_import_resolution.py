@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from depgraph.dep_finding.module_index import ModuleIndex
+
+from .helpers import as_posix_deps, run_depgraph, write_project
+
+
+def test_module_index_prefers_module_over_package() -> None:
+    index = ModuleIndex([Path("pkg/util/__init__.py"), Path("pkg/util.py")])
+
+    assert index.lookup(("pkg", "util")) == Path("pkg/util.py")
+    assert index.is_package(("pkg", "util"))
+
+    index.remove(Path("pkg/util.py"))
+    assert index.lookup(("pkg", "util")) == Path("pkg/util/__init__.py")
+    assert Path("pkg/util.py") not in index
+    assert len(index) == 1
+
+
+def test_absolute_relative_and_external_imports(tmp_path: Path) -> None:
+    project = write_project(
+        tmp_path / "project",
+        {
+            "pkg/__init__.py": "",
+            "pkg/a.py": "import os\nimport requests\nfrom pkg.sub import b\n",
+            "pkg/sub/__init__.py": "",
+            "pkg/sub/b.py": "from . import c\nfrom .. import a\nfrom ..a import x\n",
+            "pkg/sub/c.py": "from pkg.sub.b import name\nimport pkg\n",
+        },
+    )
+
+    deps = as_posix_deps(run_depgraph(project).get_dep_dict())
+
+    assert deps["pkg/a.py"] == ["pkg/sub/__init__.py"]
+    assert deps["pkg/sub/b.py"] == ["pkg/a.py", "pkg/sub/c.py"]
+    assert deps["pkg/sub/c.py"] == ["pkg/sub/b.py"]
+    # __init__.py зависит от модулей своего пакета
+    assert deps["pkg/sub/__init__.py"] == ["pkg/sub/b.py", "pkg/sub/c.py"]
+
+
+def test_imports_inside_root_package_without_root_name(tmp_path: Path) -> None:
+    project = write_project(
+        tmp_path / "project",
+        {
+            "src/pkg/__init__.py": "",
+            "src/pkg/a.py": "from b import name\n",
+            "src/pkg/b.py": "from pkg.a import name\n",
+        },
+    )
+
+    deps = as_posix_deps(run_depgraph(project).get_dep_dict())
+
+    assert deps["src/pkg/a.py"] == ["src/pkg/b.py"]
+    assert deps["src/pkg/b.py"] == ["src/pkg/a.py"]
@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from depgraph.analyzing.python_analyzer import ImportRecord, PythonImportsAnalyzer
+
+SOURCES = {
+    "plain": "import os\nimport a.b.c as d, e\nfrom x import y as z, w\n",
+    "relative": "from . import a\nfrom ..pkg.mod import (\n    b,\n    c,  # comment\n)\n",
+    "nested": (
+        "def f():\n    import inner\n\nclass C:\n"
+        "    if True: from cls import attr\n"
+        "try: import fast\nexcept ImportError: import slow\n"
+    ),
+    "strings and comments": (
+        '"""\nimport not_a_module\n"""\n'
+        "# from fake import thing\n"
+        "text = 'import quoted'\n"
+        "import real  # import after\n"
+    ),
+    "continuation": "from a import \\\n    b\nimport c; import d\n",
+    "form feed": "\fimport ff\n\f\nfrom ff2 import name\n\f\fimport ff3\n",
+}
+
+
+def extract(engine: str, source: str) -> List[ImportRecord]:
+    analyser = PythonImportsAnalyzer(Path("."), engine=engine)
+    analyser.analyze_source(source.encode("utf-8"))
+    return analyser.get_results()
+
+
+@pytest.mark.parametrize("source", SOURCES.values(), ids=list(SOURCES))
+def test_scan_engine_matches_ast_engine(source: str) -> None:
+    expected = extract("ast", source)
+
+    assert expected
+    assert extract("scan", source) == expected
+
+
+def test_form_feed_before_import_is_whitespace() -> None:
+    records = extract("scan", "\fimport ff\n")
+
+    assert [record.name for record in records] == ["ff"]
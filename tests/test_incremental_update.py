@@ -0,0 +1,75 @@
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, run_depgraph
+
+# (название, новые или изменённые файлы, удалённые файлы)
+SCENARIOS: List[Tuple[str, Dict[str, str], List[str]]] = [
+    ("modify module", {"app/core/a.py": "from app.util import helpers\n"}, []),
+    ("add module", {"app/core/c.py": "from . import a\n"}, []),
+    (
+        "add imported target",
+        {"app/core/b.py": "import app.core.new\n", "app/core/new.py": ""},
+        [],
+    ),
+    ("remove module", {}, ["app/core/b.py"]),
+    (
+        "add package",
+        {"app/extra/__init__.py": "", "app/extra/x.py": "from app import main\n"},
+        [],
+    ),
+    ("remove package init", {}, ["app/util/__init__.py"]),
+    (
+        "new root package",
+        {"lib/__init__.py": "", "lib/tools.py": "from app.core import a\n"},
+        [],
+    ),
+    ("module shadows package", {"app/util.py": "import os\n"}, []),
+]
+
+
+GraphState = Tuple[Dict[str, List[str]], Set[str], Set[Tuple[str, str]]]
+
+
+def graph_state(depgraph: Depgraph) -> GraphState:
+    graph = depgraph._graph
+    assert graph is not None
+    return (
+        as_posix_deps(depgraph.get_dep_dict()),
+        {node.as_posix() for node in graph.nodes()},
+        {(a.as_posix(), b.as_posix()) for a, b in graph.edges()},
+    )
+
+
+@pytest.mark.parametrize("resolution", ["module", "symbol"])
+@pytest.mark.parametrize(
+    "writes,removes", [s[1:] for s in SCENARIOS], ids=[s[0] for s in SCENARIOS]
+)
+def test_update_matches_full_rebuild(
+    sample_project: Path, resolution: str, writes: Dict[str, str], removes: List[str]
+) -> None:
+    live = run_depgraph(sample_project, graph=True, resolution=resolution)
+
+    for rel, source in writes.items():
+        path = sample_project / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    for rel in removes:
+        (sample_project / rel).unlink()
+
+    live.update(list(writes), removes)
+    fresh = run_depgraph(sample_project, graph=True, resolution=resolution)
+
+    assert graph_state(live) == graph_state(fresh)
+
+
+def test_update_before_dep_finding_fails(sample_project: Path) -> None:
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(sample_project))
+
+    with pytest.raises(ValueError):
+        depgraph.update(["app/main.py"])
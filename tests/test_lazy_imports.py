@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("networkx", "pyvis", "jinja2")
+
+
+def imported_modules(statement: str, cwd: Path) -> set:
+
+    code = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env={"PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import depgraph.main",
+        "import depgraph.cli",
+        "from depgraph.main import Depgraph",
+    ],
+)
+def test_import_does_not_load_heavy_dependencies(
+    statement: str, tmp_path: Path
+) -> None:
+    modules = imported_modules(statement, tmp_path)
+
+    assert not {name.split(".")[0] for name in modules} & set(HEAVY_MODULES)
+    # настройка логов не должна быть побочным эффектом импорта
+    assert not (tmp_path / "app.log").exists()
+
+
+def test_graph_building_loads_networkx(sample_project: Path, tmp_path: Path) -> None:
+    statement = (
+        "from depgraph.main import Depgraph\n"
+        "depgraph = Depgraph()\n"
+        f"depgraph.set_proj_path({str(sample_project)!r})\n"
+        "depgraph.start_dep_finding()\n"
+        "depgraph.start_graph_generating()"
+    )
+    modules = imported_modules(statement, tmp_path)
+
+    assert "networkx" in modules
+    assert "pyvis" not in modules
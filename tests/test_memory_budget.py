@@ -0,0 +1,168 @@
+import io
+import sys
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from depgraph.graph_building.compact_graph import CompactGraph
+from depgraph.graph_building.edge_sink import EdgeListWriter
+from depgraph.graph_building.edge_store import EdgeStore
+from depgraph.graph_building.graph_snapshot import GraphSnapshot
+from depgraph.main import Depgraph
+
+from .helpers import run_depgraph
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from synthetic_project import ProjectSpec, generate_project  # noqa: E402
+
+
+def edge_lines(depgraph: Depgraph) -> List[str]:
+
+    stream = io.StringIO()
+    depgraph.write_edges(EdgeListWriter(stream))  # type: ignore[arg-type]
+    return sorted(stream.getvalue().splitlines())
+
+
+def assert_same_graph(snapshot: GraphSnapshot, graph: CompactGraph) -> None:
+
+    assert sorted(snapshot.iter_nodes()) == sorted(graph.iter_nodes())
+    assert sorted(snapshot.iter_edges()) == sorted(graph.iter_edges())
+    for node in graph.iter_nodes():
+        assert snapshot.is_module(snapshot.node_id(node)) == graph.is_module(
+            graph.node_id(node)
+        )
+
+
+@pytest.mark.parametrize("resolution", ["module", "symbol"])
+def test_budget_mode_matches_in_memory(sample_project: Path, resolution: str) -> None:
+    expected = run_depgraph(sample_project, graph=True, resolution=resolution)
+    depgraph = run_depgraph(
+        sample_project, graph=True, resolution=resolution, memory_budget=1
+    )
+    try:
+        assert depgraph.get_dep_dict() is None
+        assert edge_lines(depgraph) == edge_lines(expected)
+        assert isinstance(depgraph._graph, GraphSnapshot)
+        assert_same_graph(depgraph._graph, CompactGraph.from_networkx(expected._graph))
+        assert depgraph.find_cycles() == expected.find_cycles()
+    finally:
+        depgraph.close()
+
+
+def test_blocks_and_chunks_smaller_than_graph(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    generate_project(project, ProjectSpec(modules=400, imports=8, seed=3))
+    expected = run_depgraph(project, graph=True, graph_backend="compact")
+
+    # бюджет в 1 байт: буфер и блоки CSR берут минимальный размер
+    store = EdgeStore(1, tmp_path)
+    streaming = Depgraph()
+    streaming.set_proj_path(str(project))
+    streaming.start_streaming(store)  # type: ignore[arg-type]
+    store.finish()
+    assert store.number_of_edges() > 2 * 1024
+
+    snapshot_file = tmp_path / "graph.snap"
+    store.save_snapshot(snapshot_file)
+    store.close()
+
+    with GraphSnapshot(snapshot_file) as snapshot:
+        assert_same_graph(snapshot, expected._graph)
+
+
+def test_edges_are_read_once_for_all_blocks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = tmp_path / "project"
+    generate_project(project, ProjectSpec(modules=400, imports=8, seed=3))
+    expected = run_depgraph(project, graph=True, graph_backend="compact")
+
+    store = EdgeStore(1, tmp_path)
+    streaming = Depgraph()
+    streaming.set_proj_path(str(project))
+    streaming.start_streaming(store)  # type: ignore[arg-type]
+    store.finish()
+
+    passes = {"edges": 0, "forward": 0}
+    blocks: List[int] = []
+
+    def counted(name: str, method: Callable) -> Callable:
+        def wrapper(*args: object) -> object:
+            passes[name] += 1
+            return method(*args)
+
+        return wrapper
+
+    def counted_blocks(self: EdgeStore, counts: object) -> object:
+        found = list(original_blocks(self, counts))
+        blocks.append(len(found))
+        return iter(found)
+
+    original_blocks = EdgeStore._blocks
+    monkeypatch.setattr(EdgeStore, "_blocks", counted_blocks)
+    monkeypatch.setattr(
+        EdgeStore, "_iter_chunks", counted("edges", EdgeStore._iter_chunks)
+    )
+    monkeypatch.setattr(
+        EdgeStore, "_iter_forward", counted("forward", EdgeStore._iter_forward)
+    )
+
+    snapshot_file = tmp_path / "graph.snap"
+    store.save_snapshot(snapshot_file)
+    store.close()
+
+    # и прямой, и обратный CSR собираются из нескольких блоков,
+    # но спилленные рёбра и прямой CSR читаются по одному разу
+    assert min(blocks) > 1
+    assert passes == {"edges": 1, "forward": 1}
+    with GraphSnapshot(snapshot_file) as snapshot:
+        assert_same_graph(snapshot, expected._graph)
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        lambda depgraph: depgraph.update(["app/main.py"]),
+        lambda depgraph: depgraph.get_dependencies("app/main.py"),
+        lambda depgraph: depgraph.save_partial("partial.json"),
+    ],
+)
+def test_in_memory_only_actions_are_rejected(
+    sample_project: Path, action: Callable[[Depgraph], object]
+) -> None:
+    depgraph = run_depgraph(sample_project, memory_budget=1)
+    try:
+        with pytest.raises(ValueError, match="needs dependencies in memory"):
+            action(depgraph)
+    finally:
+        depgraph.close()
+
+
+def test_close_removes_spilled_files(sample_project: Path, tmp_path: Path) -> None:
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(sample_project))
+    depgraph.set_memory_budget(1, spill_dir=str(spill_dir))
+    depgraph.start_dep_finding()
+    depgraph.start_graph_generating()
+
+    depgraph.close()
+    assert list(spill_dir.iterdir()) == []
+
+
+def test_budget_can_be_switched_off(sample_project: Path) -> None:
+    depgraph = run_depgraph(sample_project, memory_budget=1)
+    depgraph.set_memory_budget(None)
+    depgraph.start_dep_finding()
+
+    assert depgraph.get_dep_dict() is not None
+    assert depgraph.get_dependencies("app/main.py") == [Path("app/core/__init__.py")]
+
+
+@pytest.mark.parametrize("budget", [0, -1, 1.5, True])
+def test_set_memory_budget_rejects_invalid_values(budget: object) -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_memory_budget(budget)  # type: ignore[arg-type]
@@ -0,0 +1,34 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, run_depgraph
+
+
+def test_process_pool_matches_serial_analysis(sample_project: Path) -> None:
+    serial = run_depgraph(sample_project, workers=1)
+    parallel = run_depgraph(sample_project, workers=2)
+
+    assert as_posix_deps(parallel.get_dep_dict()) == as_posix_deps(
+        serial.get_dep_dict()
+    )
+
+
+def test_shared_process_pool_serves_several_projects(
+    sample_project: Path, tmp_path: Path
+) -> None:
+    expected = as_posix_deps(run_depgraph(sample_project).get_dep_dict())
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        for _ in range(2):
+            depgraph = run_depgraph(sample_project, workers=2, process_pool=pool)
+            assert as_posix_deps(depgraph.get_dep_dict()) == expected
+
+
+@pytest.mark.parametrize("workers", [0, -1, 1.5, True])
+def test_set_workers_rejects_invalid_values(workers: object) -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_workers(workers)  # type: ignore[arg-type]
@@ -0,0 +1,146 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from depgraph.analyzing.python_analyzer import ANALYZER_VERSION, ImportRecord
+from depgraph.caching.parse_cache import ParseCache, source_fingerprint
+
+from .helpers import as_posix_deps, run_depgraph
+
+RECORDS = [ImportRecord("app.core", "a", None, 0)]
+
+
+def fingerprint(module: Path) -> tuple:
+    return source_fingerprint(module.stat(), module.read_bytes())
+
+
+def test_second_run_is_served_from_cache(sample_project: Path, tmp_path: Path) -> None:
+    cache_file = str(tmp_path / "cache.json")
+
+    first = run_depgraph(sample_project, cache_path=cache_file)
+    second = run_depgraph(sample_project, cache_path=cache_file)
+
+    counters = second.get_stats().get_counters()
+    assert counters["cache_misses"] == 0
+    assert counters["cache_hits"] == len(first.get_dep_dict() or {})
+    assert as_posix_deps(second.get_dep_dict()) == as_posix_deps(
+        first.get_dep_dict()
+    )
+
+
+def test_changed_file_is_reparsed(sample_project: Path, tmp_path: Path) -> None:
+    cache_file = str(tmp_path / "cache.json")
+    run_depgraph(sample_project, cache_path=cache_file)
+
+    (sample_project / "other/m.py").write_text("from app.util import helpers\n")
+    depgraph = run_depgraph(sample_project, cache_path=cache_file)
+
+    assert depgraph.get_stats().get_counters()["cache_misses"] == 1
+    deps = as_posix_deps(depgraph.get_dep_dict())
+    assert deps["other/m.py"] == ["app/util/__init__.py"]
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path: Path) -> None:
+    module = tmp_path / "mod.py"
+    module.write_text("from app.core import a\n")
+
+    cache = ParseCache(None, ANALYZER_VERSION)
+    cache.put(module, fingerprint(module), RECORDS)
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.get(module) == (RECORDS, None)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_outdated_analyzer_version_drops_entries(tmp_path: Path) -> None:
+    module = tmp_path / "mod.py"
+    module.write_text("from app.core import a\n")
+    cache_file = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_file, ANALYZER_VERSION)
+    cache.put(module, fingerprint(module), RECORDS)
+    cache.save()
+
+    reloaded = ParseCache(cache_file, ANALYZER_VERSION)
+    reloaded.load()
+    assert reloaded.get(module) == (RECORDS, None)
+
+    outdated = ParseCache(cache_file, ANALYZER_VERSION + "-old")
+    outdated.load()
+    assert outdated.get(module) is None
+
+
+def test_prune_removes_deleted_modules(tmp_path: Path) -> None:
+    kept, removed = tmp_path / "kept.py", tmp_path / "removed.py"
+    kept.write_text("")
+    removed.write_text("")
+    cache_file = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_file, ANALYZER_VERSION)
+    cache.put(kept, fingerprint(kept), [])
+    cache.put(removed, fingerprint(removed), [])
+    cache.prune(tmp_path, [Path("kept.py")])
+    cache.save()
+
+    entries = json.loads(cache_file.read_text())["entries"]
+    assert list(entries) == [str(kept)]
+
+
+def test_cold_run_reads_each_module_once(
+    sample_project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reads: Counter = Counter()
+    path_open, read_bytes = Path.open, Path.read_bytes
+
+    def counting_open(self: Path, *args: object, **kwargs: object) -> object:
+        if self.suffix == ".py":
+            reads[self] += 1
+        return path_open(self, *args, **kwargs)  # type: ignore[arg-type]
+
+    def counting_read_bytes(self: Path) -> bytes:
+        if self.suffix == ".py":
+            reads[self] += 1
+        return read_bytes(self)
+
+    monkeypatch.setattr(Path, "open", counting_open)
+    monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+    depgraph = run_depgraph(sample_project, cache_path=str(tmp_path / "cache.json"))
+
+    assert len(reads) == len(depgraph.get_dep_dict() or {})
+    assert set(reads.values()) == {1}
+
+
+def test_cached_fingerprint_describes_parsed_bytes(
+    sample_project: Path, tmp_path: Path
+) -> None:
+    cache_file = tmp_path / "cache.json"
+    run_depgraph(sample_project, cache_path=str(cache_file))
+
+    entries = json.loads(cache_file.read_text())["entries"]
+    module = sample_project / "app/main.py"
+    assert entries[str(module)][:3] == list(fingerprint(module))
+
+
+def test_old_blob_entries_are_pruned(tmp_path: Path) -> None:
+    module = tmp_path / "mod.py"
+    module.write_text("")
+    cache_file = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_file, ANALYZER_VERSION, max_blob_entries=2)
+    cache.put(module, fingerprint(module), [])
+    for blob_id in ("a", "b", "c"):
+        cache.put_blob(blob_id, RECORDS)
+    # использованный блоб вытесняется последним
+    assert cache.get_blob("a") == (RECORDS, None)
+    cache.save()
+
+    reloaded = ParseCache(cache_file, ANALYZER_VERSION, max_blob_entries=2)
+    reloaded.load()
+    assert reloaded.get_blob("b") is None
+    assert reloaded.get_blob("a") == (RECORDS, None)
+    assert reloaded.get_blob("c") == (RECORDS, None)
+    assert reloaded.get(module) == ([], None)
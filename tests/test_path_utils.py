@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from depgraph.utils import _get_sibling_python_files, unique_paths
+
+from .helpers import sorted_paths, write_project
+
+
+def test_unique_paths_normalizes_lexically(tmp_path: Path) -> None:
+    paths = [
+        Path("pkg/sub/../mod.py"),
+        Path("pkg/mod.py"),
+        tmp_path / "pkg/other.py",
+        Path("/elsewhere/x.py"),
+        Path("pkg/other.py"),
+    ]
+
+    assert unique_paths(paths, tmp_path) == [
+        Path("pkg/mod.py"),
+        Path("pkg/other.py"),
+        Path("/elsewhere/x.py"),
+    ]
+
+
+def test_unique_paths_does_not_depend_on_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    paths = [Path("a/../b.py"), Path("b.py")]
+    expected = unique_paths(paths)
+
+    monkeypatch.chdir(tmp_path)
+    assert unique_paths(paths) == expected == [Path("b.py")]
+
+
+def test_package_siblings_are_listed_relative_to_root(tmp_path: Path) -> None:
+    root = write_project(
+        tmp_path / "project",
+        {
+            "pkg/__init__.py": "",
+            "pkg/a.py": "",
+            "pkg/sub/__init__.py": "",
+            "pkg/data/readme.txt": "",
+        },
+    )
+    siblings = _get_sibling_python_files(Path("pkg/__init__.py"), root)
+
+    assert sorted_paths(siblings) == ["pkg/a.py", "pkg/sub/__init__.py"]
@@ -0,0 +1,104 @@
+import json
+import pstats
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from depgraph.main import Depgraph
+from depgraph.profiling.pipeline_stats import PipelineStats, cprofile_profiler
+
+from .helpers import SAMPLE_PROJECT, run_depgraph
+
+
+def test_stages_and_counters(sample_project: Path) -> None:
+    depgraph = run_depgraph(sample_project, graph=True)
+    stats = depgraph.get_stats()
+
+    stages = stats.get_stages()
+    assert {"prepare_data", "dep_finding", "graph_generating"} <= set(stages)
+    assert all(timing.calls == 1 and timing.wall >= 0 for timing in stages.values())
+
+    counters = stats.get_counters()
+    assert counters["files"] == len(SAMPLE_PROJECT)
+    assert counters["imports"] > 0
+    assert counters["graph_nodes"] == depgraph._graph.number_of_nodes()
+    assert counters["graph_edges"] == depgraph._graph.number_of_edges()
+
+
+def test_repeated_stage_is_accumulated() -> None:
+    stats = PipelineStats()
+    for _ in range(3):
+        with stats.stage("dep_finding"):
+            pass
+    stats.add("files", 2)
+    stats.add("files", 3)
+
+    assert stats.get_stages()["dep_finding"].calls == 3
+    assert stats.get_counters() == {"files": 5}
+    assert stats.to_dict()["cache_hit_rate"] is None
+
+
+def test_stage_is_recorded_on_error() -> None:
+    stats = PipelineStats()
+    with pytest.raises(RuntimeError):
+        with stats.stage("dep_finding"):
+            raise RuntimeError("boom")
+
+    assert stats.get_stages()["dep_finding"].calls == 1
+
+
+def test_cache_hit_rate(sample_project: Path, tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    run_depgraph(sample_project, cache_path=str(cache_file))
+    depgraph = run_depgraph(sample_project, cache_path=str(cache_file))
+
+    report = depgraph.get_stats().to_dict()
+    assert report["counters"]["cache_hits"] == len(SAMPLE_PROJECT)
+    assert report["counters"]["cache_misses"] == 0
+    assert report["cache_hit_rate"] == 1.0
+
+
+def test_json_report(sample_project: Path, tmp_path: Path) -> None:
+    depgraph = run_depgraph(sample_project)
+    report_file = tmp_path / "reports" / "stats.json"
+    depgraph.save_stats_report(str(report_file))
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert set(report["stages"]["dep_finding"]) == {
+        "wall_s",
+        "cpu_s",
+        "calls",
+        "peak_rss_bytes",
+    }
+    assert report["counters"]["files"] == len(SAMPLE_PROJECT)
+    assert "dep_finding" in depgraph.get_stats().summary()
+
+
+def test_profiler_wraps_every_stage(sample_project: Path) -> None:
+    entered: List[str] = []
+
+    @contextmanager
+    def profiler(stage: str) -> Iterator[None]:
+        entered.append(stage)
+        yield
+
+    depgraph = Depgraph()
+    depgraph.set_profiler(profiler)
+    depgraph.set_proj_path(str(sample_project))
+    depgraph.start_dep_finding()
+
+    assert entered == ["prepare_data", "dep_finding"]
+
+
+def test_cprofile_profiler(sample_project: Path, tmp_path: Path) -> None:
+    profile_file = tmp_path / "depgraph.prof"
+    run_depgraph(sample_project, profiler=cprofile_profiler(profile_file))
+
+    assert pstats.Stats(str(profile_file)).total_calls > 0
+
+
+def test_profiler_must_be_callable() -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_profiler("cprofile")  # type: ignore[arg-type]
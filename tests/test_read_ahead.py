@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from depgraph.analyzing import python_analyzer
+from depgraph.dep_finding import python_dep_finder
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, run_depgraph
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("read_threads", [1, 4])
+def test_read_ahead_matches_reading_one_by_one(
+    sample_project: Path, workers: int, read_threads: int
+) -> None:
+    expected = run_depgraph(sample_project, workers=workers, read_threads=0)
+    depgraph = run_depgraph(sample_project, workers=workers, read_threads=read_threads)
+
+    assert as_posix_deps(depgraph.get_dep_dict()) == as_posix_deps(
+        expected.get_dep_dict()
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("read_threads", [0, 4])
+def test_read_error_gives_diagnostic(
+    sample_project: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    workers: int,
+    read_threads: int,
+) -> None:
+    def read_source(full_path: Path) -> bytes:
+        if full_path.name == "b.py":
+            raise OSError(f"cannot read {full_path.name}")
+        return python_analyzer.read_source(full_path)
+
+    monkeypatch.setattr(python_dep_finder, "read_source", read_source)
+    depgraph = run_depgraph(sample_project, workers=workers, read_threads=read_threads)
+
+    # непрочитанный модуль остаётся в графе без зависимостей
+    module = Path("app/core/b.py")
+    assert depgraph.get_dep_dict()[module] == []
+    assert depgraph.get_dep_dict()[Path("app/util/helpers.py")] != []
+    assert list(depgraph.get_diagnostics()) == [module]
+
+    diagnostic = depgraph.get_diagnostics()[module]
+    assert diagnostic.kind == "read"
+    assert "cannot read b.py" in diagnostic.message
+    assert not diagnostic.recovered
+
+
+@pytest.mark.parametrize("threads", [-1, 1.5, True])
+def test_set_read_threads_rejects_invalid_values(threads: object) -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_read_threads(threads)  # type: ignore[arg-type]
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from .helpers import as_posix_deps, run_depgraph, write_project
+
+PROJECT = {
+    "pkg/__init__.py": "",
+    "pkg/a.py": "",
+    "pkg/b.py": "",
+    "pkg/py2.py": "from pkg.a import x\nprint 'hi'\nfrom pkg.b import y\n",
+}
+
+
+@pytest.fixture
+def broken_project(tmp_path: Path) -> Path:
+    write_project(tmp_path, PROJECT)
+    # кодировка из PEP 263 cookie
+    (tmp_path / "pkg/latin.py").write_bytes(
+        "# -*- coding: latin-1 -*-\nfrom pkg.a import x\ns = 'café'\n".encode("latin-1")
+    )
+    # не UTF-8 и без cookie
+    (tmp_path / "pkg/bad.py").write_bytes(b"from pkg.b import y\ns = '\xff\xfe'\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("engine", ["ast", "scan"])
+def test_broken_files_do_not_stop_the_run(broken_project: Path, engine: str) -> None:
+    depgraph = run_depgraph(broken_project, resilient=True, analyzer_engine=engine)
+
+    deps = as_posix_deps(depgraph.get_dep_dict())
+    assert deps["pkg/py2.py"] == ["pkg/a.py", "pkg/b.py"]
+    assert deps["pkg/latin.py"] == ["pkg/a.py"]
+    assert deps["pkg/bad.py"] == ["pkg/b.py"]
+
+
+def test_diagnostics(broken_project: Path) -> None:
+    depgraph = run_depgraph(broken_project, resilient=True, analyzer_engine="ast")
+    diagnostics = {
+        module.as_posix(): diagnostic
+        for module, diagnostic in depgraph.get_diagnostics().items()
+    }
+
+    assert set(diagnostics) == {"pkg/py2.py", "pkg/bad.py"}
+    assert diagnostics["pkg/py2.py"].kind == "syntax"
+    assert diagnostics["pkg/py2.py"].line == 2
+    assert diagnostics["pkg/bad.py"].kind == "decode"
+    assert all(diagnostic.recovered for diagnostic in diagnostics.values())
+
+
+def test_diagnostics_report(broken_project: Path, tmp_path: Path) -> None:
+    depgraph = run_depgraph(broken_project, resilient=True)
+    report_file = tmp_path / "diagnostics.json"
+    depgraph.save_diagnostics_report(str(report_file))
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert [(entry["path"], entry["kind"]) for entry in report] == [
+        ("pkg/bad.py", "decode"),
+        ("pkg/py2.py", "syntax"),
+    ]
+
+
+def test_syntax_error_is_raised_without_resilient_mode(broken_project: Path) -> None:
+    with pytest.raises(SyntaxError):
+        run_depgraph(broken_project, analyzer_engine="ast")
+
+
+def test_resilient_mode_does_not_change_clean_projects(sample_project: Path) -> None:
+    expected = run_depgraph(sample_project)
+    depgraph = run_depgraph(sample_project, resilient=True)
+
+    assert as_posix_deps(depgraph.get_dep_dict()) == as_posix_deps(
+        expected.get_dep_dict()
+    )
+    assert depgraph.get_diagnostics() == {}
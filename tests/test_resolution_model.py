@@ -0,0 +1,237 @@
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from depgraph.dep_finding.import_trie import ImportTrie
+from depgraph.dep_finding.module_index import ModuleIndex
+from depgraph.dep_finding.resolution_model import read_pyproject_layout
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, write_project
+
+LAYOUT = {
+    "pyproject.toml": (
+        "[tool.setuptools.packages.find]\n"
+        'where = ["src", "ns1", "ns2"]\n'
+        "[tool.setuptools.package-dir]\n"
+        '"vendored.other" = "lib/other"\n'
+    ),
+    "lib/other/__init__.py": "",
+    "lib/other/thing.py": "",
+    "ns1/acme/a/__init__.py": "",
+    "ns1/acme/a/x.py": "",
+    "ns2/acme/b/__init__.py": "",
+    "src/app/__init__.py": "",
+    "src/app/main.py": (
+        "from app.core import engine\n"
+        "from acme.a import x\n"
+        "from acme import b\n"
+        "import vendored.other.thing\n"
+        "import cli\n"
+    ),
+    "src/app/core/__init__.py": "",
+    "src/app/core/engine.py": "from . import helpers\nfrom app import util\n",
+    "src/app/core/helpers.py": "",
+    # c.d ещё нет: появится пакетом пространства имён
+    "src/app/plugins.py": "from c.d import z\n",
+    "src/app/util.py": "import json\n",
+    "src/cli.py": "import app.util\n",
+    "tests/test_main.py": "import app.main\nfrom app.util import *\n",
+}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    return write_project(tmp_path, LAYOUT)
+
+
+def find_deps(project: Path, **model: object) -> Dict[str, List[str]]:
+
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(project))
+    if model:
+        depgraph.set_resolution_model(**model)  # type: ignore[arg-type]
+    depgraph.start_dep_finding()
+    return as_posix_deps(depgraph.get_dep_dict())
+
+
+def test_package_roots_model(project: Path) -> None:
+    deps = find_deps(project)
+
+    # корневые пакеты находятся и без модели, модуль верхнего уровня - нет
+    assert deps["src/app/main.py"] == ["src/app/core/__init__.py"]
+    assert deps["src/cli.py"] == ["src/app/__init__.py"]
+
+
+def test_src_layout(project: Path) -> None:
+    deps = find_deps(project, source_roots=["src"])
+
+    assert deps["src/app/main.py"] == ["src/app/core/__init__.py", "src/cli.py"]
+    assert deps["tests/test_main.py"] == ["src/app/__init__.py", "src/app/util.py"]
+
+
+def test_namespace_packages(project: Path) -> None:
+    deps = find_deps(
+        project, source_roots=["src", "ns1", "ns2"], namespace_packages=True
+    )
+
+    assert deps["src/app/main.py"] == [
+        "ns1/acme/a/__init__.py",
+        "ns2/acme/b/__init__.py",
+        "src/app/core/__init__.py",
+        "src/cli.py",
+    ]
+
+
+def test_portions_are_not_merged_without_namespace_packages(project: Path) -> None:
+    deps = find_deps(project, source_roots=["src", "ns1", "ns2"])
+
+    assert "ns2/acme/b/__init__.py" not in deps["src/app/main.py"]
+
+
+def test_pyproject_layout(project: Path) -> None:
+    deps = find_deps(project, use_pyproject=True, namespace_packages=True)
+
+    assert deps["src/app/main.py"] == [
+        "lib/other/__init__.py",
+        "ns1/acme/a/__init__.py",
+        "ns2/acme/b/__init__.py",
+        "src/app/core/__init__.py",
+        "src/cli.py",
+    ]
+
+
+def test_first_source_root_wins(project: Path) -> None:
+    write_project(project, {"lib/app/__init__.py": "", "lib/app/util.py": ""})
+
+    assert find_deps(project, source_roots=["lib", "src"])["src/cli.py"] == [
+        "lib/app/__init__.py"
+    ]
+    assert find_deps(project, source_roots=["src", "lib"])["src/cli.py"] == [
+        "src/app/__init__.py"
+    ]
+
+
+@pytest.mark.parametrize(
+    "pyproject, source_roots, packages",
+    [
+        (
+            "[tool.poetry]\npackages = [\n"
+            '  { include = "app", from = "src" },\n'
+            '  { include = "tool.py" },\n'
+            '  { include = "bad-name" },\n'
+            "]\n",
+            [Path(".")],
+            [("app", Path("src/app"))],
+        ),
+        (
+            '[tool.setuptools]\npackage-dir = { "" = "src", "vendored.x" = "lib/x" }\n',
+            [Path("src")],
+            [("vendored.x", Path("lib/x"))],
+        ),
+        (
+            '[tool.hatch.build.targets.wheel]\npackages = ["src/app"]\n',
+            [],
+            [("app", Path("src/app"))],
+        ),
+        ("[tool.black]\nline-length = 88\n", [], []),
+        ("[tool.poetry\n", [], []),
+    ],
+)
+def test_read_pyproject_layout(
+    tmp_path: Path, pyproject: str, source_roots: list, packages: list
+) -> None:
+    (tmp_path / "pyproject.toml").write_text(pyproject, encoding="utf-8")
+
+    assert read_pyproject_layout(tmp_path) == (source_roots, packages)
+
+
+def test_missing_pyproject(tmp_path: Path) -> None:
+    assert read_pyproject_layout(tmp_path) == ([], [])
+
+
+@pytest.mark.parametrize(
+    "files, removed",
+    [
+        # новый модуль в порции пакета пространства имён
+        ({"ns1/acme/c.py": "", "src/cli.py": "from acme import c\n"}, []),
+        # новый пакет пространства имён над уже импортируемым модулем
+        ({"ns1/c/d/z.py": ""}, []),
+        # обычный пакет в более раннем корне закрывает порции
+        ({"src/acme/__init__.py": ""}, []),
+        # модуль-файл рядом с одноимённым пакетом
+        ({"src/app/core.py": ""}, []),
+        ({"lib/other/more.py": "from vendored.other import thing\n"}, []),
+        ({}, ["lib/other/thing.py"]),
+        ({}, ["src/cli.py"]),
+    ],
+)
+def test_update_matches_fresh_build(
+    project: Path, files: Dict[str, str], removed: List[str]
+) -> None:
+    model = {"use_pyproject": True, "namespace_packages": True}
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(project))
+    depgraph.set_resolution_model(**model)  # type: ignore[arg-type]
+    depgraph.start_dep_finding()
+
+    write_project(project, files)
+    for path in removed:
+        (project / path).unlink()
+    depgraph.update(list(files), removed)
+
+    assert as_posix_deps(depgraph.get_dep_dict()) == find_deps(project, **model)
+
+
+def test_legacy_trie_matches_probing_roots() -> None:
+    modules = [
+        Path(path)
+        for path in (
+            "a/__init__.py",
+            "a/b.py",
+            "a/b/__init__.py",
+            "a/c/__init__.py",
+            "a/c/d.py",
+            "lib/a/__init__.py",
+            "lib/a/e.py",
+            "lib/x/__init__.py",
+            "lib/x/b.py",
+        )
+    ]
+    index = ModuleIndex(modules)
+    roots = sorted([(("a",), "a"), (("lib", "a"), "a"), (("lib", "x"), "x")])
+    trie = ImportTrie.for_roots(index, roots)
+
+    def probe(parts: tuple, bare: bool) -> object:
+        # прежнее разрешение: корни по порядку, поиск в индексе на каждый
+        for root_parts, root_name in roots:
+            if not bare and parts[0] == root_name:
+                key = root_parts + parts[1:]
+            else:
+                key = root_parts + parts
+            module = index.lookup(key)
+            if module is not None:
+                return module
+        return None
+
+    names = ["a", "b", "c", "d", "e", "x", "missing"]
+    for length, bare in product(range(1, 4), [False, True]):
+        for parts in product(names, repeat=length):
+            assert trie.lookup(parts, bare) == probe(parts, bare), parts
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        {"source_roots": "src"},
+        {"source_roots": ["../outside"]},
+        {"source_roots": ["/abs"]},
+        {"namespace_packages": 1},
+        {"use_pyproject": "yes"},
+    ],
+)
+def test_set_resolution_model_rejects_invalid_values(model: dict) -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_resolution_model(**model)
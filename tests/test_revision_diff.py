@@ -0,0 +1,120 @@
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+import pytest
+
+from depgraph.git_diff.revision_diff import GraphDelta
+from depgraph.main import Depgraph
+
+from .helpers import SAMPLE_PROJECT, run_depgraph, write_project
+
+AUTHOR = ("-c", "user.name=test", "-c", "user.email=test@example.com")
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not found")
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit(repo: Path, files: Dict[str, str], message: str) -> str:
+
+    write_project(repo, files)
+    git(repo, "add", "-A")
+    git(repo, *AUTHOR, "commit", "-q", "--allow-empty", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+def diff(repo: Path, base: str, head: str) -> GraphDelta:
+
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(repo))
+    return depgraph.diff_revisions(base, head)
+
+
+def edges(dep_dict: Dict) -> Set[Tuple[Path, Path]]:
+    return {(module, dep) for module, deps in dep_dict.items() for dep in deps}
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git(tmp_path, "init", "-q")
+    return tmp_path
+
+
+def test_new_cycle_through_package_init(repo: Path) -> None:
+    base = commit(
+        repo,
+        {
+            "pkg/__init__.py": "from pkg.sub import helper\n",
+            "pkg/sub/__init__.py": "",
+            "pkg/sub/helper.py": "import json\n",
+            "main.py": "import pkg\n",
+        },
+        "base",
+    )
+    # helper.py импортирует пакет pkg: цикл идёт через оба __init__.py
+    head = commit(repo, {"pkg/sub/helper.py": "from pkg import sub\n"}, "cycle")
+
+    delta = diff(repo, base, head)
+
+    assert delta.changed_modules == [Path("pkg/sub/helper.py")]
+    assert delta.added_edges == [(Path("pkg/sub/helper.py"), Path("pkg/__init__.py"))]
+    assert delta.removed_edges == []
+    assert [sorted(cycle) for cycle in delta.new_cycles] == [
+        [
+            Path("pkg/__init__.py"),
+            Path("pkg/sub/__init__.py"),
+            Path("pkg/sub/helper.py"),
+        ]
+    ]
+
+
+def test_existing_cycles_are_not_new(repo: Path) -> None:
+    base = commit(repo, SAMPLE_PROJECT, "base")
+    head = commit(repo, {"other/n.py": "import app.main\n"}, "add module")
+
+    delta = diff(repo, base, head)
+
+    assert delta.added_modules == [Path("other/n.py")]
+    assert delta.new_cycles == []
+
+
+def test_diff_matches_checkouts(
+    repo: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    base = commit(repo, SAMPLE_PROJECT, "base")
+    commit(
+        repo,
+        {
+            "app/core/a.py": "from app.util import helpers\n",
+            "app/new.py": "import sys\n",
+        },
+        "change",
+    )
+    (repo / "app/util/helpers.py").unlink()
+    head = commit(repo, {}, "remove helpers")
+
+    def dep_dict(rev: str) -> Dict:
+        checkout = tmp_path_factory.mktemp("checkout")
+        git(repo, "worktree", "add", "-q", "--detach", str(checkout / "tree"), rev)
+        return run_depgraph(checkout / "tree").get_dep_dict()
+
+    before, after = dep_dict(base), dep_dict(head)
+    delta = diff(repo, base, head)
+
+    assert delta.added_modules == sorted(after.keys() - before.keys())
+    assert delta.removed_modules == sorted(before.keys() - after.keys())
+    assert delta.added_edges == sorted(edges(after) - edges(before))
+    assert delta.removed_edges == sorted(edges(before) - edges(after))
+
+
+def test_unknown_revision(repo: Path) -> None:
+    commit(repo, SAMPLE_PROJECT, "base")
+
+    with pytest.raises((OSError, ValueError)):
+        diff(repo, "HEAD", "no-such-revision")
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from depgraph.graph_building.compact_graph import CompactGraph
+from depgraph.visualizing.scalable_renderer import LAYOUTS, render_scalable_html
+
+from .helpers import run_depgraph
+
+
+def read_data(html_file: Path) -> dict:
+    html = html_file.read_text(encoding="utf-8")
+    start = html.index("const DATA = ") + len("const DATA = ")
+    return json.loads(html[start : html.index(";\n", start)])
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_render_exports_every_node_and_edge(
+    sample_project: Path, tmp_path: Path, layout: str
+) -> None:
+    graph = run_depgraph(sample_project, graph=True)._graph
+    output = tmp_path / "graph.html"
+
+    light = render_scalable_html(graph, output, layout=layout)
+    data = read_data(output)
+
+    assert not light
+    assert len(data["nodes"]) == graph.number_of_nodes()
+    assert len(data["edges"]) == 2 * graph.number_of_edges()
+
+
+def test_large_graph_opens_collapsed(sample_project: Path, tmp_path: Path) -> None:
+    graph = CompactGraph.from_networkx(run_depgraph(sample_project, graph=True)._graph)
+    output = tmp_path / "graph.html"
+
+    assert render_scalable_html(graph, output, max_nodes=3)
+    assert read_data(output)["light"] is True
+
+
+def test_render_rejects_unknown_layout(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        render_scalable_html(CompactGraph(), tmp_path / "graph.html", layout="spring")
@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from depgraph.cli import main
+from depgraph.main import Depgraph
+
+from .helpers import SAMPLE_PROJECT, run_depgraph, write_project
+
+
+def graph_edges(depgraph: Depgraph) -> List[Tuple[str, str, tuple]]:
+
+    depgraph.start_graph_generating()
+    return sorted(
+        (Path(a).as_posix(), Path(b).as_posix(), tuple(data.get("names") or ()))
+        for a, b, data in depgraph._graph.edges(data=True)
+    )
+
+
+def write_partials(project: Path, out_dir: Path, resolution: str) -> List[str]:
+    """
+    Каждый каталог верхнего уровня проекта - отдельный шард.
+    """
+    partials = []
+    for shard in sorted(project.iterdir()):
+        depgraph = run_depgraph(shard, resolution=resolution)
+        partial = out_dir / f"{shard.name}.json"
+        depgraph.save_partial(str(partial))
+        partials.append(str(partial))
+    return partials
+
+
+@pytest.mark.parametrize("resolution", ["module", "symbol"])
+def test_merged_shards_match_whole_project(
+    sample_project: Path, tmp_path: Path, resolution: str
+) -> None:
+    expected = graph_edges(run_depgraph(sample_project, resolution=resolution))
+
+    merged = Depgraph()
+    merged.merge_partials(write_partials(sample_project, tmp_path, resolution))
+
+    # other/m.py импортирует app.core.a из соседнего шарда
+    assert ("other/m.py", "app/core", ()) in expected or resolution == "symbol"
+    assert graph_edges(merged) == expected
+
+
+def test_shard_prefix(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "repo", SAMPLE_PROJECT)
+    shard = run_depgraph(project / "other")
+    shard.save_partial(str(tmp_path / "other.json"), "services/other")
+    app = run_depgraph(project / "app")
+    app.save_partial(str(tmp_path / "app.json"))
+
+    merged = Depgraph()
+    merged.merge_partials([str(tmp_path / "app.json"), str(tmp_path / "other.json")])
+
+    assert ("services/other/m.py", "app/core", ()) in graph_edges(merged)
+
+
+def test_merge_rejects_broken_partials(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        Depgraph().merge_partials([str(broken)])
+    with pytest.raises(OSError):
+        Depgraph().merge_partials([str(tmp_path / "missing.json")])
+
+
+def test_cli_partial_and_merge(
+    sample_project: Path, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    partials = []
+    for shard in ("app", "other"):
+        partial = str(tmp_path / f"{shard}.json")
+        assert main([str(sample_project / shard), "--partial", partial]) == 0
+        partials.append(partial)
+    capsys.readouterr()
+
+    assert main(["--merge", *partials, "-f", "jsonl"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    edges = {(r["from"], r["to"]) for r in records if r["type"] == "edge"}
+    expected = run_depgraph(sample_project).get_dep_dict()
+    assert ("other/m.py", "app/core/__init__.py") in edges
+    assert len(edges) == sum(map(len, expected.values()))
+
+
+def test_cli_partial_reports_failure(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    project = write_project(tmp_path / "broken", {"pkg/__init__.py": "def (:\n"})
+    partial = tmp_path / "broken.json"
+
+    assert main([str(project), "--partial", str(partial)]) == 1
+    assert "failed to write partial result" in caplog.text
+    assert not partial.exists()
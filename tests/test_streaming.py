@@ -0,0 +1,60 @@
+import io
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from depgraph.graph_building.edge_sink import DotWriter, JsonLinesWriter
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, run_depgraph
+
+
+def stream(project: Path, sink: object, resolution: str = "module") -> Depgraph:
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(project))
+    depgraph.set_resolution(resolution)
+    depgraph.start_streaming(sink)  # type: ignore[arg-type]
+    return depgraph
+
+
+@pytest.mark.parametrize("resolution", ["module", "symbol"])
+def test_streamed_edges_match_dep_dict(sample_project: Path, resolution: str) -> None:
+    expected = as_posix_deps(
+        run_depgraph(sample_project, resolution=resolution).get_dep_dict()
+    )
+
+    buffer = io.StringIO()
+    stream(sample_project, JsonLinesWriter(buffer), resolution)
+
+    streamed: Dict[str, List[str]] = {}
+    for line in buffer.getvalue().splitlines():
+        record = json.loads(line)
+        if record["type"] == "module":
+            streamed.setdefault(record["path"], [])
+        else:
+            streamed.setdefault(record["from"], []).append(record["to"])
+            assert ("names" in record) == (resolution == "symbol")
+
+    assert {module: sorted(deps) for module, deps in streamed.items()} == expected
+
+
+def test_streaming_into_graph_matches_graph_generating(sample_project: Path) -> None:
+    built = run_depgraph(sample_project, graph=True)
+    streamed = stream(sample_project, None)
+
+    assert set(streamed._graph.edges()) == set(built._graph.edges())
+    assert set(streamed._graph.nodes()) == set(built._graph.nodes())
+
+
+def test_dot_writer_output(sample_project: Path) -> None:
+    buffer = io.StringIO()
+    writer = DotWriter(buffer, name="sample")
+    stream(sample_project, writer)
+    writer.close()
+
+    dot = buffer.getvalue()
+    assert dot.startswith('digraph "sample" {\n') and dot.endswith("}\n")
+    assert '"app/core/b.py" -> "app/util/__init__.py";' in dot
+    assert writer.modules == 8
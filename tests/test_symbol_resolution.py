@@ -0,0 +1,110 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from depgraph.main import Depgraph
+
+from .helpers import as_posix_deps, run_depgraph, write_project
+
+PROJECT = {
+    "pkg/__init__.py": "from .impl import Engine\nfrom .sub import *\n",
+    "pkg/impl.py": "class Engine:\n    pass\n",
+    "pkg/other.py": "VALUE = 1\n",
+    "pkg/sub/__init__.py": "from .star import *\n",
+    "pkg/sub/star.py": "__all__ = ['helper']\n\n\ndef helper():\n    pass\n",
+    "app.py": (
+        "from pkg import Engine, helper\n"
+        "from pkg import other\n"
+        "import pkg.impl\n"
+        "from pkg import missing\n"
+    ),
+}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    return write_project(tmp_path, PROJECT)
+
+
+def edge_names(depgraph: Depgraph, module: str) -> Dict[str, List[str]]:
+    """
+    Рёбра модуля в графе: цель -> импортированные имена.
+    """
+    return {
+        Path(target).as_posix(): data.get("names")
+        for _, target, data in depgraph._graph.out_edges(Path(module), data=True)
+    }
+
+
+def test_names_resolve_to_defining_modules(project: Path) -> None:
+    deps = as_posix_deps(run_depgraph(project, resolution="symbol").get_dep_dict())
+
+    assert deps["app.py"] == [
+        "pkg/__init__.py",
+        "pkg/impl.py",
+        "pkg/other.py",
+        "pkg/sub/star.py",
+    ]
+
+
+def test_init_has_no_sibling_edges_in_symbol_mode(project: Path) -> None:
+    module_deps = as_posix_deps(run_depgraph(project).get_dep_dict())
+    symbol_deps = as_posix_deps(
+        run_depgraph(project, resolution="symbol").get_dep_dict()
+    )
+
+    assert "pkg/other.py" in module_deps["pkg/__init__.py"]
+    assert symbol_deps["pkg/__init__.py"] == ["pkg/impl.py", "pkg/sub/__init__.py"]
+
+
+def test_module_mode_keeps_package_edges(project: Path) -> None:
+    deps = as_posix_deps(run_depgraph(project).get_dep_dict())
+
+    assert deps["app.py"] == ["pkg/__init__.py"]
+
+
+def test_names_are_kept_on_edges(project: Path) -> None:
+    depgraph = run_depgraph(project, resolution="symbol", graph=True)
+
+    assert edge_names(depgraph, "app.py") == {
+        "pkg/impl.py": ["Engine", "impl"],
+        "pkg/sub/star.py": ["helper"],
+        "pkg/other.py": ["other"],
+        # неизвестное имя остаётся импортом пакета
+        "pkg": ["missing"],
+    }
+
+
+def test_module_mode_has_no_names(project: Path) -> None:
+    depgraph = run_depgraph(project, graph=True)
+
+    assert edge_names(depgraph, "app.py") == {"pkg": None}
+
+
+def test_reexport_chain_follows_updates(project: Path) -> None:
+    depgraph = run_depgraph(project, resolution="symbol")
+    # helper переезжает из star.py в other.py и реэкспортируется оттуда
+    write_project(
+        project,
+        {
+            "pkg/sub/star.py": "__all__ = []\n",
+            "pkg/__init__.py": "from .impl import Engine\nfrom .other import helper\n",
+            "pkg/other.py": "VALUE = 1\n\n\ndef helper():\n    pass\n",
+        },
+    )
+    depgraph.update(
+        [Path("pkg/__init__.py"), Path("pkg/other.py"), Path("pkg/sub/star.py")], []
+    )
+
+    expected = run_depgraph(project, resolution="symbol")
+    assert as_posix_deps(depgraph.get_dep_dict()) == as_posix_deps(
+        expected.get_dep_dict()
+    )
+    assert "pkg/sub/star.py" not in as_posix_deps(depgraph.get_dep_dict())["app.py"]
+
+
+@pytest.mark.parametrize("resolution", ["names", "", None])
+def test_set_resolution_rejects_invalid_values(resolution: object) -> None:
+    with pytest.raises(ValueError):
+        Depgraph().set_resolution(resolution)  # type: ignore[arg-type]
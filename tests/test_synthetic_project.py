@@ -0,0 +1,98 @@
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from synthetic_project import ProjectSpec, generate_project  # noqa: E402
+
+from .helpers import run_depgraph  # noqa: E402
+
+# "import synth.pkg.mod3", "from synth.pkg.mod3 import f" или "from ..mod3 import f"
+IMPORT_RE = re.compile(r"^(import|from) (\.*)[\w.]*?mod(\d+)\b", re.MULTILINE)
+
+
+def read_tree(root: Path) -> Dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*.py"))
+    }
+
+
+def internal_imports(root: Path) -> Dict[Path, List[Tuple[int, str]]]:
+    """
+    Модуль -> его внутренние импорты: (номер модуля, "import" / "from" / "relative").
+    """
+    imports = {}
+    for path in root.rglob("mod*.py"):
+        imports[path.relative_to(root)] = [
+            (int(match.group(3)), "relative" if match.group(2) else match.group(1))
+            for match in IMPORT_RE.finditer(path.read_text(encoding="utf-8"))
+        ]
+    return imports
+
+
+def module_number(path: Path) -> int:
+    return int(path.stem[len("mod") :])
+
+
+def test_generation_is_deterministic(tmp_path: Path) -> None:
+    spec = ProjectSpec(modules=60, depth=2, imports=4, seed=7)
+    generate_project(tmp_path / "first", spec)
+    generate_project(tmp_path / "second", spec)
+    generate_project(tmp_path / "other", spec._replace(seed=8))
+
+    assert read_tree(tmp_path / "first") == read_tree(tmp_path / "second")
+    assert read_tree(tmp_path / "first") != read_tree(tmp_path / "other")
+
+
+def test_counts_match_the_tree(tmp_path: Path) -> None:
+    spec = ProjectSpec(modules=100, depth=2, imports=5, modules_per_package=10)
+    info = generate_project(tmp_path, spec)
+
+    modules = list(tmp_path.rglob("mod*.py"))
+    inits = list(tmp_path.rglob("__init__.py"))
+    assert len(modules) == spec.modules
+    assert info.packages == len(inits)
+    assert info.files == len(modules) + len(inits)
+    assert info.internal_imports == sum(map(len, internal_imports(tmp_path).values()))
+    # synth/pkgX/pkgY/modN.py
+    assert {len(path.relative_to(tmp_path).parts) for path in modules} == {4}
+
+
+def test_without_cycle_density_imports_point_backwards(tmp_path: Path) -> None:
+    generate_project(tmp_path, ProjectSpec(modules=80, imports=6, cycle_density=0.0))
+
+    for module, imports in internal_imports(tmp_path).items():
+        number = module_number(module)
+        # первому модулю импортировать назад некого, он импортирует вперёд
+        if number > 0:
+            assert all(target < number for target, _ in imports)
+
+
+@pytest.mark.parametrize("ratio", [0.0, 1.0])
+def test_relative_ratio(tmp_path: Path, ratio: float) -> None:
+    generate_project(tmp_path, ProjectSpec(modules=40, imports=4, relative_ratio=ratio))
+
+    relative = {
+        kind == "relative"
+        for imports in internal_imports(tmp_path).values()
+        for _, kind in imports
+    }
+    assert relative == {bool(ratio)}
+
+
+def test_from_imports_resolve_to_generated_modules(tmp_path: Path) -> None:
+    generate_project(tmp_path, ProjectSpec(modules=50, depth=2, imports=4))
+    dep_dict = run_depgraph(tmp_path).get_dep_dict()
+
+    for module, imports in internal_imports(tmp_path).items():
+        # "import synth.pkg.modN" ведёт к пакету, "from ... modN import" - к модулю
+        expected = {target for target, kind in imports if kind != "import"}
+        resolved = {
+            module_number(dep) for dep in dep_dict[module] if dep.stem.startswith("mod")
+        }
+        assert expected <= resolved
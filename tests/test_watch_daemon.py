@@ -0,0 +1,151 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from depgraph.main import Depgraph
+from depgraph.watching.watch_daemon import WatchDaemon, parse_address, query
+
+from .helpers import write_project
+
+PACKAGE_CYCLE = [
+    "app/core/__init__.py",
+    "app/core/b.py",
+    "app/util/__init__.py",
+    "app/util/helpers.py",
+]
+
+
+@pytest.fixture
+def daemon(sample_project: Path, tmp_path: Path) -> Iterator[WatchDaemon]:
+    depgraph = Depgraph()
+    depgraph.set_proj_path(str(sample_project))
+    daemon = WatchDaemon(depgraph, str(tmp_path / "depgraph.sock"), use_inotify=False)
+    daemon.start()
+    yield daemon
+    daemon._close()
+
+
+def ask(daemon: WatchDaemon, op: str, module: str = "") -> list:
+
+    request = {"op": op, "module": module} if module else {"op": op}
+    response = query(daemon._address, request)
+    assert response["ok"], response
+    return response["result"]
+
+
+def test_parse_address() -> None:
+    assert parse_address("localhost:8765") == ("localhost", 8765)
+    assert parse_address("/tmp/depgraph.sock") == "/tmp/depgraph.sock"
+
+
+def test_cycles_go_through_package_init(daemon: WatchDaemon) -> None:
+    assert ask(daemon, "cycles") == [PACKAGE_CYCLE]
+
+
+def test_impacted_goes_through_package_init(daemon: WatchDaemon) -> None:
+    # helpers.py импортируют только через пакет app.util
+    assert ask(daemon, "impacted", "app/util/helpers.py") == [
+        "app/__init__.py",
+        "app/core/__init__.py",
+        "app/core/b.py",
+        "app/main.py",
+        "app/util/__init__.py",
+        "other/m.py",
+    ]
+
+
+def test_direct_links(daemon: WatchDaemon) -> None:
+    assert ask(daemon, "dependencies", "app/core/b.py") == ["app/util/__init__.py"]
+    assert ask(daemon, "dependents", "app/core/__init__.py") == [
+        "app/__init__.py",
+        "app/main.py",
+        "app/util/helpers.py",
+        "other/m.py",
+    ]
+
+
+def test_answers_follow_applied_changes(
+    daemon: WatchDaemon, sample_project: Path
+) -> None:
+    write_project(sample_project, {"app/util/helpers.py": "import json\n"})
+    daemon._apply({Path("app/util/helpers.py")})
+
+    assert ask(daemon, "cycles") == []
+    assert ask(daemon, "impacted", "app/core/b.py") == [
+        "app/__init__.py",
+        "app/core/__init__.py",
+        "app/main.py",
+        "other/m.py",
+    ]
+
+    write_project(sample_project, {"app/util/helpers.py": "import app.core.b\n"})
+    daemon._apply({Path("app/util/helpers.py")})
+
+    assert ask(daemon, "cycles") == [PACKAGE_CYCLE]
+
+
+def test_removed_module(daemon: WatchDaemon, sample_project: Path) -> None:
+    (sample_project / "app/core/b.py").unlink()
+    daemon._apply({Path("app/core/b.py")})
+
+    assert ask(daemon, "cycles") == []
+    response = query(daemon._address, {"op": "impacted", "module": "app/core/b.py"})
+    assert response["ok"] is False
+    assert "app/core/b.py" in response["error"]
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [{"op": "drop"}, {"op": "impacted"}, {"op": "dependents", "module": 1}],
+)
+def test_bad_requests(daemon: WatchDaemon, request_: dict) -> None:
+    response = query(daemon._address, request_)
+
+    assert response["ok"] is False
+    assert response["error"]
+
+
+def test_ping(daemon: WatchDaemon) -> None:
+    assert ask(daemon, "ping") is None
+
+
+def test_broken_file_becomes_diagnostic(
+    daemon: WatchDaemon, sample_project: Path
+) -> None:
+    broken = "import app.core.b\ndef f(:\n"
+    write_project(sample_project, {"app/util/helpers.py": broken})
+    daemon._apply_safely({Path("app/util/helpers.py")})
+
+    # импорты сломанного файла извлечены сканером, граф прежний
+    assert ask(daemon, "cycles") == [PACKAGE_CYCLE]
+    [diagnostic] = ask(daemon, "diagnostics")
+    assert diagnostic["path"] == "app/util/helpers.py"
+    assert diagnostic["kind"] == "syntax"
+    assert diagnostic["recovered"] is True
+
+    write_project(sample_project, {"app/util/helpers.py": "import app.core.b\n"})
+    daemon._apply_safely({Path("app/util/helpers.py")})
+
+    assert ask(daemon, "diagnostics") == []
+
+
+def test_failed_rebuild_keeps_serving(
+    daemon: WatchDaemon, sample_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(*args: object) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(Depgraph, "update", fail)
+    monkeypatch.setattr(Depgraph, "start_dep_finding", fail)
+    daemon._apply_safely({Path("app/util/helpers.py")})
+
+    assert ask(daemon, "ping") is None
+    assert daemon._needs_rebuild
+
+    monkeypatch.undo()
+    write_project(sample_project, {"app/util/helpers.py": "import json\n"})
+    daemon._apply_safely({Path("app/util/helpers.py")})
+
+    assert not daemon._needs_rebuild
+    assert ask(daemon, "cycles") == []